@@ -0,0 +1,61 @@
+"""Helpers shared by the benchmark scripts.
+
+``environment()`` describes the machine and checkout a run was made on, and
+``compare()`` checks a run against the JSON results of an earlier one.
+"""
+
+import os
+import time
+import platform
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def case_name(case: dict) -> str:
+    """Return the ``key=value ...`` name of a case from its JSON form."""
+    return " ".join(f"{key}={value}" for key, value in case.items())
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "commit": commit,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def compare(
+    results: list[dict], baseline: dict, tolerance: float, metric: str
+) -> list[str]:
+    """Return the names of cases whose ``metric`` dropped more than ``tolerance``."""
+    previous = {
+        case_name(result["case"]): result
+        for result in baseline.get("results", [])
+        if metric in result
+    }
+    regressions = []
+    for result in results:
+        name = case_name(result["case"])
+        old = previous.get(name)
+        if old is None or not result.get(metric) or not old[metric]:
+            continue
+        ratio = result[metric] / old[metric]
+        marker = ""
+        if ratio < 1 - tolerance:
+            regressions.append(name)
+            marker = "  <-- regression"
+        print(f"{name}: {ratio:.2f}x of baseline{marker}")
+    return regressions
@@ -0,0 +1,375 @@
+"""Benchmarks for FileOrganizer.organize() on synthetic trees.
+
+Every combination of the chosen tree shapes and organize modes is one case.
+Each case runs in a fresh process: a tree is generated, organized once for
+timing and peak memory, and a smaller tree with the same shape is organized
+again with counting wrappers around the ``os`` functions to estimate
+system calls per file. Results are written as JSON so runs from different
+releases can be compared with ``--baseline``.
+
+Examples::
+
+    python benchmarks/bench_file_organizer.py
+    python benchmarks/bench_file_organizer.py --files 10000 100000 1000000 \\
+        --extensions uniform skewed --depth 0 3 --location disk tmpfs \\
+        --output results.json
+    python benchmarks/bench_file_organizer.py --baseline results.json
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import builtins
+import tempfile
+import itertools
+import tracemalloc
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from _common import case_name, compare, environment  # noqa: E402
+
+from file_organizer.file_organizer import FileOrganizer  # noqa: E402
+from file_organizer.rules import RuleSet  # noqa: E402
+
+EXTENSIONS = ["txt", "jpg", "pdf", "png", "mp4", "zip", "csv", "json", "log", "md"]
+EXTENSION_PROFILES = {
+    "uniform": (EXTENSIONS, [1] * len(EXTENSIONS)),
+    # Zipf-like: a few extensions dominate, as in most download folders.
+    "skewed": (EXTENSIONS, [1 / rank for rank in range(1, len(EXTENSIONS) + 1)]),
+    "single": (["log"], [1]),
+    "mixed": (EXTENSIONS + ["", "JPG", "tar.gz"], [1] * len(EXTENSIONS) + [3, 2, 1]),
+}
+SIZE_PROFILES = {
+    "empty": ([0], [1]),
+    "small": ([64, 512, 4096], [1, 2, 1]),
+    "mixed": ([0, 512, 4096, 64 * 1024, 1024 * 1024], [1, 4, 3, 1, 1]),
+}
+MODES = {
+    "default": {},
+    "workers": {"workers": 8},
+    "by-content": {"by_content": True},
+    "dedupe": {"dedupe": "report"},
+    "index": {"index": True},
+    "rules": {
+        "rules": [
+            {"glob": "*.log", "dest": "logs"},
+            {"regex": "^f0000", "dest": "early"},
+            {"min_size": "64KB", "dest": "large/{ext}"},
+        ]
+    },
+}
+HEADERS = {
+    "jpg": b"\xff\xd8\xff\xe0",
+    "png": b"\x89PNG\r\n\x1a\n",
+    "pdf": b"%PDF-1.7\n",
+    "zip": b"PK\x03\x04",
+    "gz": b"\x1f\x8b\x08",
+}
+# Subdirectories per directory level of generated trees.
+FANOUT = 4
+# Distinct content blocks; files sharing a block and a size are duplicates.
+CONTENT_BLOCKS = 256
+# Files in the tree used for the (slower) instrumented system call count.
+SYSCALL_SAMPLE = 10_000
+# Above this size files are written sparse instead of filled with data.
+SPARSE_FROM = 64 * 1024
+TMPFS = "/dev/shm"
+
+COUNTED_OS_FUNCTIONS = [
+    "stat",
+    "lstat",
+    "fstat",
+    "open",
+    "close",
+    "read",
+    "write",
+    "pread",
+    "mkdir",
+    "rmdir",
+    "replace",
+    "rename",
+    "link",
+    "unlink",
+    "fsync",
+    "utime",
+    "chmod",
+    "copy_file_range",
+    "sendfile",
+    "listdir",
+]
+
+
+@dataclass(frozen=True)
+class Case:
+    files: int
+    extensions: str
+    sizes: str
+    depth: int
+    location: str
+    mode: str
+
+    @property
+    def name(self) -> str:
+        return case_name(asdict(self))
+
+
+def generate_tree(root: str, case: Case, files: int, seed: int) -> None:
+    """Create ``files`` files shaped like ``case`` below ``root``."""
+    rng = random.Random(seed)
+    directories = [root]
+    level = [root]
+    for depth in range(case.depth):
+        level = [
+            os.path.join(parent, f"d{depth}_{i}")
+            for parent in level
+            for i in range(FANOUT)
+        ]
+        directories.extend(level)
+    for directory in directories:
+        os.makedirs(directory, exist_ok=True)
+
+    exts, ext_weights = EXTENSION_PROFILES[case.extensions]
+    sizes, size_weights = SIZE_PROFILES[case.sizes]
+    blocks = [rng.randbytes(SPARSE_FROM) for _ in range(min(CONTENT_BLOCKS, files))]
+    for i in range(files):
+        ext = rng.choices(exts, ext_weights)[0]
+        size = rng.choices(sizes, size_weights)[0]
+        name = f"f{i:07}.{ext}" if ext else f"f{i:07}"
+        path = os.path.join(rng.choice(directories), name)
+        header = HEADERS.get(ext.lower().rsplit(".", 1)[-1], b"")
+        data = (header + blocks[rng.randrange(len(blocks))])[: min(size, SPARSE_FROM)]
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, data)
+            if size > len(data):
+                os.ftruncate(fd, size)
+        finally:
+            os.close(fd)
+
+
+def make_organizer(root: str, case: Case) -> FileOrganizer:
+    options = dict(MODES[case.mode])
+    if "rules" in options:
+        options["rules"] = RuleSet(options["rules"])
+    return FileOrganizer(root, recursive=case.depth > 0, **options)
+
+
+def count_syscalls(root: str, case: Case) -> Counter:
+    """Organize ``root`` while counting calls to system-call wrappers.
+
+    ``os`` functions and ``open`` are wrapped, and directory entries are
+    proxied so their (uncached) ``stat`` calls are counted as well. Calls
+    made inside C libraries, such as ``sqlite3``, are not seen.
+    """
+    counts: Counter = Counter()
+    originals = {name: getattr(os, name) for name in COUNTED_OS_FUNCTIONS}
+    originals["scandir"] = os.scandir
+    real_open = builtins.open
+
+    def counted(name, function):
+        def wrapper(*args, **kwargs):
+            counts[name] += 1
+            return function(*args, **kwargs)
+
+        return wrapper
+
+    def scandir(*args, **kwargs):
+        counts["scandir"] += 1
+        return _CountingScandir(originals["scandir"](*args, **kwargs), counts)
+
+    try:
+        for name, function in originals.items():
+            if name != "scandir":
+                setattr(os, name, counted(name, function))
+        os.scandir = scandir
+        builtins.open = counted("open", real_open)
+        make_organizer(root, case).organize()
+    finally:
+        for name, function in originals.items():
+            setattr(os, name, function)
+        builtins.open = real_open
+    return counts
+
+
+class _CountingScandir:
+    def __init__(self, iterator, counts: Counter):
+        self._iterator = iterator
+        self._counts = counts
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._iterator.close()
+
+    def __iter__(self):
+        for entry in self._iterator:
+            yield _CountingEntry(entry, self._counts)
+
+    def close(self):
+        self._iterator.close()
+
+
+class _CountingEntry:
+    def __init__(self, entry: os.DirEntry, counts: Counter):
+        self._entry = entry
+        self._counts = counts
+        self.name = entry.name
+        self.path = entry.path
+        self._stat = None
+
+    def stat(self, follow_symlinks=True):
+        # DirEntry caches stat results; only the first call is a system call.
+        if self._stat is None:
+            self._counts["stat"] += 1
+            self._stat = self._entry.stat(follow_symlinks=follow_symlinks)
+        return self._stat
+
+    def __getattr__(self, name):
+        return getattr(self._entry, name)
+
+    def __fspath__(self):
+        return self.path
+
+
+def run_case(case: Case, base: str, seed: int, sample: int) -> dict:
+    """Benchmark one case; meant to run in its own process."""
+    import resource
+
+    parent = TMPFS if case.location == "tmpfs" else base
+    if case.location == "tmpfs" and not os.path.isdir(TMPFS):
+        return {"case": asdict(case), "skipped": f"{TMPFS} is not available"}
+
+    workdir = tempfile.mkdtemp(prefix="bench-file-organizer-", dir=parent)
+    try:
+        timed_root = os.path.join(workdir, "timed")
+        generate_tree(timed_root, case, case.files, seed)
+        organizer = make_organizer(timed_root, case)
+        cpu = time.process_time()
+        started = time.perf_counter()
+        summary = organizer.organize()
+        seconds = time.perf_counter() - started
+        cpu = time.process_time() - cpu
+        peak_rss_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform == "darwin":
+            peak_rss_kib //= 1024
+
+        sample_files = min(case.files, sample)
+        counted_root = os.path.join(workdir, "counted")
+        generate_tree(counted_root, case, sample_files, seed)
+        tracemalloc.start()
+        counts = count_syscalls(counted_root, case)
+        python_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "case": asdict(case),
+        "moved": len(summary.moves),
+        "seconds": round(seconds, 4),
+        "cpu_seconds": round(cpu, 4),
+        "files_per_sec": round(case.files / seconds, 1) if seconds else None,
+        "syscalls_per_file": round(sum(counts.values()) / sample_files, 2),
+        "syscalls": dict(sorted(counts.items())),
+        "syscall_sample_files": sample_files,
+        "peak_rss_kib": peak_rss_kib,
+        "python_peak_kib_sample": python_peak // 1024,
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark FileOrganizer.")
+    parser.add_argument("--files", type=int, nargs="+", default=[10_000])
+    parser.add_argument(
+        "--extensions",
+        nargs="+",
+        choices=EXTENSION_PROFILES,
+        default=["uniform"],
+    )
+    parser.add_argument("--sizes", nargs="+", choices=SIZE_PROFILES, default=["small"])
+    parser.add_argument("--depth", type=int, nargs="+", default=[2])
+    parser.add_argument(
+        "--location", nargs="+", choices=("disk", "tmpfs"), default=["disk"]
+    )
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument(
+        "--base",
+        default=tempfile.gettempdir(),
+        help="Directory for on-disk trees (default: the temp directory, "
+        "which may itself be tmpfs)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--syscall-sample",
+        type=int,
+        default=SYSCALL_SAMPLE,
+        help="Files in the tree used to count system calls per file",
+    )
+    parser.add_argument("--output", help="Write JSON results to this file")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.10,
+        help="Allowed files/sec drop against the baseline (default: 0.10)",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    cases = [
+        Case(*values)
+        for values in itertools.product(
+            args.files,
+            args.extensions,
+            args.sizes,
+            args.depth,
+            args.location,
+            args.modes,
+        )
+    ]
+
+    results = []
+    for case in cases:
+        # A fresh process per case keeps peak memory figures independent.
+        with ProcessPoolExecutor(1) as pool:
+            result = pool.submit(
+                run_case, case, args.base, args.seed, args.syscall_sample
+            ).result()
+        results.append(result)
+        if "skipped" in result:
+            print(f"{case.name}: skipped ({result['skipped']})")
+        else:
+            print(
+                f"{case.name}: {result['files_per_sec']:.0f} files/s, "
+                f"{result['syscalls_per_file']:.1f} syscalls/file, "
+                f"{result['peak_rss_kib'] // 1024} MiB peak"
+            )
+
+    report = {"benchmark": "file_organizer", **environment(), "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(
+                results, json.load(f), args.tolerance, "files_per_sec"
+            )
+        if regressions:
+            print(f"{len(regressions)} cases regressed")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
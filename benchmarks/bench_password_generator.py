@@ -0,0 +1,297 @@
+"""Benchmarks for password generation engines.
+
+Compares the original ``random.choice``-per-character implementation with
+the engines behind ``PasswordGenerator`` in four suites:
+
+- ``latency``: time per single ``generate()`` call (median and p99), the
+  cost a caller asking for one password pays.
+- ``bulk``: passwords per second for each length and alphabet, both one
+  ``generate()`` at a time and from ``generate_many()``.
+- ``policy``: policy-constrained generation, against ``random.choice``
+  retried until the password satisfies the policy.
+- ``scaling``: ``generate_ordered()`` throughput for each worker count.
+
+Results are written as JSON so runs from different releases can be
+compared with ``--baseline``.
+
+Examples::
+
+    python benchmarks/bench_password_generator.py
+    python benchmarks/bench_password_generator.py --count 1000000 --length 8 16 32
+    python benchmarks/bench_password_generator.py --suites bulk scaling \\
+        --workers 1 2 4 8 --output results.json
+    python benchmarks/bench_password_generator.py --baseline results.json
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+from dataclasses import asdict, dataclass
+from functools import partial
+from typing import Callable
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from _common import case_name, compare, environment  # noqa: E402
+
+from password_generator.markov import PronounceableGenerator  # noqa: E402
+from password_generator.parallel import generate_ordered  # noqa: E402
+from password_generator.password_generator import PasswordGenerator  # noqa: E402
+from password_generator.policy import CLASSES  # noqa: E402
+
+SUITES = ("latency", "bulk", "policy", "scaling")
+ALPHABETS = {
+    "letters": {"use_digits": False, "use_specials": False},
+    "alnum": {"use_specials": False},
+    "full": {},
+}
+POLICIES = {
+    "classes": {"minimums": {"lower": 1, "upper": 1, "digits": 1, "specials": 1}},
+    "strict": {
+        "minimums": {"upper": 2, "digits": 3, "specials": 2},
+        "exclude": "Il1O0",
+        "max_repeat": 2,
+    },
+}
+
+
+@dataclass(frozen=True)
+class Case:
+    suite: str
+    engine: str
+    length: int
+    alphabet: str = "full"
+    policy: str = "none"
+    workers: int = 1
+
+    @property
+    def name(self) -> str:
+        return case_name(asdict(self))
+
+
+def legacy_generate(alphabet: str, length: int) -> str:
+    """The original implementation: one ``random.choice`` call per character."""
+    return "".join(random.choice(alphabet) for _ in range(length))
+
+
+def legacy_policy_generate(alphabet: str, length: int, options: dict) -> str:
+    """``legacy_generate`` retried until the password satisfies ``options``."""
+    while True:
+        password = legacy_generate(alphabet, length)
+        if satisfies(password, options):
+            return password
+
+
+def satisfies(password: str, options: dict) -> bool:
+    """Whether ``password`` meets the minimums and run limit of a policy."""
+    for name, minimum in options.get("minimums", {}).items():
+        if sum(char in CLASSES[name] for char in password) < minimum:
+            return False
+    max_repeat = options.get("max_repeat")
+    if max_repeat is not None:
+        run = 1
+        for previous, char in zip(password, password[1:]):
+            run = run + 1 if char == previous else 1
+            if run > max_repeat:
+                return False
+    return True
+
+
+def rate(function: Callable[[], object], count: int) -> float:
+    """Return calls per second of ``function`` over ``count`` calls."""
+    start = time.perf_counter()
+    for _ in range(count):
+        function()
+    return count / (time.perf_counter() - start)
+
+
+def bulk_rate(passwords: Callable[[int], object], count: int) -> float:
+    """Return passwords per second for consuming ``passwords(count)``."""
+    start = time.perf_counter()
+    for _ in passwords(count):
+        pass
+    return count / (time.perf_counter() - start)
+
+
+def time_engines(count: int, length: int, alphabet: str = "full") -> dict[str, float]:
+    """Return passwords per second for each engine."""
+    generator = PasswordGenerator(length=length, **ALPHABETS[alphabet])
+    chars = generator.alphabet
+    return {
+        "random.choice": rate(partial(legacy_generate, chars, length), count),
+        "csprng generate()": rate(generator.generate, count),
+        "csprng generate_many()": bulk_rate(generator.generate_many, count),
+    }
+
+
+def time_latency(function: Callable[[], object], count: int) -> dict[str, float]:
+    """Return median and p99 microseconds per call, and calls per second."""
+    timings = []
+    clock = time.perf_counter_ns
+    for _ in range(count):
+        start = clock()
+        function()
+        timings.append(clock() - start)
+    timings.sort()
+    return {
+        "median_us": round(statistics.median(timings) / 1000, 3),
+        "p99_us": round(
+            timings[min(len(timings) - 1, len(timings) * 99 // 100)] / 1000, 3
+        ),
+        "passwords_per_sec": round(1e9 * len(timings) / sum(timings), 1),
+    }
+
+
+def run_latency(count: int, length: int) -> list[dict]:
+    generator = PasswordGenerator(length=length)
+    engines = {
+        "random.choice": partial(legacy_generate, generator.alphabet, length),
+        "csprng generate()": generator.generate,
+        "policy generate()": PasswordGenerator(length, **POLICIES["classes"]).generate,
+        "markov generate()": PronounceableGenerator.from_file(length=length).generate,
+    }
+    # A first call builds samplers, policies and models outside the timing.
+    results = []
+    for engine, function in engines.items():
+        function()
+        case = Case("latency", engine, length)
+        results.append({"case": asdict(case), **time_latency(function, count)})
+    return results
+
+
+def run_bulk(count: int, length: int, alphabet: str) -> list[dict]:
+    timings = time_engines(count, length, alphabet)
+    return [
+        {
+            "case": asdict(Case("bulk", engine, length, alphabet)),
+            "passwords_per_sec": round(value, 1),
+        }
+        for engine, value in timings.items()
+    ]
+
+
+def run_policy(count: int, length: int, policy: str) -> list[dict]:
+    options = POLICIES[policy]
+    generator = PasswordGenerator(length, **options)
+    chars = generator.alphabet
+    legacy = partial(legacy_policy_generate, chars, length, options)
+    timings = {
+        "random.choice + retry": rate(legacy, count),
+        "policy generate()": rate(generator.generate, count),
+        "policy generate_many()": bulk_rate(generator.generate_many, count),
+    }
+    return [
+        {
+            "case": asdict(Case("policy", engine, length, policy=policy)),
+            "passwords_per_sec": round(value, 1),
+        }
+        for engine, value in timings.items()
+    ]
+
+
+def run_scaling(count: int, length: int, workers: list[int]) -> list[dict]:
+    factory = partial(PasswordGenerator, length=length)
+    results = []
+    for n in workers:
+        start = time.perf_counter()
+        for _ in generate_ordered(factory, count, n):
+            pass
+        value = count / (time.perf_counter() - start)
+        case = Case("scaling", "generate_ordered()", length, workers=n)
+        results.append({"case": asdict(case), "passwords_per_sec": round(value, 1)})
+    single = results[0]["passwords_per_sec"]
+    for result in results:
+        result["speedup"] = round(result["passwords_per_sec"] / single, 2)
+    return results
+
+
+def run_suites(args: argparse.Namespace) -> list[dict]:
+    results = []
+    for length in args.length:
+        if "latency" in args.suites:
+            results += run_latency(args.latency_count, length)
+        if "bulk" in args.suites:
+            for alphabet in args.alphabets:
+                results += run_bulk(args.count, length, alphabet)
+        if "policy" in args.suites:
+            for policy in args.policies:
+                results += run_policy(args.policy_count, length, policy)
+        if "scaling" in args.suites:
+            results += run_scaling(args.scaling_count, length, args.workers)
+    return results
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark password engines.")
+    parser.add_argument("--suites", nargs="+", choices=SUITES, default=list(SUITES))
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--length", type=int, nargs="+", default=[12])
+    parser.add_argument(
+        "--alphabets", nargs="+", choices=ALPHABETS, default=list(ALPHABETS)
+    )
+    parser.add_argument(
+        "--policies", nargs="+", choices=POLICIES, default=list(POLICIES)
+    )
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument(
+        "--latency-count",
+        type=int,
+        default=10_000,
+        help="Single calls timed per engine in the latency suite",
+    )
+    parser.add_argument(
+        "--policy-count",
+        type=int,
+        default=20_000,
+        help="Passwords per engine in the policy suite",
+    )
+    parser.add_argument(
+        "--scaling-count",
+        type=int,
+        default=1_000_000,
+        help="Passwords per worker count in the scaling suite",
+    )
+    parser.add_argument("--output", help="Write JSON results to this file")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.10,
+        help="Allowed passwords/sec drop against the baseline (default: 0.10)",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    results = run_suites(args)
+    for result in results:
+        line = f"{Case(**result['case']).name}: {result['passwords_per_sec']:,.0f}/s"
+        if "median_us" in result:
+            line += f", median {result['median_us']} us, p99 {result['p99_us']} us"
+        if "speedup" in result:
+            line += f" ({result['speedup']}x)"
+        print(line)
+
+    report = {"benchmark": "password_generator", **environment(), "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(
+                results, json.load(f), args.tolerance, "passwords_per_sec"
+            )
+        if regressions:
+            print(f"{len(regressions)} cases regressed")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
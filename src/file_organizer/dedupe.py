@@ -0,0 +1,98 @@
+"""Duplicate file detection.
+
+Candidates are narrowed down in three increasingly expensive stages: files
+are grouped by size, then by a digest of their first and last block, and only
+the groups still colliding are hashed in full. Digests are computed on a
+thread pool; ``hashlib`` releases the GIL while hashing large buffers.
+"""
+
+import hashlib
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable
+
+EDGE_BLOCK_SIZE = 4096
+CHUNK_SIZE = 1 << 20
+
+DEDUPE_POLICIES = ("skip", "hardlink", "report")
+
+
+def edge_digest(path: str, size: int) -> bytes | None:
+    """Hash the first and last ``EDGE_BLOCK_SIZE`` bytes of a file."""
+    digest = hashlib.blake2b()
+    try:
+        with open(path, "rb") as f:
+            digest.update(f.read(EDGE_BLOCK_SIZE))
+            if size > EDGE_BLOCK_SIZE:
+                f.seek(max(size - EDGE_BLOCK_SIZE, EDGE_BLOCK_SIZE))
+                digest.update(f.read(EDGE_BLOCK_SIZE))
+    except OSError:
+        return None
+    return digest.digest()
+
+
+def full_digest(path: str, size: int) -> bytes | None:
+    """Hash a whole file, streamed in ``CHUNK_SIZE`` pieces."""
+    digest = hashlib.blake2b()
+    buffer = bytearray(CHUNK_SIZE)
+    view = memoryview(buffer)
+    try:
+        with open(path, "rb", buffering=0) as f:
+            while True:
+                read = f.readinto(buffer)
+                if not read:
+                    break
+                digest.update(view[:read])
+    except OSError:
+        return None
+    return digest.digest()
+
+
+def find_duplicates(
+    files: Iterable[tuple[str, int]],
+    workers: int = 1,
+    digests: dict[str, str] | None = None,
+) -> list[list[str]]:
+    """Return groups of identical files from ``(path, size)`` pairs.
+
+    Empty files are ignored. Each group is sorted by path and the groups are
+    sorted by their first path. Unreadable files are never reported. If
+    ``digests`` is given, it receives the hex ``full_digest`` of every file
+    whose whole content was hashed along the way.
+    """
+    by_size: dict[int, list[str]] = defaultdict(list)
+    for path, size in files:
+        if size:
+            by_size[size].append(path)
+    groups = [(size, paths) for size, paths in by_size.items() if len(paths) > 1]
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # The edge blocks already cover files up to two blocks long, so for
+        # those the edge digest is the digest of the whole file.
+        groups = _regroup(pool, groups, edge_digest, digests, 2 * EDGE_BLOCK_SIZE)
+        small = [group for group in groups if group[0] <= 2 * EDGE_BLOCK_SIZE]
+        large = [group for group in groups if group[0] > 2 * EDGE_BLOCK_SIZE]
+        groups = small + _regroup(pool, large, full_digest, digests)
+
+    return sorted(sorted(paths) for _, paths in groups)
+
+
+def _regroup(
+    pool: ThreadPoolExecutor,
+    groups: list[tuple[int, list[str]]],
+    digest: Callable[[str, int], bytes | None],
+    digests: dict[str, str] | None = None,
+    whole_up_to: int | None = None,
+) -> list[tuple[int, list[str]]]:
+    """Split groups by ``digest``; record it for files it covers whole."""
+    jobs = [(size, path) for size, paths in groups for path in paths]
+    values = pool.map(lambda job: digest(job[1], job[0]), jobs)
+
+    by_digest: dict[tuple[int, bytes], list[str]] = defaultdict(list)
+    for (size, path), value in zip(jobs, values):
+        if value is None:
+            continue
+        by_digest[size, value].append(path)
+        if digests is not None and (whole_up_to is None or size <= whole_up_to):
+            digests[path] = value.hex()
+    return [(size, paths) for (size, _), paths in by_digest.items() if len(paths) > 1]
@@ -1,39 +1,841 @@
 """File Organizer - Organize files by extension."""
 
 import os
-import shutil
+import sys
+import errno
+import time
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator
+
+from file_organizer.dedupe import DEDUPE_POLICIES, find_duplicates, full_digest
+from file_organizer.index import MoveIndex
+from file_organizer.journal import Journal, JournalError, Operation
+from file_organizer.naming import COLLISION_POLICIES, NameIndex, hash_suffixed
+from file_organizer.reporting import (
+    JsonLinesReporter,
+    ProgressReporter,
+    Reporter,
+    TextReporter,
+)
+from file_organizer.rules import RuleSet
+from file_organizer.sniffer import ContentSniffer
+from file_organizer.transfer import (
+    COPY_WORKERS,
+    DEFAULT_COPY_BUDGET,
+    ByteBudget,
+    copy_file,
+    make_durable,
+)
+from file_organizer.watcher import DEFAULT_SETTLE, watch
+
+# Organizer state (journal, checkpoint) lives here and is never organized.
+STATE_DIR = ".file_organizer"
+# Number of journaled operations applied between two checkpoints.
+DEFAULT_BATCH_SIZE = 1000
+# Hex digits of the content digest used by the "hash-suffix" collision policy.
+HASH_SUFFIX_LENGTH = 8
+
+RENAMED = "renamed"
+COPIED = "copied"
+LINKED = "linked"
+
+
+@dataclass
+class OrganizeSummary:
+    """Outcome of an organize run.
+
+    ``renamed`` counts files moved with a same-filesystem rename, ``copied``
+    counts files that had to be copied across devices and ``linked`` counts
+    duplicates replaced by a hard link. ``duplicates`` holds the groups of
+    identical files found while planning, the kept file first,
+    ``skipped`` the files left in place because their name was taken,
+    ``blocked`` the files left in place because a file has the name of their
+    target folder and ``elapsed`` the wall-clock duration of the run in
+    seconds.
+    """
+
+    moves: list[tuple[str, str]] = field(default_factory=list)
+    renamed: int = 0
+    copied: int = 0
+    linked: int = 0
+    duplicates: list[list[str]] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+    blocked: list[str] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    def record(self, src: str, dst: str, method: str) -> None:
+        self.moves.append((src, dst))
+        if method == RENAMED:
+            self.renamed += 1
+        elif method == LINKED:
+            self.linked += 1
+        else:
+            self.copied += 1
 
 
 class FileOrganizer:
-    def __init__(self, directory: str):
+    def __init__(
+        self,
+        directory: str,
+        recursive: bool = False,
+        workers: int = 1,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        by_content: bool = False,
+        dedupe: str | None = None,
+        on_collision: str = "rename",
+        rules: RuleSet | None = None,
+        reporter: Reporter | None = None,
+        copy_budget: int = DEFAULT_COPY_BUDGET,
+        index: bool = False,
+    ):
         if not os.path.isdir(directory):
             raise ValueError(f"{directory} is not a valid directory.")
+        if workers < 1:
+            raise ValueError("workers must be at least 1.")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+        if copy_budget < 1:
+            raise ValueError("copy_budget must be at least 1 byte.")
+        if dedupe is not None and dedupe not in DEDUPE_POLICIES:
+            raise ValueError(f"dedupe must be one of {', '.join(DEDUPE_POLICIES)}.")
+        if on_collision not in COLLISION_POLICIES:
+            raise ValueError(
+                f"on_collision must be one of {', '.join(COLLISION_POLICIES)}."
+            )
         self.directory = directory
+        # Every scanned or planned path starts with this, so making it relative
+        # for the journal is a slice rather than an os.path.relpath() call.
+        self._prefix = os.path.join(directory, "")
+        self.recursive = recursive
+        self.workers = workers
+        self.batch_size = batch_size
+        self.dedupe = dedupe
+        self.on_collision = on_collision
+        self.rules = rules
+        self.copy_budget = copy_budget
+        # Receives every applied operation; the organizer never prints.
+        self.reporter = reporter or Reporter()
+        # Groups of identical files found by the last plan() with dedupe on.
+        self.duplicates: list[list[str]] = []
+        # Files the last plan() left in place because their name was taken.
+        self.skipped: list[str] = []
+        # Files the last plan() left in place because their folder is a file.
+        self.blocked: list[str] = []
+        self._names = NameIndex()
+        self.state_dir = os.path.join(directory, STATE_DIR)
+        self.journal = Journal(os.path.join(self.state_dir, "journal.jsonl"))
+        # Optional record of every move, also used to skip placed files.
+        self.index = (
+            MoveIndex(os.path.join(self.state_dir, "index.sqlite3"), directory)
+            if index
+            else None
+        )
+        # Content digests computed while planning, by source path.
+        self._digests: dict[str, str] = {}
+        self.sniffer = (
+            ContentSniffer(os.path.join(self.state_dir, "sniff_cache.json"))
+            if by_content
+            else None
+        )
+        # Device ids of directories seen so far; a target directory is created
+        # the first time it is needed and never probed again.
+        self._target_devices: dict[str, int] = {}
+        self._source_devices: dict[str, int] = {}
+
+    def organize(self, paths: Iterable[str] | None = None) -> OrganizeSummary:
+        """Move every file into a subfolder named after its extension.
+
+        The plan is written to the journal first and then applied in batches,
+        so an interrupted run can be resumed or undone. The summary lists the
+        performed ``(source, destination)`` moves sorted by source path, so it
+        does not depend on scan order or worker count. ``paths`` limits the
+        run to the given files instead of scanning the whole directory.
+        """
+        started = time.monotonic()
+        if self.journal.is_pending():
+            raise JournalError(
+                "An unfinished run was found; resume or undo it before starting "
+                "a new one."
+            )
+        writer = self.journal.writer()
+        for op in self.plan(paths):
+            writer.append(Operation(*map(self._relative, op)))
+        writer.close()
+        if self.sniffer is not None:
+            self.sniffer.save()
+
+        summary = OrganizeSummary()
+        if writer.count:
+            self.reporter.start(writer.count)
+            summary = self._execute(done=0, offset=0)
+        summary.duplicates = self.duplicates
+        summary.skipped = self.skipped
+        summary.blocked = self.blocked
+        summary.elapsed = time.monotonic() - started
+        return summary
+
+    def resume(self) -> OrganizeSummary:
+        """Apply the operations an interrupted run left unfinished."""
+        if not self.journal.is_pending():
+            raise JournalError("There is no unfinished run to resume.")
+        started = time.monotonic()
+        done, offset = self.journal.read_checkpoint()
+        total = self.journal.total()
+        self.reporter.start(None if total is None else total - done)
+        summary = self._execute(done, offset, verify=True)
+        summary.elapsed = time.monotonic() - started
+        return summary
+
+    def undo(self) -> OrganizeSummary:
+        """Move journaled files back to where they came from."""
+        if not self.journal.exists():
+            raise JournalError("There is no journal to undo.")
+        started = time.monotonic()
+        self.reporter.start(self.journal.total())
+        summary = self._start_run()
+        emptied = set()
+        restored = []
+        # (current path, original path, whether it must be copied back).
+        batch: list[tuple[str, str, bool]] = []
+        # The current paths in batch, for constant-time overlap checks.
+        pending: set[str] = set()
+        for op in self.journal.read_ops_reversed():
+            src, dst = self._absolute(op.src), self._absolute(op.dst)
+            if dst in pending:
+                # A later operation wrote over this path; restore that first.
+                self._restore_batch(batch, summary)
+                batch, pending = [], set()
+            if os.path.lexists(dst) and not os.path.lexists(src):
+                restored.append(op.dst)
+                # Restore an independent copy rather than a second link.
+                batch.append((dst, src, op.link is not None))
+                pending.add(dst)
+                emptied.add(os.path.dirname(dst))
+                if len(batch) == self.batch_size:
+                    self._restore_batch(batch, summary)
+                    batch, pending = [], set()
+        self._restore_batch(batch, summary)
+
+        if self.index is not None:
+            self.index.forget(restored)
+        self.journal.remove()
+        for directory in sorted(emptied, reverse=True) + [self.state_dir]:
+            try:
+                os.rmdir(directory)
+            except OSError:
+                pass
+        summary.moves.sort()
+        summary.elapsed = time.monotonic() - started
+        return summary
+
+    def plan(self, paths: Iterable[str] | None = None) -> Iterator[Operation]:
+        """Yield the planned operations without touching the disk."""
+        self.duplicates = []
+        self.skipped = []
+        self.blocked = []
+        self._names = NameIndex()
+        self._digests = {}
+        entries = self._scan() if paths is None else self._entries(paths)
+        if self.dedupe is None:
+            for entry, dst in self._targets(entries):
+                if dst != entry.path:
+                    dst = self._resolve(entry.path, dst)
+                    if dst is not None:
+                        yield Operation(entry.path, dst)
+        else:
+            yield from self._plan_deduplicated(entries)
+
+    def _plan_deduplicated(self, entries: Iterable[os.DirEntry]) -> Iterator[Operation]:
+        """Plan with duplicates skipped, hard linked or only reported.
+
+        Every scanned file takes part in duplicate detection, including files
+        that are already in place; those are preferred as the kept copy.
+        """
+        files = []
+        for entry, dst in self._targets(entries):
+            try:
+                files.append((entry.path, entry.stat().st_size, dst))
+            except OSError:
+                continue
+        kept_of = self._find_duplicates(files)
+        final_of = {}
+        links = []
+        for path, _, dst in files:
+            kept = kept_of.get(path)
+            if dst == path or (kept is not None and self.dedupe == "skip"):
+                continue
+            if kept is not None and self.dedupe == "hardlink":
+                # Links go last so the kept file has been moved already.
+                links.append((path, dst, kept))
+                continue
+            dst = self._resolve(path, dst)
+            if dst is not None:
+                final_of[path] = dst
+                yield Operation(path, dst)
+        for path, dst, kept in links:
+            dst = self._resolve(path, dst)
+            if dst is not None:
+                yield Operation(path, dst, final_of.get(kept, kept))
+
+    def _find_duplicates(self, files: list[tuple[str, int, str]]) -> dict[str, str]:
+        """Record duplicate groups and map every duplicate to the kept file."""
+        target_of = {path: dst for path, _, dst in files}
+        kept_of = {}
+        for group in find_duplicates(
+            ((path, size) for path, size, _ in files), self.workers, self._digests
+        ):
+            group.sort(key=lambda path: (target_of[path] != path, path))
+            self.duplicates.append(group)
+            kept_of.update((path, group[0]) for path in group[1:])
+        return kept_of
+
+    def _resolve(self, src: str, dst: str) -> str | None:
+        """Apply the collision policy; ``None`` means leave ``src`` in place."""
+        directory, name = os.path.split(dst)
+        if not self._names.usable(directory):
+            # A file has the target folder's name; leave ``src`` for a later run.
+            self.blocked.append(src)
+            return None
+        if self._names.claim(directory, name) or self.on_collision == "overwrite":
+            return dst
+        if self.on_collision == "skip":
+            self.skipped.append(src)
+            return None
+        if self.on_collision == "hash-suffix":
+            if src not in self._digests:
+                digest = full_digest(src, 0)
+                if digest is not None:
+                    self._digests[src] = digest.hex()
+            if src in self._digests:
+                name = hash_suffixed(name, self._digests[src][:HASH_SUFFIX_LENGTH])
+                if self._names.claim(directory, name):
+                    return os.path.join(directory, name)
+        return os.path.join(directory, self._names.claim_numbered(directory, name))
+
+    def _targets(
+        self, entries: Iterable[os.DirEntry]
+    ) -> Iterator[tuple[os.DirEntry, str]]:
+        for entry in entries:
+            if self.index is not None and self.index.is_placed(entry):
+                # Put here by an earlier run: in place, no need to classify.
+                yield entry, entry.path
+                continue
+            ext = os.path.splitext(entry.name)[1].lower().strip(".")
+            if self.sniffer is not None:
+                ext = self.sniffer.classify(entry, ext)
+            folder = None
+            if self.rules is not None:
+                folder = self.rules.destination(entry, ext)
+            if folder is None:
+                folder = ext or "no_extension"
+            yield entry, os.path.join(self.directory, folder, entry.name)
+
+    def _start_run(self) -> OrganizeSummary:
+        self._target_devices.clear()
+        self._source_devices.clear()
+        return OrganizeSummary()
+
+    def _execute(self, done: int, offset: int, verify: bool = False) -> OrganizeSummary:
+        """Apply journaled operations from ``offset`` on, checkpointing per batch.
+
+        With ``verify`` the first batch skips operations that were already
+        applied before the previous run was interrupted.
+        """
+        summary = self._start_run()
+        pool = ThreadPoolExecutor(self.workers) if self.workers > 1 else None
+        batch: list[Operation] = []
+        try:
+            for op, offset in self.journal.read_ops(offset):
+                batch.append(Operation(*map(self._absolute, op)))
+                if len(batch) == self.batch_size:
+                    self._apply_batch(batch, summary, pool, verify)
+                    done += len(batch)
+                    self.journal.write_checkpoint(done, offset)
+                    batch, verify = [], False
+            if batch:
+                self._apply_batch(batch, summary, pool, verify)
+                self.journal.write_checkpoint(done + len(batch), offset)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        summary.moves.sort()
+        return summary
+
+    def _apply_batch(
+        self,
+        batch: list[Operation],
+        summary: OrganizeSummary,
+        pool: ThreadPoolExecutor | None,
+        verify: bool,
+    ) -> None:
+        if verify:
+            batch = [
+                op
+                for op in batch
+                if os.path.lexists(op.src) or not os.path.lexists(op.dst)
+            ]
+        moves = [(op.src, op.dst) for op in batch if op.link is None]
+        results = self._move_batch(moves, pool)
+        # Links run after the moves so their targets are in place.
+        unlinked = []
+        for op in batch:
+            if op.link is None:
+                continue
+            if self._link(op):
+                results.append((op.src, op.dst, LINKED))
+            else:
+                unlinked.append((op.src, op.dst))
+        # No hard links across devices or on this filesystem: plain moves.
+        results += self._move_batch(unlinked)
+        for result in results:
+            self._record(summary, result)
+        if self.index is not None:
+            self.index.add(((src, dst) for src, dst, _ in results), self._digests)
+
+    def _restore_batch(
+        self, batch: list[tuple[str, str, bool]], summary: OrganizeSummary
+    ) -> None:
+        """Move a batch back, copying links and cross-device files in one batch."""
+        results, copies = [], []
+        for current, original, copy in batch:
+            if not copy and self._rename(current, original):
+                results.append((current, original, RENAMED))
+            else:
+                self._target_device(os.path.dirname(original))
+                copies.append((current, original))
+        if copies:
+            results += self._copy_batch(copies)
+        for result in results:
+            self._record(summary, result)
+
+    def _record(self, summary: OrganizeSummary, result: tuple[str, str, str]) -> None:
+        summary.record(*result)
+        self.reporter.moved(*result)
+
+    def _relative(self, path: str | None) -> str | None:
+        if path is None:
+            return None
+        if path.startswith(self._prefix):
+            return path[len(self._prefix) :]
+        return os.path.relpath(path, self.directory)
+
+    def _absolute(self, path: str | None) -> str | None:
+        return None if path is None else os.path.join(self.directory, path)
+
+    def _scan(self) -> Iterator[os.DirEntry]:
+        """Yield regular files in a stable, name-sorted depth-first order.
+
+        ``DirEntry`` caches the file type from the directory read, so no extra
+        ``stat`` call is needed per entry. A subdirectory that cannot be read
+        is reported as failed and skipped.
+        """
+        pending = [self.directory]
+        while pending:
+            directory = pending.pop()
+            try:
+                with os.scandir(directory) as it:
+                    entries = sorted(it, key=lambda entry: entry.name)
+            except OSError as e:
+                if directory == self.directory:
+                    raise
+                self.reporter.failed(directory, e.strerror or str(e))
+                continue
 
-    def organize(self) -> None:
-        for filename in os.listdir(self.directory):
-            file_path = os.path.join(self.directory, filename)
+            subdirs = []
+            for entry in entries:
+                if entry.is_file():
+                    yield entry
+                elif (
+                    self.recursive
+                    and entry.is_dir(follow_symlinks=False)
+                    and entry.path != self.state_dir
+                ):
+                    subdirs.append(entry.path)
+            pending.extend(reversed(subdirs))
 
-            if os.path.isfile(file_path):
-                ext = os.path.splitext(filename)[1].lower().strip(".")
-                if not ext:
-                    ext = "no_extension"
+    def _entries(self, paths: Iterable[str]) -> Iterator[os.DirEntry]:
+        """Yield the entries of the given files, one directory read per folder."""
+        by_directory: dict[str, set[str]] = {}
+        for path in paths:
+            directory, name = os.path.split(path)
+            by_directory.setdefault(directory, set()).add(name)
 
-                target_dir = os.path.join(self.directory, ext)
-                os.makedirs(target_dir, exist_ok=True)
+        for directory in sorted(by_directory):
+            names = by_directory[directory]
+            try:
+                with os.scandir(directory) as it:
+                    entries = sorted(
+                        (entry for entry in it if entry.name in names),
+                        key=lambda entry: entry.name,
+                    )
+            except FileNotFoundError:
+                continue
+            yield from (entry for entry in entries if entry.is_file())
 
-                shutil.move(file_path, os.path.join(target_dir, filename))
-                print(f"Moved: {filename} -> {target_dir}")
+    def _move_batch(
+        self, moves: list[tuple[str, str]], pool: ThreadPoolExecutor | None = None
+    ) -> list[tuple[str, str, str]]:
+        """Rename files where possible and copy the rest as one durable batch."""
+        if pool is None:
+            renamed = [self._rename(src, dst) for src, dst in moves]
+        else:
+            # Moves onto the same destination stay in journal order.
+            by_target = _group_by_target(moves)
+            futures = [
+                pool.submit(self._rename_all, sources, dst)
+                for dst, sources in by_target.items()
+            ]
+            moves = [
+                (src, dst) for dst, sources in by_target.items() for src in sources
+            ]
+            renamed = [done for future in futures for done in future.result()]
+        results = [
+            (src, dst, RENAMED) for (src, dst), done in zip(moves, renamed) if done
+        ]
+        copies = [(src, dst) for (src, dst), done in zip(moves, renamed) if not done]
+        if copies:
+            results += self._copy_batch(copies)
+        return results
 
+    def _rename(self, src: str, dst: str) -> bool:
+        """Rename ``src`` to ``dst``; ``False`` if they are on different devices."""
+        target_device = self._target_device(os.path.dirname(dst))
+        if self._device_of(os.path.dirname(src)) != target_device:
+            return False
+        try:
+            os.replace(src, dst)
+        except OSError as e:
+            # Bind mounts can share a device id and still refuse renames.
+            if e.errno != errno.EXDEV:
+                raise
+            return False
+        return True
 
-def main() -> None:
+    def _rename_all(self, sources: list[str], dst: str) -> list[bool]:
+        return [self._rename(src, dst) for src in sources]
+
+    def _copy_batch(self, copies: list[tuple[str, str]]) -> list[tuple[str, str, str]]:
+        """Copy files across devices, then delete the sources once durable.
+
+        Copies run concurrently within the byte budget; sources are only
+        removed after every copy of the batch has been flushed to disk.
+        """
+        by_target = _group_by_target(copies)
+        budget = ByteBudget(self.copy_budget)
+        with ThreadPoolExecutor(max(self.workers, COPY_WORKERS)) as pool:
+            futures = [
+                pool.submit(self._copy_all, sources, dst, budget)
+                for dst, sources in by_target.items()
+            ]
+            for future in futures:
+                future.result()
+        make_durable(by_target)
+        for sources in by_target.values():
+            for src in sources:
+                os.unlink(src)
+        return [
+            (src, dst, COPIED) for dst, sources in by_target.items() for src in sources
+        ]
+
+    @staticmethod
+    def _copy_all(sources: list[str], dst: str, budget: ByteBudget) -> None:
+        for src in sources:
+            copy_file(src, dst, budget)
+
+    def _link(self, op: Operation) -> bool:
+        """Replace ``op.src`` with a hard link; ``False`` if links are refused."""
+        self._target_device(os.path.dirname(op.dst))
+        try:
+            os.link(op.link, op.dst)
+        except OSError:
+            return False
+        os.unlink(op.src)
+        return True
+
+    def _target_device(self, target_dir: str) -> int:
+        target_device = self._target_devices.get(target_dir)
+        if target_device is None:
+            os.makedirs(target_dir, exist_ok=True)
+            target_device = os.stat(target_dir).st_dev
+            self._target_devices[target_dir] = target_device
+        return target_device
+
+    def _device_of(self, directory: str) -> int:
+        device = self._source_devices.get(directory)
+        if device is None:
+            device = os.stat(directory).st_dev
+            self._source_devices[directory] = device
+        return device
+
+
+def _group_by_target(moves: list[tuple[str, str]]) -> dict[str, list[str]]:
+    by_target: dict[str, list[str]] = {}
+    for src, dst in moves:
+        by_target.setdefault(dst, []).append(src)
+    return by_target
+
+
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Organize files by extension.")
-    parser.add_argument("directory", help="Path to the directory to organize")
-    args = parser.parse_args()
+    parser.add_argument(
+        "directories",
+        nargs="*",
+        metavar="directory",
+        help="Path to a directory to organize; several are organized in parallel",
+    )
+    parser.add_argument(
+        "--roots-from",
+        metavar="FILE",
+        help="File listing directories to organize, one per line",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        help="Worker processes for several directories "
+        "(default: one per directory, up to the number of CPUs)",
+    )
+    parser.add_argument(
+        "-r",
+        "--recursive",
+        action="store_true",
+        help="Also organize files found in nested subdirectories",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of threads moving files in parallel (default: 1)",
+    )
+    parser.add_argument(
+        "--copy-budget",
+        type=int,
+        default=DEFAULT_COPY_BUDGET // (1024 * 1024),
+        metavar="MB",
+        help="Megabytes of cross-device copies allowed in flight at once "
+        "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--by-content",
+        action="store_true",
+        help="Detect file types from their first bytes instead of the name",
+    )
+    parser.add_argument(
+        "--dedupe",
+        choices=DEDUPE_POLICIES,
+        help="Skip, hard link or just report files with identical content",
+    )
+    parser.add_argument(
+        "--rules",
+        metavar="FILE",
+        help="TOML or JSON file with destination rules checked before the extension",
+    )
+    parser.add_argument(
+        "--index",
+        action="store_true",
+        help="Record moves in a SQLite index and skip files it already placed",
+    )
+    parser.add_argument(
+        "--on-collision",
+        choices=COLLISION_POLICIES,
+        default="rename",
+        help="What to do when the destination name is taken (default: rename)",
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print the planned moves without touching the disk",
+    )
+    mode.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted run from its journal",
+    )
+    mode.add_argument(
+        "--undo",
+        action="store_true",
+        help="Move the files of the last journaled run back",
+    )
+    mode.add_argument(
+        "--where",
+        metavar="NAME",
+        help="Look up where indexed files with this name (or glob) were moved",
+    )
+    mode.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and organize new files as they arrive",
+    )
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument(
+        "-q",
+        "--quiet",
+        action="store_true",
+        help="Print nothing except errors",
+    )
+    output.add_argument(
+        "--progress",
+        action="store_true",
+        help="Show a single progress line instead of one line per file",
+    )
+    output.add_argument(
+        "--json-lines",
+        action="store_true",
+        help="Print one JSON object per file and a final summary object",
+    )
+    parser.add_argument(
+        "--settle",
+        type=float,
+        default=DEFAULT_SETTLE,
+        help="Seconds a new file must stay unchanged before it is moved "
+        f"in --watch mode (default: {DEFAULT_SETTLE})",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    roots = collect_roots(parser, args)
+
+    reporter = make_reporter(args)
+    rules = load_rules(args.rules)
+    if len(roots) > 1:
+        run_roots(roots, args, reporter)
+        return
+    organizer = FileOrganizer(
+        roots[0], rules=rules, reporter=reporter, **organizer_options(args)
+    )
+    if args.where is not None:
+        print_where(organizer.index, args.where)
+        return
+    if args.dry_run:
+        for op in organizer.plan():
+            reporter.planned(op)
+        reporter.flush()
+        return
+    if args.watch:
+        try:
+            watch(
+                organizer,
+                settle=args.settle,
+                on_batch=lambda summary: reporter.finish(summary, "Organized"),
+            )
+        except KeyboardInterrupt:
+            pass
+        except (OSError, JournalError) as e:
+            reporter.flush()
+            sys.exit(f"Error: {e}")
+        return
+
+    summary = run(organizer, args)
+    reporter.finish(summary, "Restored" if args.undo else "Organized")
+
+
+def collect_roots(
+    parser: argparse.ArgumentParser, args: argparse.Namespace
+) -> list[str]:
+    roots = list(args.directories)
+    if args.roots_from:
+        try:
+            roots += read_roots(args.roots_from)
+        except OSError as e:
+            parser.error(f"cannot read {args.roots_from}: {e.strerror}")
+    if not roots:
+        parser.error("at least one directory is required")
+    if args.processes is not None and args.processes < 1:
+        parser.error("--processes must be at least 1")
+    if len(roots) > 1 and (args.dry_run or args.watch or args.where is not None):
+        parser.error("--dry-run, --watch and --where take a single directory")
+    return roots
+
+
+def read_roots(path: str) -> list[str]:
+    """Read directories from a file, one per line; ``#`` starts a comment."""
+    with open(path, "r", encoding="utf-8") as f:
+        lines = (line.strip() for line in f)
+        return [line for line in lines if line and not line.startswith("#")]
+
+
+def organizer_options(args: argparse.Namespace) -> dict:
+    return {
+        "recursive": args.recursive,
+        "workers": args.workers,
+        "by_content": args.by_content,
+        "dedupe": args.dedupe,
+        "on_collision": args.on_collision,
+        "copy_budget": args.copy_budget * 1024 * 1024,
+        "index": args.index or args.where is not None,
+    }
+
+
+def run_roots(roots: list[str], args: argparse.Namespace, reporter: Reporter) -> None:
+    """Organize several directories on a process pool and report each one."""
+    # Imported here because the roots module builds on this one.
+    from file_organizer.roots import merge_summaries, organize_roots
+
+    mode = "resume" if args.resume else "undo" if args.undo else "organize"
+    verb = "Restored" if args.undo else "Organized"
+    started = time.monotonic()
+    summaries, failed = [], 0
+    for result in organize_roots(
+        roots, mode, args.processes, args.rules, **organizer_options(args)
+    ):
+        if result.error is None:
+            summaries.append(result.summary)
+            reporter.finish(result.summary, verb, root=result.directory)
+        else:
+            failed += 1
+            reporter.failed(result.directory, result.error)
+    total = merge_summaries(summaries)
+    total.elapsed = time.monotonic() - started
+    reporter.finish(total, verb)
+    if failed:
+        sys.exit(f"Error: {failed} of {len(roots)} directories failed.")
+
+
+def run(organizer: FileOrganizer, args: argparse.Namespace) -> OrganizeSummary:
+    try:
+        if args.resume:
+            return organizer.resume()
+        if args.undo:
+            return organizer.undo()
+        return organizer.organize()
+    except JournalError as e:
+        organizer.reporter.flush()
+        sys.exit(f"Error: {e}")
+
+
+def print_where(index: MoveIndex, pattern: str) -> None:
+    if not index.exists():
+        sys.exit("Error: No index found; organize with --index first.")
+    moves = index.where(pattern)
+    for move in moves:
+        moved_at = time.strftime("%Y-%m-%d %H:%M", time.localtime(move.moved_at))
+        print(f"{move.src} -> {move.dst} ({move.size} bytes, moved {moved_at})")
+    if not moves:
+        print(f"No indexed file matches {pattern}")
+
+
+def make_reporter(args: argparse.Namespace) -> Reporter:
+    if args.quiet:
+        return Reporter()
+    if args.json_lines:
+        return JsonLinesReporter()
+    if args.progress:
+        return ProgressReporter()
+    return TextReporter()
+
 
-    organizer = FileOrganizer(args.directory)
-    organizer.organize()
+def load_rules(path: str | None) -> RuleSet | None:
+    if path is None:
+        return None
+    try:
+        return RuleSet.load(path)
+    except ValueError as e:
+        sys.exit(f"Error: {e}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,146 @@
+"""SQLite index of organized files.
+
+Every applied move is recorded with the original and new path (relative to
+the organized directory), size, mtime, inode and the content digest when one
+was computed. Rows are written once per batch in a single transaction. Later
+runs look up each directory once to recognize files still sitting where a
+previous run put them, and ``where`` answers "where did this file go" without
+walking the tree.
+"""
+
+import os
+import time
+import sqlite3
+from typing import Iterable, NamedTuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS moves (
+    dst TEXT PRIMARY KEY,
+    dst_dir TEXT NOT NULL,
+    name TEXT NOT NULL,
+    src TEXT NOT NULL,
+    original_name TEXT NOT NULL,
+    size INTEGER,
+    mtime_ns INTEGER,
+    ino INTEGER,
+    hash TEXT,
+    moved_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS moves_dst_dir ON moves (dst_dir);
+CREATE INDEX IF NOT EXISTS moves_name ON moves (name);
+CREATE INDEX IF NOT EXISTS moves_original_name ON moves (original_name);
+"""
+
+
+class IndexedMove(NamedTuple):
+    src: str
+    dst: str
+    size: int | None
+    mtime_ns: int | None
+    hash: str | None
+    moved_at: float
+
+
+class MoveIndex:
+    def __init__(self, path: str, root: str):
+        self.path = path
+        self.root = root
+        self._conn: sqlite3.Connection | None = None
+        # Directory (relative to the root) -> {name: inode} of indexed files.
+        self._placed: dict[str, dict[str, int | None]] = {}
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def is_placed(self, entry: os.DirEntry) -> bool:
+        """Return whether ``entry`` is a file a previous run put where it is.
+
+        The inode comes from the directory read, so no ``stat`` is needed.
+        """
+        directory = os.path.dirname(self._relative(entry.path))
+        placed = self._placed.get(directory)
+        if placed is None:
+            placed = self._placed[directory] = self._names_in(directory)
+        return entry.name in placed and placed[entry.name] == entry.inode()
+
+    def add(self, moves: Iterable[tuple[str, str]], digests: dict[str, str]) -> None:
+        """Record ``(src, dst)`` moves with absolute paths in one transaction."""
+        now = time.time()
+        rows = []
+        for src, dst in moves:
+            try:
+                st = os.lstat(dst)
+                size, mtime_ns, ino = st.st_size, st.st_mtime_ns, st.st_ino
+            except OSError:
+                size = mtime_ns = ino = None
+            rel_src, rel_dst = self._relative(src), self._relative(dst)
+            rows.append(
+                (
+                    rel_dst,
+                    os.path.dirname(rel_dst),
+                    os.path.basename(rel_dst),
+                    rel_src,
+                    os.path.basename(rel_src),
+                    size,
+                    mtime_ns,
+                    ino,
+                    digests.get(src),
+                    now,
+                )
+            )
+        if not rows:
+            return
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO moves VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        for row in rows:
+            self._placed.get(row[1], {})[row[2]] = row[7]
+
+    def forget(self, dsts: Iterable[str]) -> None:
+        """Drop the rows of files moved away from ``dsts`` (relative paths)."""
+        dsts = [(dst,) for dst in dsts]
+        if not dsts or not self.exists():
+            return
+        conn = self._connect()
+        with conn:
+            conn.executemany("DELETE FROM moves WHERE dst = ?", dsts)
+        self._placed.clear()
+
+    def where(self, pattern: str) -> list[IndexedMove]:
+        """Return moves whose original or new name matches a glob pattern."""
+        if not self.exists():
+            return []
+        rows = self._connect().execute(
+            "SELECT src, dst, size, mtime_ns, hash, moved_at FROM moves "
+            "WHERE name GLOB ?1 OR original_name GLOB ?1 ORDER BY moved_at, dst",
+            (pattern,),
+        )
+        return [IndexedMove(*row) for row in rows]
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _names_in(self, directory: str) -> dict[str, int | None]:
+        if not self.exists():
+            return {}
+        rows = self._connect().execute(
+            "SELECT name, ino FROM moves WHERE dst_dir = ?", (directory,)
+        )
+        return dict(rows)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._conn = sqlite3.connect(self.path)
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.execute("PRAGMA synchronous = NORMAL")
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def _relative(self, path: str) -> str:
+        return os.path.relpath(path, self.root)
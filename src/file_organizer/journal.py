@@ -0,0 +1,154 @@
+"""Append-only journal of planned file operations.
+
+The journal is a JSON-lines file: a header, one line per operation and an
+end marker once planning has finished. An operation moves ``src`` to ``dst``,
+or, when ``link`` is set, replaces ``src`` with a hard link to ``link``
+created at ``dst``. Paths are stored
+relative to the organized directory. Execution progress is tracked in a
+separate checkpoint file holding the number of applied operations and the
+byte offset of the next one, so a resumed run can seek straight to it.
+"""
+
+import os
+import json
+from typing import BinaryIO, Iterator, NamedTuple
+
+JOURNAL_VERSION = 1
+READ_BLOCK_SIZE = 1 << 16
+
+
+class JournalError(Exception):
+    """Raised when the journal state does not allow the requested action."""
+
+
+class Operation(NamedTuple):
+    src: str
+    dst: str
+    link: str | None = None
+
+
+class JournalWriter:
+    """Stream operations into a fresh journal, replacing the previous one."""
+
+    def __init__(self, journal: "Journal"):
+        self.journal = journal
+        self.count = 0
+        self._file: BinaryIO | None = None
+
+    def append(self, op: Operation) -> None:
+        if self._file is None:
+            # Opened lazily so an empty plan keeps the previous journal around.
+            self.journal.remove()
+            os.makedirs(os.path.dirname(self.journal.path), exist_ok=True)
+            self._file = open(self.journal.path, "wb")
+            self._write({"journal": JOURNAL_VERSION})
+        record = {"src": op.src, "dst": op.dst}
+        if op.link is not None:
+            record["link"] = op.link
+        self._write(record)
+        self.count += 1
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+        self._write({"end": self.count})
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        self._file = None
+
+    def _write(self, record: dict) -> None:
+        self._file.write(json.dumps(record).encode() + b"\n")
+
+
+class Journal:
+    def __init__(self, path: str):
+        self.path = path
+        self.checkpoint_path = path + ".checkpoint"
+
+    def exists(self) -> bool:
+        return os.path.isfile(self.path)
+
+    def writer(self) -> JournalWriter:
+        return JournalWriter(self)
+
+    def total(self) -> int | None:
+        """Number of planned operations, or ``None`` if planning never finished."""
+        if not self.exists():
+            return None
+        with open(self.path, "rb") as f:
+            last = next(_iter_lines_reversed(f), b"")
+        try:
+            return json.loads(last).get("end")
+        except ValueError:
+            return None
+
+    def is_pending(self) -> bool:
+        """Whether a fully planned run has operations left to apply."""
+        total = self.total()
+        return total is not None and self.read_checkpoint()[0] < total
+
+    def read_checkpoint(self) -> tuple[int, int]:
+        """Return ``(applied operations, offset of the next operation)``."""
+        try:
+            with open(self.checkpoint_path, "r") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return 0, 0
+        return data["done"], data["offset"]
+
+    def write_checkpoint(self, done: int, offset: int) -> None:
+        tmp_path = self.checkpoint_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"done": done, "offset": offset}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def read_ops(self, offset: int = 0) -> Iterator[tuple[Operation, int]]:
+        """Yield ``(operation, next_offset)`` for operations from ``offset`` on."""
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                offset += len(line)
+                record = json.loads(line)
+                if "src" in record:
+                    yield _operation(record), offset
+
+    def read_ops_reversed(self) -> Iterator[Operation]:
+        """Yield operations from the last one back to the first."""
+        with open(self.path, "rb") as f:
+            for line in _iter_lines_reversed(f):
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A run killed while planning can leave a torn last line.
+                    continue
+                if "src" in record:
+                    yield _operation(record)
+
+    def remove(self) -> None:
+        for path in (self.path, self.checkpoint_path):
+            if os.path.exists(path):
+                os.unlink(path)
+
+
+def _operation(record: dict) -> Operation:
+    return Operation(record["src"], record["dst"], record.get("link"))
+
+
+def _iter_lines_reversed(f: BinaryIO) -> Iterator[bytes]:
+    """Yield the non-empty lines of a binary file from the end, block by block."""
+    position = f.seek(0, os.SEEK_END)
+    tail = b""
+    while position > 0:
+        step = min(READ_BLOCK_SIZE, position)
+        position -= step
+        f.seek(position)
+        lines = (f.read(step) + tail).split(b"\n")
+        tail = lines.pop(0)
+        for line in reversed(lines):
+            if line:
+                yield line
+    if tail:
+        yield tail
@@ -0,0 +1,68 @@
+"""Collision-free destination names.
+
+Each target directory is listed once with ``os.scandir``; after that, checking
+whether a name is taken and claiming it are set operations. Numbered
+candidates (``report (1).pdf``, ``report (2).pdf``, ...) resume from the last
+number handed out for that name, so a folder with thousands of copies of the
+same file does not turn into thousands of probes per new copy. A target
+directory whose path is taken by a regular file is reported by ``usable``
+rather than raising, so callers can skip it.
+"""
+
+import os
+
+COLLISION_POLICIES = ("rename", "skip", "overwrite", "hash-suffix")
+
+
+class NameIndex:
+    def __init__(self):
+        self._names: dict[str, set[str]] = {}
+        self._next_number: dict[tuple[str, str], int] = {}
+        # Directories whose path (or a parent's) is a regular file.
+        self._blocked: set[str] = set()
+
+    def names(self, directory: str) -> set[str]:
+        """Return the names present or claimed in ``directory``."""
+        names = self._names.get(directory)
+        if names is None:
+            try:
+                with os.scandir(directory) as it:
+                    names = {entry.name for entry in it}
+            except FileNotFoundError:
+                names = set()
+            except NotADirectoryError:
+                names = set()
+                self._blocked.add(directory)
+            self._names[directory] = names
+        return names
+
+    def usable(self, directory: str) -> bool:
+        """Whether files can be placed in ``directory``: it is not a file."""
+        self.names(directory)
+        return directory not in self._blocked
+
+    def claim(self, directory: str, name: str) -> bool:
+        """Reserve ``name`` in ``directory``; return ``False`` if it is taken."""
+        names = self.names(directory)
+        if name in names:
+            return False
+        names.add(name)
+        return True
+
+    def claim_numbered(self, directory: str, name: str) -> str:
+        """Reserve and return the first free ``stem (n).ext`` variant of ``name``."""
+        names = self.names(directory)
+        stem, ext = os.path.splitext(name)
+        number = self._next_number.get((directory, name), 1)
+        while f"{stem} ({number}){ext}" in names:
+            number += 1
+        self._next_number[directory, name] = number + 1
+        candidate = f"{stem} ({number}){ext}"
+        names.add(candidate)
+        return candidate
+
+
+def hash_suffixed(name: str, digest: str) -> str:
+    """Insert a short content digest before the extension of ``name``."""
+    stem, ext = os.path.splitext(name)
+    return f"{stem}-{digest}{ext}"
@@ -0,0 +1,261 @@
+"""Output of organize runs.
+
+``FileOrganizer`` itself never prints; it hands every applied operation to a
+reporter, on the calling thread and one batch at a time. Reporters collect
+their output in memory and write it in large chunks, so a terminal or a slow
+pipe is touched a few times per batch instead of once per file. The base
+``Reporter`` prints nothing and backs ``--quiet``.
+"""
+
+import os
+import sys
+import json
+import time
+from collections import Counter
+from typing import TYPE_CHECKING, TextIO
+
+if TYPE_CHECKING:
+    from file_organizer.file_organizer import OrganizeSummary
+    from file_organizer.journal import Operation
+
+# Buffered output is written out once it grows past this many characters.
+FLUSH_SIZE = 64 * 1024
+# Minimum number of seconds between two redraws of the progress line.
+PROGRESS_INTERVAL = 0.5
+
+
+class Reporter:
+    """Receive the events of a run; this base class ignores all of them."""
+
+    def start(self, total: int | None) -> None:
+        """Called before the first operation with the number of operations."""
+
+    def planned(self, op: "Operation") -> None:
+        """Called for every operation of a dry run."""
+
+    def moved(self, src: str, dst: str, method: str) -> None:
+        """Called for every applied operation."""
+
+    def finish(
+        self, summary: "OrganizeSummary", verb: str, root: str | None = None
+    ) -> None:
+        """Called once the run is over, or once per directory of a multi-root run."""
+
+    def failed(self, root: str, error: str) -> None:
+        """Called for a failed root, watch batch or unreadable subdirectory."""
+
+    def flush(self) -> None:
+        """Write out anything still buffered."""
+
+
+class BufferedWriter:
+    """Collect text and write it to ``stream`` in ``FLUSH_SIZE`` chunks."""
+
+    def __init__(self, stream: TextIO | None = None):
+        self.stream = stream
+        self._parts: list[str] = []
+        self._size = 0
+
+    def write(self, text: str) -> None:
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= FLUSH_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        stream = self.stream or sys.stdout
+        if self._parts:
+            stream.write("".join(self._parts))
+            self._parts.clear()
+            self._size = 0
+        stream.flush()
+
+
+class TextReporter(Reporter):
+    """One line per file followed by a summary (the default output)."""
+
+    def __init__(self, stream: TextIO | None = None):
+        self.out = BufferedWriter(stream)
+
+    def planned(self, op: "Operation") -> None:
+        if op.link is None:
+            self.out.write(f"Would move: {op.src} -> {op.dst}\n")
+        else:
+            self.out.write(f"Would link: {op.src} -> {op.dst} (same as {op.link})\n")
+
+    def moved(self, src: str, dst: str, method: str) -> None:
+        name = os.path.basename(src)
+        if method == "linked":
+            self.out.write(f"Linked: {name} -> {os.path.dirname(dst)}\n")
+        else:
+            self.out.write(f"Moved: {name} -> {os.path.dirname(dst)}\n")
+
+    def finish(
+        self, summary: "OrganizeSummary", verb: str, root: str | None = None
+    ) -> None:
+        prefix = "" if root is None else f"{root}: "
+        for line in summary_lines(summary, verb):
+            self.out.write(f"{prefix}{line}\n")
+        self.out.flush()
+
+    def failed(self, root: str, error: str) -> None:
+        self.out.write(f"{root}: Failed: {error}\n")
+
+    def flush(self) -> None:
+        self.out.flush()
+
+
+class ProgressReporter(TextReporter):
+    """A single progress line redrawn at most every ``PROGRESS_INTERVAL``."""
+
+    def __init__(self, stream: TextIO | None = None, progress: TextIO | None = None):
+        super().__init__(stream)
+        self.progress = progress
+        self.total: int | None = None
+        self.done = 0
+        self.bytes = 0
+        self._started = 0.0
+        self._drawn = 0.0
+
+    def start(self, total: int | None) -> None:
+        self.total = total
+        self.done = 0
+        self.bytes = 0
+        self._started = self._drawn = time.monotonic()
+
+    def moved(self, src: str, dst: str, method: str) -> None:
+        self.done += 1
+        try:
+            self.bytes += os.lstat(dst).st_size
+        except OSError:
+            pass
+        self._tick()
+
+    def finish(
+        self, summary: "OrganizeSummary", verb: str, root: str | None = None
+    ) -> None:
+        if self.done:
+            self._draw(time.monotonic(), end="\n")
+            self.done = 0
+        super().finish(summary, verb, root)
+
+    def _tick(self) -> None:
+        now = time.monotonic()
+        if now - self._drawn >= PROGRESS_INTERVAL:
+            self._draw(now)
+
+    def _draw(self, now: float, end: str = "") -> None:
+        self._drawn = now
+        elapsed = max(now - self._started, 1e-9)
+        rate = self.done / elapsed
+        line = f"{self.done}"
+        if self.total:
+            line += f"/{self.total}"
+        line += f" files, {rate:.0f} files/s, {format_bytes(self.bytes)} moved"
+        if self.total and rate and self.done < self.total:
+            line += f", ETA {format_duration((self.total - self.done) / rate)}"
+        stream = self.progress or sys.stderr
+        stream.write(f"\r{line}\033[K{end}")
+        stream.flush()
+
+
+class JsonLinesReporter(Reporter):
+    """One JSON object per operation and a final ``summary`` object."""
+
+    def __init__(self, stream: TextIO | None = None):
+        self.out = BufferedWriter(stream)
+
+    def planned(self, op: "Operation") -> None:
+        record = {"action": "plan", "src": op.src, "dst": op.dst}
+        if op.link is not None:
+            record["link"] = op.link
+        self.out.write(json.dumps(record) + "\n")
+
+    def moved(self, src: str, dst: str, method: str) -> None:
+        record = {"action": method, "src": src, "dst": dst}
+        self.out.write(json.dumps(record) + "\n")
+
+    def finish(
+        self, summary: "OrganizeSummary", verb: str, root: str | None = None
+    ) -> None:
+        record = {
+            "summary": {
+                "root": root,
+                "verb": verb.lower(),
+                "files": len(summary.moves),
+                "renamed": summary.renamed,
+                "copied": summary.copied,
+                "linked": summary.linked,
+                "duplicates": summary.duplicates,
+                "skipped": summary.skipped,
+                "blocked": summary.blocked,
+                "extensions": extension_counts(summary),
+                "elapsed": round(summary.elapsed, 3),
+            }
+        }
+        self.out.write(json.dumps(record) + "\n")
+        self.out.flush()
+
+    def failed(self, root: str, error: str) -> None:
+        self.out.write(json.dumps({"root": root, "error": error}) + "\n")
+
+    def flush(self) -> None:
+        self.out.flush()
+
+
+def summary_lines(summary: "OrganizeSummary", verb: str) -> list[str]:
+    """Return the human-readable summary of a run."""
+    lines = []
+    for kept, *copies in summary.duplicates:
+        lines.extend(f"Duplicate: {copy} (same as {kept})" for copy in copies)
+    line = (
+        f"{verb} {len(summary.moves)} files "
+        f"({summary.renamed} renamed, {summary.copied} copied across devices"
+    )
+    if summary.linked:
+        line += f", {summary.linked} hard linked"
+    lines.append(f"{line}) in {format_duration(summary.elapsed)}")
+    counts = extension_counts(summary)
+    if counts:
+        lines.append(
+            "By extension: " + ", ".join(f"{ext} {n}" for ext, n in counts.items())
+        )
+    if summary.duplicates:
+        count = sum(len(group) - 1 for group in summary.duplicates)
+        lines.append(f"Found {count} duplicates in {len(summary.duplicates)} groups")
+    if summary.skipped:
+        lines.append(
+            f"Skipped {len(summary.skipped)} files whose name was already taken"
+        )
+    if summary.blocked:
+        lines.append(
+            f"Skipped {len(summary.blocked)} files whose target folder is a file"
+        )
+    return lines
+
+
+def extension_counts(summary: "OrganizeSummary") -> dict[str, int]:
+    """Count the moved files per extension, most common first."""
+    counts = Counter(
+        os.path.splitext(dst)[1].lower().strip(".") or "no_extension"
+        for _, dst in summary.moves
+    )
+    return dict(sorted(counts.items(), key=lambda item: (-item[1], item[0])))
+
+
+def format_bytes(size: int) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1000:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1000
+    return f"{size:.1f} TB"
+
+
+def format_duration(seconds: float) -> str:
+    if seconds < 60:
+        return f"{seconds:.2f}s"
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}h{minutes:02}m{seconds:02}s"
+    return f"{minutes}m{seconds:02}s"
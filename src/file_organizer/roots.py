@@ -0,0 +1,123 @@
+"""Organize several independent directories in parallel.
+
+Each directory ("root") is handled by its own ``FileOrganizer`` in a worker
+process, so a slow network share only occupies one worker while the others
+keep going. A failing root is reported with its error instead of stopping the
+rest, and the summaries of all roots can be merged into one. Every worker is
+a single-process executor of its own: if a worker dies (killed, out of
+memory, crashed), only the root it was running fails and the worker is
+replaced for the roots still waiting.
+"""
+
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from functools import partial
+from typing import Any, Callable, Iterable, Iterator, NamedTuple
+
+from file_organizer.file_organizer import FileOrganizer, OrganizeSummary
+from file_organizer.rules import RuleSet
+
+MODES = ("organize", "resume", "undo")
+
+
+class RootResult(NamedTuple):
+    directory: str
+    summary: OrganizeSummary | None
+    error: str | None = None
+
+
+def organize_root(
+    directory: str, mode: str, rules: str | None, options: dict[str, Any]
+) -> RootResult:
+    """Run one root in the current process; errors are returned, not raised."""
+    try:
+        organizer = FileOrganizer(
+            directory, rules=RuleSet.load(rules) if rules else None, **options
+        )
+        if mode == "resume":
+            summary = organizer.resume()
+        elif mode == "undo":
+            summary = organizer.undo()
+        else:
+            summary = organizer.organize()
+    except Exception as e:
+        return RootResult(directory, None, f"{type(e).__name__}: {e}")
+    return RootResult(directory, summary)
+
+
+def organize_roots(
+    directories: Iterable[str],
+    mode: str = "organize",
+    processes: int | None = None,
+    rules: str | None = None,
+    **options: Any,
+) -> Iterator[RootResult]:
+    """Organize every directory on a process pool, yielding results as they finish.
+
+    ``rules`` is the path of a rules file, loaded by each worker; ``options``
+    are passed on to ``FileOrganizer``.
+    """
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of {', '.join(MODES)}.")
+    directories = list(directories)
+    if processes is None:
+        processes = min(len(directories), os.cpu_count() or 1)
+    if processes < 1:
+        raise ValueError("processes must be at least 1.")
+
+    task = partial(organize_root, mode=mode, rules=rules, options=options)
+    return _run_isolated(directories, processes, task)
+
+
+def _run_isolated(
+    directories: list[str], processes: int, task: Callable[[str], RootResult]
+) -> Iterator[RootResult]:
+    """Run ``task`` for each root on ``processes`` single-process executors."""
+    waiting = iter(directories)
+    # Future -> (its single-process executor, its root).
+    running: dict[Future, tuple[ProcessPoolExecutor, str]] = {}
+
+    def start(worker: ProcessPoolExecutor | None) -> None:
+        """Give the next waiting root to ``worker``, or retire the worker."""
+        directory = next(waiting, None)
+        if directory is None:
+            if worker is not None:
+                worker.shutdown()
+            return
+        worker = worker or ProcessPoolExecutor(1)
+        running[worker.submit(task, directory)] = (worker, directory)
+
+    try:
+        for _ in range(processes):
+            start(None)
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                worker, directory = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # The worker process itself died; only its root is lost.
+                    result = RootResult(directory, None, f"{type(e).__name__}: {e}")
+                    worker.shutdown(wait=False)
+                    worker = None
+                yield result
+                start(worker)
+    finally:
+        for worker, _ in running.values():
+            worker.shutdown()
+
+
+def merge_summaries(summaries: Iterable[OrganizeSummary]) -> OrganizeSummary:
+    """Combine the summaries of several roots into one."""
+    merged = OrganizeSummary()
+    for summary in summaries:
+        merged.moves.extend(summary.moves)
+        merged.renamed += summary.renamed
+        merged.copied += summary.copied
+        merged.linked += summary.linked
+        merged.duplicates.extend(summary.duplicates)
+        merged.skipped.extend(summary.skipped)
+        merged.blocked.extend(summary.blocked)
+    merged.moves.sort()
+    return merged
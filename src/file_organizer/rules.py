@@ -0,0 +1,278 @@
+"""Rule-based destinations for FileOrganizer.
+
+A rules file (TOML or JSON) holds a list of ``rules``, checked in order; the
+first rule that matches a file decides its destination folder::
+
+    [[rules]]
+    glob = "*.log"
+    min_size = "100MB"
+    dest = "archive"
+
+    [[rules]]
+    regex = "^INV-\\d+"
+    dest = "invoices"
+
+    [[rules]]
+    modified_before = "2024-01-01"
+    dest = "old/{year}"
+
+``glob`` is matched case-insensitively against the whole file name and
+``regex`` is searched in it; a rule with neither matches every name. Size
+(``min_size``/``max_size``) and date (``modified_before``/``modified_after``)
+predicates are evaluated from the file's ``stat`` result, which is only
+fetched when a candidate rule needs it. ``dest`` may use ``{ext}``,
+``{year}``, ``{month}`` and ``{day}`` (the last three from the mtime).
+
+Patterns are compiled once: plain ``*.ext`` globs go into a dispatch table
+keyed by extension, and all other patterns are joined into one combined
+regular expression used to rule out non-matching names in a single pass.
+Patterns with backreferences or named groups would change meaning inside
+that alternation, so they are always tried on their own.
+"""
+
+import os
+import re
+import json
+import fnmatch
+import datetime
+from typing import Any, Callable
+
+SIZE_UNITS = {
+    "b": 1,
+    "kb": 1000,
+    "mb": 1000**2,
+    "gb": 1000**3,
+    "tb": 1000**4,
+    "kib": 1024,
+    "mib": 1024**2,
+    "gib": 1024**3,
+    "tib": 1024**4,
+}
+SIZE_PATTERN = re.compile(r"\s*(\d+(?:\.\d+)?)\s*([a-zA-Z]*)\s*")
+EXTENSION_GLOB = re.compile(r"\*\.([^*?\[\]/\\.]+)")
+# Numbered backreferences (an unescaped \1-\9), (?P=name) and (?(id)...).
+BACKREFERENCE = re.compile(r"(?<!\\)(?:\\\\)*\\[1-9]|\(\?P=|\(\?\(")
+TEMPLATE_FIELDS = {"ext", "year", "month", "day"}
+DATE_FIELDS = {"year", "month", "day"}
+RULE_KEYS = {
+    "glob",
+    "regex",
+    "min_size",
+    "max_size",
+    "modified_before",
+    "modified_after",
+    "dest",
+}
+
+
+class Rule:
+    def __init__(self, spec: dict[str, Any], index: int):
+        unknown = set(spec) - RULE_KEYS
+        if unknown:
+            raise ValueError(
+                f"Rule {index}: unknown keys {', '.join(sorted(unknown))}."
+            )
+        if "glob" in spec and "regex" in spec:
+            raise ValueError(f"Rule {index}: use either glob or regex, not both.")
+        if not isinstance(spec.get("dest"), str) or not spec["dest"].strip("/"):
+            raise ValueError(f"Rule {index}: dest is required.")
+
+        self.index = index
+        self.glob = spec.get("glob")
+        self.regex = spec.get("regex")
+        self.dest = spec["dest"].strip("/")
+        self.pattern = self._compile_pattern(index)
+        self.predicates = self._compile_predicates(spec, index)
+        fields = _template_fields(self.dest, index)
+        self.needs_stat = bool(self.predicates) or bool(fields & DATE_FIELDS)
+
+    def matches_name(self, name: str) -> bool:
+        if self.pattern is None:
+            return True
+        if self.glob is not None:
+            return self.pattern.match(name) is not None
+        return self.pattern.search(name) is not None
+
+    def matches_stat(self, st: os.stat_result) -> bool:
+        return all(predicate(st) for predicate in self.predicates)
+
+    def destination(self, ext: str, st: os.stat_result | None) -> str:
+        values = {"ext": ext}
+        if st is not None:
+            mtime = datetime.datetime.fromtimestamp(st.st_mtime)
+            values.update(
+                year=f"{mtime.year:04}",
+                month=f"{mtime.month:02}",
+                day=f"{mtime.day:02}",
+            )
+        return self.dest.format(**values)
+
+    def _compile_pattern(self, index: int) -> re.Pattern | None:
+        try:
+            if self.glob is not None:
+                return re.compile(fnmatch.translate(self.glob), re.IGNORECASE)
+            if self.regex is not None:
+                return re.compile(self.regex)
+        except re.error as e:
+            raise ValueError(f"Rule {index}: invalid pattern: {e}.") from None
+        return None
+
+    @staticmethod
+    def _compile_predicates(
+        spec: dict[str, Any], index: int
+    ) -> list[Callable[[os.stat_result], bool]]:
+        predicates = []
+        if "min_size" in spec:
+            low = parse_size(spec["min_size"], index)
+            predicates.append(lambda st: st.st_size >= low)
+        if "max_size" in spec:
+            high = parse_size(spec["max_size"], index)
+            predicates.append(lambda st: st.st_size <= high)
+        if "modified_before" in spec:
+            before = parse_date(spec["modified_before"], index)
+            predicates.append(lambda st: st.st_mtime < before)
+        if "modified_after" in spec:
+            after = parse_date(spec["modified_after"], index)
+            predicates.append(lambda st: st.st_mtime >= after)
+        return predicates
+
+
+class RuleSet:
+    def __init__(self, specs: list[dict[str, Any]]):
+        if not isinstance(specs, list) or not all(isinstance(s, dict) for s in specs):
+            raise ValueError("Rules must be a list of tables.")
+        self.rules = [Rule(spec, index) for index, spec in enumerate(specs, 1)]
+
+        # Dispatch table for "*.ext" globs, rules without a pattern (they
+        # always apply), one combined prefilter for most other patterns and
+        # the patterns that cannot be combined.
+        self._by_extension: dict[str, list[Rule]] = {}
+        self._always: list[Rule] = []
+        self._patterned: list[Rule] = []
+        self._standalone: list[Rule] = []
+        for rule in self.rules:
+            ext_match = EXTENSION_GLOB.fullmatch(rule.glob or "")
+            if ext_match:
+                ext = "." + ext_match.group(1).lower()
+                self._by_extension.setdefault(ext, []).append(rule)
+            elif rule.pattern is None:
+                self._always.append(rule)
+            elif _refers_to_groups(rule.pattern):
+                self._standalone.append(rule)
+            else:
+                self._patterned.append(rule)
+        self._prefilter = _combine(self._patterned)
+
+    @classmethod
+    def load(cls, path: str) -> "RuleSet":
+        """Read a rules file; ``.toml`` files are parsed as TOML, others as JSON."""
+        try:
+            if path.lower().endswith(".toml"):
+                data = _load_toml(path)
+            else:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+        except OSError as e:
+            raise ValueError(f"Cannot read rules file {path}: {e.strerror}.") from None
+        except ValueError as e:
+            raise ValueError(f"Invalid rules file {path}: {e}") from None
+        if not isinstance(data, dict) or "rules" not in data:
+            raise ValueError(f"Rules file {path} has no 'rules' list.")
+        return cls(data["rules"])
+
+    def destination(self, entry: os.DirEntry, ext: str) -> str | None:
+        """Return the folder of the first matching rule, or ``None``."""
+        name = entry.name
+        candidates = self._candidates(name)
+        st = None
+        for rule in candidates:
+            if rule.needs_stat and st is None:
+                try:
+                    st = entry.stat()
+                except OSError:
+                    return None
+            if rule.predicates and not rule.matches_stat(st):
+                continue
+            return rule.destination(ext or "no_extension", st)
+        return None
+
+    def _candidates(self, name: str) -> list[Rule]:
+        candidates = list(self._always)
+        candidates += self._by_extension.get(os.path.splitext(name)[1].lower(), ())
+        if self._patterned and (
+            self._prefilter is None or self._prefilter.search(name)
+        ):
+            candidates += [rule for rule in self._patterned if rule.matches_name(name)]
+        candidates += [rule for rule in self._standalone if rule.matches_name(name)]
+        if len(candidates) > 1:
+            candidates.sort(key=lambda rule: rule.index)
+        return candidates
+
+
+def parse_size(value: Any, index: int) -> int:
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    match = SIZE_PATTERN.fullmatch(str(value))
+    unit = match.group(2).lower() if match else ""
+    if not match or (unit or "b") not in SIZE_UNITS:
+        raise ValueError(f"Rule {index}: invalid size {value!r}.")
+    return int(float(match.group(1)) * SIZE_UNITS[unit or "b"])
+
+
+def parse_date(value: Any, index: int) -> float:
+    if isinstance(value, datetime.date) and not isinstance(value, datetime.datetime):
+        value = datetime.datetime.combine(value, datetime.time())
+    if not isinstance(value, datetime.datetime):
+        try:
+            value = datetime.datetime.fromisoformat(str(value))
+        except ValueError:
+            raise ValueError(f"Rule {index}: invalid date {value!r}.") from None
+    return value.timestamp()
+
+
+def _template_fields(template: str, index: int) -> set[str]:
+    fields = set(re.findall(r"{(\w*)}", template))
+    unknown = fields - TEMPLATE_FIELDS
+    if unknown:
+        raise ValueError(
+            f"Rule {index}: unknown placeholders {', '.join(sorted(unknown))}."
+        )
+    parts = template.replace("\\", "/").split("/")
+    if os.path.isabs(template) or ".." in parts:
+        raise ValueError(f"Rule {index}: dest must stay inside the directory.")
+    return fields
+
+
+def _refers_to_groups(pattern: re.Pattern) -> bool:
+    """Return whether group numbering or names matter to ``pattern``."""
+    return bool(pattern.groupindex) or BACKREFERENCE.search(pattern.pattern) is not None
+
+
+def _combine(rules: list[Rule]) -> re.Pattern | None:
+    """Join rule patterns into one regex that matches if any rule might."""
+    parts = []
+    for rule in rules:
+        if rule.glob is not None:
+            parts.append(f"^(?i:{rule.pattern.pattern})")
+        else:
+            parts.append(f"(?:{rule.pattern.pattern})")
+    try:
+        return re.compile("|".join(parts))
+    except re.error:
+        # Patterns with global inline flags cannot be nested; check each one.
+        return None
+
+
+def _load_toml(path: str) -> dict:
+    try:
+        import tomllib
+    except ImportError:
+        try:
+            import tomli as tomllib
+        except ImportError:
+            raise ValueError(
+                "TOML rules need Python 3.11+ or the tomli package; "
+                "use a JSON rules file instead."
+            ) from None
+    with open(path, "rb") as f:
+        return tomllib.load(f)
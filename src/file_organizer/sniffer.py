@@ -0,0 +1,147 @@
+"""Content-based file type detection from magic bytes.
+
+Only the first ``HEADER_SIZE`` bytes of a file are read. Results are kept in
+a persistent cache keyed by ``(st_dev, st_ino, st_size, st_mtime_ns)``, so
+files that were only renamed or moved since the last run are not re-read.
+"""
+
+import os
+import json
+
+# (offset, magic bytes, detected type), checked in order.
+SIGNATURES = (
+    (0, b"%PDF-", "pdf"),
+    (0, b"\x89PNG\r\n\x1a\n", "png"),
+    (0, b"\xff\xd8\xff", "jpg"),
+    (0, b"GIF87a", "gif"),
+    (0, b"GIF89a", "gif"),
+    (0, b"II*\x00", "tif"),
+    (0, b"MM\x00*", "tif"),
+    (0, b"PK\x03\x04", "zip"),
+    (0, b"PK\x05\x06", "zip"),
+    (0, b"\x1f\x8b", "gz"),
+    (0, b"BZh", "bz2"),
+    (0, b"\xfd7zXZ\x00", "xz"),
+    (0, b"7z\xbc\xaf\x27\x1c", "7z"),
+    (0, b"Rar!\x1a\x07", "rar"),
+    (0, b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", "doc"),
+    (0, b"SQLite format 3\x00", "sqlite"),
+    (0, b"{\\rtf", "rtf"),
+    (0, b"%!PS", "ps"),
+    (0, b"\x7fELF", "elf"),
+    (0, b"MZ", "exe"),
+    (0, b"ID3", "mp3"),
+    (0, b"OggS", "ogg"),
+    (0, b"fLaC", "flac"),
+    (0, b"\x1aE\xdf\xa3", "mkv"),
+    (4, b"ftyp", "mp4"),
+    (8, b"WEBP", "webp"),
+    (8, b"WAVE", "wav"),
+    (8, b"AVI ", "avi"),
+    (257, b"ustar", "tar"),
+)
+HEADER_SIZE = max(offset + len(magic) for offset, magic, _ in SIGNATURES)
+
+# Extensions that are more specific than, but consistent with, a detected
+# type. A ``report.docx`` sniffed as ``zip`` keeps its own extension.
+COMPATIBLE_EXTENSIONS = {
+    "jpg": {"jpeg", "jpe", "jfif"},
+    "tif": {"tiff", "dng", "nef", "cr2"},
+    "zip": {"docx", "xlsx", "pptx", "odt", "ods", "odp", "jar", "apk", "epub"},
+    "gz": {"tgz"},
+    "doc": {"xls", "ppt", "msi"},
+    "exe": {"dll", "sys", "scr"},
+    "elf": {"so", "o"},
+    "ogg": {"oga", "ogv", "opus"},
+    "mkv": {"webm"},
+    "mp4": {"m4a", "m4v", "mov", "3gp", "heic", "avif"},
+    "sqlite": {"db", "sqlite3"},
+    "ps": {"eps"},
+}
+
+
+def detect(header: bytes) -> str | None:
+    """Return the type matching ``header``, or ``None`` if it is unknown."""
+    for offset, magic, kind in SIGNATURES:
+        if header.startswith(magic, offset):
+            return kind
+    return None
+
+
+def read_header(path: str) -> bytes:
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        return os.read(fd, HEADER_SIZE)
+    finally:
+        os.close(fd)
+
+
+class ContentSniffer:
+    """Classify files by content, remembering results between runs."""
+
+    def __init__(self, cache_path: str):
+        self.cache_path = cache_path
+        self.hits = 0
+        self.misses = 0
+        self._cache: dict[str, str] | None = None
+        self._seen: set[str] = set()
+
+    def classify(self, entry: os.DirEntry, ext: str) -> str:
+        """Return the folder name for ``entry`` whose name has extension ``ext``.
+
+        Falls back to ``ext`` when the content is not recognized or is
+        consistent with the extension.
+        """
+        kind = self.sniff(entry)
+        if kind is None or ext == kind or ext in COMPATIBLE_EXTENSIONS.get(kind, ()):
+            return ext
+        return kind
+
+    def sniff(self, entry: os.DirEntry) -> str | None:
+        if self._cache is None:
+            self._cache = self._load()
+        try:
+            st = entry.stat()
+        except OSError:
+            return None
+
+        key = f"{st.st_dev}:{st.st_ino}:{st.st_size}:{st.st_mtime_ns}"
+        kind = self._cache.get(key)
+        if kind is not None:
+            self.hits += 1
+            self._seen.add(key)
+            return kind or None
+
+        self.misses += 1
+        try:
+            kind = detect(read_header(entry.path))
+        except OSError:
+            return None
+        # An empty string records "looked at, nothing recognized".
+        self._cache[key] = kind or ""
+        self._seen.add(key)
+        return kind
+
+    def save(self) -> None:
+        """Persist results for the files seen in this run.
+
+        Entries for files that were not seen are dropped, which keeps the cache
+        proportional to the tree instead of growing forever.
+        """
+        if self._cache is None:
+            return
+        if not self.misses and len(self._seen) == len(self._cache):
+            return
+        kept = {key: self._cache[key] for key in self._seen}
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        tmp_path = self.cache_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(kept, f, separators=(",", ":"))
+        os.replace(tmp_path, self.cache_path)
+
+    def _load(self) -> dict[str, str]:
+        try:
+            with open(self.cache_path, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
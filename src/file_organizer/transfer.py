@@ -0,0 +1,183 @@
+"""Copying files across filesystems.
+
+When a rename is not possible the data is copied inside the kernel with
+``os.copy_file_range`` (or ``os.sendfile`` where that is refused), falling
+back to ``pread``/``write`` only when neither works. Several copies can run at
+once; a ``ByteBudget`` caps the number of bytes in flight so a handful of
+large media files do not saturate the disks. Durability is handled per batch:
+``make_durable`` flushes each destination filesystem and directory once, so
+sources can be deleted safely without an ``fsync`` per file.
+"""
+
+import os
+import sys
+import errno
+import shutil
+import ctypes
+import ctypes.util
+import threading
+from contextlib import contextmanager
+from typing import Iterable, Iterator
+
+# Bytes handed to the kernel per copy call.
+COPY_CHUNK = 8 * 1024 * 1024
+# Bytes of concurrent copies allowed in flight by default.
+DEFAULT_COPY_BUDGET = 256 * 1024 * 1024
+# Threads used for cross-device copies when fewer workers were asked for.
+COPY_WORKERS = 4
+
+# Errors meaning "this kind of kernel copy is not possible here".
+UNSUPPORTED_ERRNOS = {
+    errno.EXDEV,
+    errno.ENOSYS,
+    errno.EINVAL,
+    errno.EOPNOTSUPP,
+    errno.ENOTSUP,
+    errno.EBADF,
+}
+
+
+class ByteBudget:
+    """Block new copies while more than ``limit`` bytes are being copied."""
+
+    def __init__(self, limit: int = DEFAULT_COPY_BUDGET):
+        if limit < 1:
+            raise ValueError("copy budget must be at least 1 byte.")
+        self.limit = limit
+        self.in_flight = 0
+        self._condition = threading.Condition()
+
+    @contextmanager
+    def reserve(self, size: int) -> Iterator[None]:
+        # A file larger than the whole budget is copied on its own.
+        with self._condition:
+            self._condition.wait_for(
+                lambda: not self.in_flight or self.in_flight + size <= self.limit
+            )
+            self.in_flight += size
+        try:
+            yield
+        finally:
+            with self._condition:
+                self.in_flight -= size
+                self._condition.notify_all()
+
+
+def copy_file(src: str, dst: str, budget: ByteBudget | None = None) -> int:
+    """Copy ``src`` with its metadata to ``dst`` and return the bytes copied.
+
+    Symbolic links are recreated rather than followed.
+    """
+    if os.path.islink(src):
+        shutil.copy2(src, dst, follow_symlinks=False)
+        return 0
+    with open(src, "rb") as fsrc:
+        size = os.fstat(fsrc.fileno()).st_size
+        with open(dst, "wb") as fdst:
+            if budget is None:
+                copied = copy_data(fsrc.fileno(), fdst.fileno())
+            else:
+                with budget.reserve(size):
+                    copied = copy_data(fsrc.fileno(), fdst.fileno())
+    shutil.copystat(src, dst, follow_symlinks=False)
+    return copied
+
+
+def copy_data(infd: int, outfd: int) -> int:
+    """Copy everything from ``infd`` to the position of ``outfd``.
+
+    The source is read at explicit offsets and the destination position
+    advances with every write, so a copy that has to switch to a slower method
+    part way through simply carries on where the previous one stopped.
+    """
+    methods = [_read_write]
+    if hasattr(os, "sendfile") and sys.platform.startswith("linux"):
+        methods.insert(0, _sendfile)
+    if hasattr(os, "copy_file_range"):
+        methods.insert(0, _copy_file_range)
+
+    offset = 0
+    while True:
+        try:
+            copied = methods[0](infd, outfd, offset)
+        except OSError as e:
+            if e.errno not in UNSUPPORTED_ERRNOS or len(methods) == 1:
+                raise
+            methods.pop(0)
+            continue
+        if not copied:
+            return offset
+        offset += copied
+
+
+def make_durable(paths: Iterable[str]) -> None:
+    """Flush copied files and their directory entries to disk.
+
+    Each destination filesystem is flushed once with ``syncfs`` where the C
+    library has it; otherwise every file is synced on its own. Every parent
+    directory is then synced once so the new names are durable too.
+    """
+    by_directory: dict[str, list[str]] = {}
+    for path in paths:
+        by_directory.setdefault(os.path.dirname(path), []).append(path)
+
+    synced_devices = set()
+    for directory, files in by_directory.items():
+        fd = os.open(directory, os.O_RDONLY)
+        try:
+            device = os.fstat(fd).st_dev
+            if device not in synced_devices:
+                if _syncfs(fd):
+                    synced_devices.add(device)
+                else:
+                    for path in files:
+                        _fsync_path(path)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+def _copy_file_range(infd: int, outfd: int, offset: int) -> int:
+    return os.copy_file_range(infd, outfd, COPY_CHUNK, offset)
+
+
+def _sendfile(infd: int, outfd: int, offset: int) -> int:
+    return os.sendfile(outfd, infd, offset, COPY_CHUNK)
+
+
+def _read_write(infd: int, outfd: int, offset: int) -> int:
+    data = os.pread(infd, COPY_CHUNK, offset)
+    view = memoryview(data)
+    while view:
+        view = view[os.write(outfd, view) :]
+    return len(data)
+
+
+def _fsync_path(path: str) -> None:
+    if os.path.islink(path):
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _load_syncfs():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        syncfs = libc.syncfs
+    except (OSError, AttributeError):
+        return None
+    syncfs.argtypes = [ctypes.c_int]
+    return syncfs
+
+
+_libc_syncfs = _load_syncfs()
+
+
+def _syncfs(fd: int) -> bool:
+    """Flush the filesystem holding ``fd``; ``False`` if that is unsupported."""
+    return _libc_syncfs is not None and _libc_syncfs(fd) == 0
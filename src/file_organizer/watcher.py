@@ -0,0 +1,309 @@
+"""Watch a directory and organize files as they arrive.
+
+On Linux the kernel is asked for events through inotify (via ``ctypes``);
+elsewhere directories are polled and only re-read when their mtime changes.
+A file is organized once no new event has been seen for it during the settle
+period, so files that are still being written are left alone, and every file
+that settled in the same window is handled by a single organize run.
+
+A run that fails (a file deleted or locked between planning and moving it, a
+permission error) is reported through the organizer's reporter instead of
+stopping the watch. Its journal is dropped, since the moves it did apply are
+final, and the batch is planned once more so the files that are still there
+get organized.
+"""
+
+import os
+import sys
+import time
+import ctypes
+import ctypes.util
+import select
+import struct
+import threading
+from typing import TYPE_CHECKING, Callable, Iterable
+
+if TYPE_CHECKING:
+    from file_organizer.file_organizer import FileOrganizer, OrganizeSummary
+
+DEFAULT_SETTLE = 2.0
+DEFAULT_POLL_INTERVAL = 1.0
+# Upper bound on one wait, so a stop request is noticed promptly.
+MAX_WAIT = 1.0
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0)
+
+EVENT_HEADER = struct.Struct("iIII")
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MODIFY | IN_CREATE
+READ_SIZE = 64 * 1024
+
+
+class PollingWatcher:
+    """Report changed files by polling directory and file modification times."""
+
+    def __init__(
+        self,
+        directories: Iterable[str],
+        recursive: bool = False,
+        skip: Iterable[str] = (),
+        settle: float = DEFAULT_SETTLE,
+        interval: float = DEFAULT_POLL_INTERVAL,
+    ):
+        self.recursive = recursive
+        self.skip = set(skip)
+        self.settle = settle
+        self.interval = interval
+        self._dir_mtimes: dict[str, int] = {}
+        self._listings: dict[str, set[str]] = {}
+        # Recently changed files: path -> (size, mtime_ns, last change time).
+        self._tracked: dict[str, tuple[int, int, float]] = {}
+        for directory in directories:
+            self._list(directory, initial=True)
+
+    def changes(self, timeout: float) -> set[str]:
+        time.sleep(min(timeout, self.interval))
+        changed = set()
+        for directory in list(self._dir_mtimes):
+            try:
+                mtime = os.stat(directory).st_mtime_ns
+            except FileNotFoundError:
+                self._forget(directory)
+                continue
+            if mtime != self._dir_mtimes[directory]:
+                changed.update(self._list(directory))
+
+        now = time.monotonic()
+        for path, (size, mtime, seen) in list(self._tracked.items()):
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                del self._tracked[path]
+                continue
+            if (st.st_size, st.st_mtime_ns) != (size, mtime):
+                self._tracked[path] = (st.st_size, st.st_mtime_ns, now)
+                changed.add(path)
+            elif now - seen > self.settle:
+                del self._tracked[path]
+        return changed
+
+    def close(self) -> None:
+        pass
+
+    def _list(self, directory: str, initial: bool = False) -> set[str]:
+        """Re-read ``directory`` and return the files that were not there before.
+
+        The first listing of the watched tree only records what exists.
+        """
+        try:
+            self._dir_mtimes[directory] = os.stat(directory).st_mtime_ns
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except FileNotFoundError:
+            self._forget(directory)
+            return set()
+
+        previous = self._listings.get(directory)
+        self._listings[directory] = {entry.name for entry in entries}
+        new_files = set()
+        for entry in entries:
+            if previous is not None and entry.name in previous:
+                continue
+            if entry.is_file():
+                if not initial:
+                    try:
+                        st = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    self._tracked[entry.path] = (
+                        st.st_size,
+                        st.st_mtime_ns,
+                        time.monotonic(),
+                    )
+                    new_files.add(entry.path)
+            elif (
+                self.recursive
+                and entry.is_dir(follow_symlinks=False)
+                and entry.path not in self.skip
+            ):
+                new_files.update(self._list(entry.path, initial))
+        return new_files
+
+    def _forget(self, directory: str) -> None:
+        self._dir_mtimes.pop(directory, None)
+        self._listings.pop(directory, None)
+
+
+class InotifyWatcher:
+    """Report changed files from Linux inotify events."""
+
+    def __init__(
+        self,
+        directories: Iterable[str],
+        recursive: bool = False,
+        skip: Iterable[str] = (),
+    ):
+        self.recursive = recursive
+        self.skip = set(skip)
+        self.overflowed = False
+        self._libc = _load_libc()
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._watches: dict[int, str] = {}
+        for directory in directories:
+            self._add_tree(directory)
+
+    def changes(self, timeout: float) -> set[str]:
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+        try:
+            data = os.read(self._fd, READ_SIZE)
+        except BlockingIOError:
+            return set()
+
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+            changed.update(self._handle(wd, mask, os.fsdecode(name)))
+        return changed
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _handle(self, wd: int, mask: int, name: str) -> set[str]:
+        if mask & IN_Q_OVERFLOW:
+            # Events were dropped; the caller falls back to a full scan.
+            self.overflowed = True
+            return set()
+        if mask & IN_IGNORED:
+            self._watches.pop(wd, None)
+            return set()
+        directory = self._watches.get(wd)
+        if directory is None or not name:
+            return set()
+
+        path = os.path.join(directory, name)
+        if not mask & IN_ISDIR:
+            return {path}
+        if self.recursive and mask & (IN_CREATE | IN_MOVED_TO):
+            # Files may already be inside a directory that was moved in.
+            return self._add_tree(path)
+        return set()
+
+    def _add_tree(self, directory: str) -> set[str]:
+        """Watch ``directory`` (and its subdirectories) and return its files."""
+        if directory in self.skip:
+            return set()
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            return set()
+        self._watches[wd] = directory
+
+        found = set()
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except FileNotFoundError:
+            return found
+        for entry in entries:
+            if entry.is_file():
+                found.add(entry.path)
+            elif self.recursive and entry.is_dir(follow_symlinks=False):
+                found.update(self._add_tree(entry.path))
+        return found
+
+
+def _load_libc() -> ctypes.CDLL:
+    libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    libc.inotify_init1.argtypes = [ctypes.c_int]
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    return libc
+
+
+def open_watcher(organizer: "FileOrganizer", settle: float, polling: bool = False):
+    """Return an inotify watcher when available, otherwise a polling one."""
+    args = ([organizer.directory], organizer.recursive, [organizer.state_dir])
+    if not polling and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(*args)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(*args, settle=settle)
+
+
+def watch(
+    organizer: "FileOrganizer",
+    settle: float = DEFAULT_SETTLE,
+    stop: threading.Event | None = None,
+    on_batch: Callable[["OrganizeSummary"], None] | None = None,
+    polling: bool = False,
+) -> None:
+    """Organize the directory, then keep organizing files as they settle.
+
+    Runs until ``stop`` is set (or forever). ``on_batch`` receives the summary
+    of every organize run that moved at least one file; runs that fail are
+    reported to ``organizer.reporter`` and the watch goes on.
+    """
+    stop = stop or threading.Event()
+    watcher = open_watcher(organizer, settle, polling)
+
+    # Catch up with files that were there before the watch started.
+    _organize_batch(organizer, None, on_batch)
+    last_event: dict[str, float] = {}
+    try:
+        while not stop.is_set():
+            now = time.monotonic()
+            wait = MAX_WAIT
+            if last_event:
+                wait = min(wait, max(0.0, settle - (now - min(last_event.values()))))
+            for path in watcher.changes(wait):
+                last_event[path] = time.monotonic()
+
+            if getattr(watcher, "overflowed", False):
+                watcher.overflowed = False
+                last_event.clear()
+                _organize_batch(organizer, None, on_batch)
+                continue
+
+            now = time.monotonic()
+            ready = [path for path, seen in last_event.items() if now - seen >= settle]
+            if ready:
+                for path in ready:
+                    del last_event[path]
+                _organize_batch(organizer, ready, on_batch)
+    finally:
+        watcher.close()
+
+
+def _organize_batch(
+    organizer: "FileOrganizer",
+    paths: list[str] | None,
+    on_batch: Callable[["OrganizeSummary"], None] | None,
+) -> None:
+    """Organize one batch; on failure, report it and plan the batch once more."""
+    for _ in range(2):
+        try:
+            summary = organizer.organize(paths)
+        except OSError as e:
+            organizer.reporter.failed(organizer.directory, str(e))
+            # Applied moves stand; drop the journal so later batches can run.
+            organizer.journal.remove()
+            continue
+        if on_batch is not None and summary.moves:
+            on_batch(summary)
+        return
@@ -0,0 +1,175 @@
+"""Offline breached-password checks against a sorted binary hash file.
+
+``build`` converts a text dump of SHA-1 hashes (one per line, optionally
+followed by ``:count`` as in the Have I Been Pwned downloads, in any order)
+into a binary file: a header, a fan-out table and the sorted, deduplicated
+digests as fixed-width records. The fan-out table holds, for every 2-byte
+prefix, the index of the first record with that prefix, so a lookup
+binary-searches only the few records sharing its prefix, reading them
+straight from an ``mmap`` of the file. Unsorted input is sorted in runs of
+``RUN_SIZE`` hashes that are merged from temporary files, so memory use does
+not depend on the size of the dump.
+"""
+
+import os
+import heapq
+import mmap
+import struct
+import hashlib
+import tempfile
+from array import array
+from typing import BinaryIO, Iterable, Iterator
+
+MAGIC = b"PWBH"
+# Magic, digest size, record count.
+HEADER = struct.Struct("<4sIQ")
+FANOUT_SIZE = 65536 + 1
+DATA_OFFSET = HEADER.size + FANOUT_SIZE * 8
+DIGEST_SIZE = hashlib.sha1().digest_size
+# Hashes sorted in memory at a time while building.
+RUN_SIZE = 4_000_000
+
+
+def sha1(password: str) -> bytes:
+    return hashlib.sha1(password.encode("utf-8")).digest()
+
+
+class BreachIndex:
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._data) < DATA_OFFSET:
+            self._data.close()
+            raise ValueError(f"{path} is not a breach hash file.")
+        magic, self.digest_size, self.count = HEADER.unpack_from(self._data)
+        if (
+            magic != MAGIC
+            or self.digest_size != DIGEST_SIZE
+            or len(self._data) != DATA_OFFSET + self.count * self.digest_size
+        ):
+            self._data.close()
+            raise ValueError(f"{path} is not a breach hash file.")
+        self._fanout = array("Q", self._data[HEADER.size : DATA_OFFSET])
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, password: str) -> bool:
+        return self.contains_digest(sha1(password))
+
+    def contains_digest(self, digest: bytes) -> bool:
+        prefix = int.from_bytes(digest[:2], "big")
+        lo, hi = self._fanout[prefix], self._fanout[prefix + 1]
+        data, size = self._data, self.digest_size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = DATA_OFFSET + mid * size
+            record = data[start : start + size]
+            if record < digest:
+                lo = mid + 1
+            elif record > digest:
+                hi = mid
+            else:
+                return True
+        return False
+
+    def check_many(self, passwords: Iterable[str]) -> Iterator[tuple[str, bool]]:
+        """Yield ``(password, breached)`` for every password, in order."""
+        contains = self.contains_digest
+        for password in passwords:
+            yield password, contains(sha1(password))
+
+    def close(self) -> None:
+        self._data.close()
+
+
+def build(dump: BinaryIO, path: str, run_size: int = RUN_SIZE) -> int:
+    """Write the binary hash file for a text dump; return the number of hashes."""
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.TemporaryDirectory(dir=directory) as tmpdir:
+        runs = _write_runs(dump, tmpdir, run_size)
+        files = [open(run, "rb") for run in runs]
+        try:
+            tmp = os.path.join(tmpdir, "merged")
+            count = _write_index(heapq.merge(*map(_read_run, files)), tmp)
+        finally:
+            for f in files:
+                f.close()
+        os.replace(tmp, path)
+    return count
+
+
+def parse_hashes(dump: BinaryIO) -> Iterator[bytes]:
+    """Yield the digest on each line of a ``HASH[:count]`` text dump."""
+    for number, line in enumerate(dump, 1):
+        line = line.strip()
+        if not line:
+            continue
+        text = line.split(b":", 1)[0]
+        try:
+            digest = bytes.fromhex(text.decode("ascii"))
+        except ValueError:
+            digest = b""
+        if len(digest) != DIGEST_SIZE:
+            raise ValueError(f"line {number}: not a SHA-1 hash.")
+        yield digest
+
+
+def _write_runs(dump: BinaryIO, directory: str, run_size: int) -> list[str]:
+    runs: list[str] = []
+    batch: list[bytes] = []
+    for digest in parse_hashes(dump):
+        batch.append(digest)
+        if len(batch) >= run_size:
+            runs.append(_flush_run(batch, directory, len(runs)))
+            batch = []
+    if batch or not runs:
+        runs.append(_flush_run(batch, directory, len(runs)))
+    return runs
+
+
+def _flush_run(batch: list[bytes], directory: str, number: int) -> str:
+    # Dumps are usually sorted already; timsort handles that in linear time.
+    batch.sort()
+    path = os.path.join(directory, f"run-{number:05d}")
+    with open(path, "wb") as f:
+        f.write(b"".join(batch))
+    return path
+
+
+def _read_run(f: BinaryIO) -> Iterator[bytes]:
+    while True:
+        block = f.read(DIGEST_SIZE * 4096)
+        if not block:
+            return
+        for start in range(0, len(block), DIGEST_SIZE):
+            yield block[start : start + DIGEST_SIZE]
+
+
+def _write_index(digests: Iterable[bytes], path: str) -> int:
+    """Write header, fan-out table and deduplicated sorted records."""
+    fanout = array("Q", bytes(8 * FANOUT_SIZE))
+    count = 0
+    previous = None
+    with open(path, "wb") as f:
+        f.seek(DATA_OFFSET)
+        batch: list[bytes] = []
+        for digest in digests:
+            if digest == previous:
+                continue
+            previous = digest
+            fanout[int.from_bytes(digest[:2], "big") + 1] += 1
+            batch.append(digest)
+            count += 1
+            if len(batch) >= 65536:
+                f.write(b"".join(batch))
+                batch.clear()
+        f.write(b"".join(batch))
+        # Per-prefix counts to the index of each prefix's first record.
+        for prefix in range(1, FANOUT_SIZE):
+            fanout[prefix] += fanout[prefix - 1]
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, DIGEST_SIZE, count))
+        fanout.tofile(f)
+    return count
@@ -0,0 +1,133 @@
+"""Cryptographically secure character sampling.
+
+Random bytes come from ``os.urandom`` in large blocks (or, for reproducible
+tests only, from a seeded source). Each byte is mapped to
+a character of the alphabet with ``bytes.translate``: bytes below the largest
+multiple of the alphabet size that fits in a byte map to ``alphabet[b % n]``,
+and the remaining bytes are deleted in the same call (rejection sampling), so
+every character is equally likely and the whole buffer is converted in C.
+"""
+
+import os
+import math
+import random
+from typing import Callable
+
+# Random bytes requested from the OS per refill.
+REFILL_SIZE = 64 * 1024
+
+# A function returning n random bytes, like os.urandom.
+ByteSource = Callable[[int], bytes]
+
+
+def seeded_source(seed: int, stream: int = 0) -> ByteSource:
+    """Return a reproducible byte source for tests; never use it for real secrets.
+
+    Each ``(seed, stream)`` pair gives its own independent sequence.
+    """
+    return random.Random(f"{seed}:{stream}").randbytes
+
+
+class CharSampler:
+    """Draw uniformly random characters from a fixed alphabet."""
+
+    def __init__(self, alphabet: str, source: ByteSource | None = None):
+        if not alphabet:
+            raise ValueError("alphabet must not be empty.")
+        if len(set(alphabet)) != len(alphabet):
+            raise ValueError("alphabet must not contain duplicate characters.")
+        if len(alphabet) > 256:
+            raise ValueError("alphabet must have at most 256 characters.")
+        self.alphabet = alphabet
+        size = len(alphabet)
+        # Bytes at or above ``limit`` would make the first characters more
+        # likely than the others, so they are rejected.
+        self._limit = 256 - 256 % size
+        self._ascii = alphabet.isascii()
+        if self._ascii:
+            mapped = [ord(alphabet[b % size]) for b in range(self._limit)]
+        else:
+            mapped = [b % size for b in range(self._limit)]
+        self._table = bytes(mapped + [0] * (256 - self._limit))
+        self._chars = dict(enumerate(alphabet))
+        self._reject = bytes(range(self._limit, 256))
+        self._source = source
+        self._buffer = b""
+        self._pos = 0
+        self._pid = os.getpid()
+
+    def sample(self, k: int) -> str:
+        """Return ``k`` random characters."""
+        data = self.sample_bytes(k)
+        if self._ascii:
+            return data.decode("ascii")
+        # Indexes to characters, still in one C-level pass.
+        return data.decode("latin-1").translate(self._chars)
+
+    def sample_bytes(self, k: int) -> bytes:
+        """Return ``k`` accepted bytes: characters, or indexes for non-ASCII."""
+        if k < 0:
+            raise ValueError("k must not be negative.")
+        if self._pid != os.getpid():
+            # Never hand the same buffered bytes to a forked child and its parent.
+            self._buffer, self._pos, self._pid = b"", 0, os.getpid()
+        if len(self._buffer) - self._pos < k:
+            parts = [self._buffer[self._pos :]]
+            have = len(parts[0])
+            while have < k:
+                # Ask for enough bytes that one refill usually covers the request.
+                wanted = max(REFILL_SIZE, (k - have) * 256 // self._limit + 64)
+                data = (self._source or os.urandom)(wanted)
+                parts.append(data.translate(self._table, self._reject))
+                have += len(parts[-1])
+            self._buffer, self._pos = b"".join(parts), 0
+        data = self._buffer[self._pos : self._pos + k]
+        self._pos += k
+        return data
+
+
+class RandomBytes:
+    """Buffered ``os.urandom`` reader for random indexes and shuffles."""
+
+    def __init__(self, refill_size: int = 4096, source: ByteSource | None = None):
+        self.refill_size = refill_size
+        self._source = source
+        self._buffer = b""
+        self._pos = 0
+        self._pid = os.getpid()
+
+    def read(self, k: int) -> bytes:
+        if self._pid != os.getpid():
+            self._buffer, self._pos, self._pid = b"", 0, os.getpid()
+        if len(self._buffer) - self._pos < k:
+            rest = self._buffer[self._pos :]
+            data = (self._source or os.urandom)(max(self.refill_size, k - len(rest)))
+            self._buffer = rest + data
+            self._pos = 0
+        data = self._buffer[self._pos : self._pos + k]
+        self._pos += k
+        return data
+
+    def randbelow(self, n: int) -> int:
+        """Return a uniformly random int in ``[0, n)``; ``n`` may be any size."""
+        if n < 1:
+            raise ValueError("n must be positive.")
+        size = (n.bit_length() + 7) // 8
+        span = 1 << (8 * size)
+        limit = span - span % n
+        while True:
+            value = int.from_bytes(self.read(size), "big")
+            if value < limit:
+                return value % n
+
+    def shuffle(self, items: list) -> None:
+        """Shuffle ``items`` in place (Fisher-Yates).
+
+        All swap positions come from one number below ``len(items)!``, read
+        digit by digit in the factorial number system, instead of one random
+        draw per position.
+        """
+        code = self.randbelow(math.factorial(len(items)))
+        for i in range(len(items) - 1, 0, -1):
+            code, j = divmod(code, i + 1)
+            items[i], items[j] = items[j], items[i]
@@ -0,0 +1,257 @@
+"""Pronounceable passwords from a character n-gram Markov model.
+
+A model is trained once from a wordlist: for every context of ``order - 1``
+characters (words are padded with ``^`` at the start) it stores the
+characters seen next with their cumulative counts. Every letter gets
+``smoothing`` extra counts in every context, so rare contexts cannot lock the
+chain into a loop (without it, ``xx`` is always followed by ``x`` in a small
+corpus and the likeliest password is ``xxxxxxxxxxxx``). Models are saved in
+a compact binary file and loaded as one cumulative ``array`` per context, so
+each character costs one CSPRNG draw below the context's total plus a
+``bisect``. A context never seen in training backs off to its shorter
+suffixes, down to the single-character frequencies.
+
+The entropy of a model is computed exactly for a given password length by
+propagating the probability of each context through the chain:
+``entropy_bits`` is the Shannon entropy of the generated passwords and
+``min_entropy_bits`` is ``-log2`` of the most likely one, the number that
+matters against an attacker who guesses the likeliest passwords first.
+``collision_entropy_bits`` is ``-log2`` of the probability that two
+passwords are equal, which is what predicts repeats in bulk output. All
+three are far below ``length * log2(26)``: the passwords are not uniform, so
+``combinations`` is not a keyspace to estimate collisions from.
+"""
+
+import os
+import sys
+import math
+import struct
+from array import array
+from bisect import bisect_right
+from collections import Counter, defaultdict
+from typing import Iterable, Iterator
+
+from password_generator.engine import ByteSource, RandomBytes
+
+BUNDLED_MODEL = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "models", "english.bin"
+)
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+PAD = "^"
+MAGIC = b"PWMK"
+# Magic, order, number of contexts.
+HEADER = struct.Struct("<4sBI")
+# Context length (then the context), number of next characters. The
+# characters and their cumulative counts follow, as little-endian uint32.
+CONTEXT = struct.Struct("<BB")
+
+
+class MarkovModel:
+    def __init__(self, order: int, tables: dict[str, tuple[str, array]]):
+        if not 1 <= order <= 8:
+            raise ValueError("order must be between 1 and 8.")
+        if "" not in tables:
+            raise ValueError("the model has no single-character table.")
+        self.order = order
+        # Context -> (next characters, cumulative counts).
+        self.tables = tables
+
+    @classmethod
+    def train(
+        cls, words: Iterable[str], order: int = 3, smoothing: int = 1
+    ) -> "MarkovModel":
+        """Count transitions in lowercase ``a``-``z`` words (others are skipped)."""
+        if not 1 <= order <= 8:
+            raise ValueError("order must be between 1 and 8.")
+        if smoothing < 0:
+            raise ValueError("smoothing must not be negative.")
+        counts: dict[str, Counter] = defaultdict(Counter)
+        for word in words:
+            word = word.strip().lower()
+            if not word or not set(word) <= set(ALPHABET):
+                continue
+            padded = PAD * (order - 1) + word
+            for i in range(order - 1, len(padded)):
+                # Every suffix of the context, for back-off.
+                for size in range(order):
+                    counts[padded[i - size : i]][padded[i]] += 1
+        if not counts:
+            raise ValueError("no usable words to train on.")
+        tables = {}
+        for context, nexts in counts.items():
+            chars = ALPHABET if smoothing else "".join(sorted(nexts))
+            weights = (nexts[c] + smoothing for c in chars)
+            tables[context] = (chars, _cumulative(weights))
+        return cls(order, tables)
+
+    @classmethod
+    def load(cls, path: str | None = None) -> "MarkovModel":
+        """Load a model written by ``save`` (default: the bundled model)."""
+        with open(path or BUNDLED_MODEL, "rb") as f:
+            data = f.read()
+        try:
+            magic, order, contexts = HEADER.unpack_from(data)
+            if magic != MAGIC:
+                raise ValueError
+            tables = {}
+            pos = HEADER.size
+            for _ in range(contexts):
+                size, count = CONTEXT.unpack_from(data, pos)
+                pos += CONTEXT.size
+                if pos + size + 5 * count > len(data):
+                    raise ValueError
+                context = data[pos : pos + size].decode("ascii")
+                chars = data[pos + size : pos + size + count].decode("ascii")
+                pos += size + count
+                cumulative = _unpack_counts(data[pos : pos + 4 * count])
+                pos += 4 * count
+                tables[context] = (chars, cumulative)
+            if pos != len(data):
+                raise ValueError
+        except (ValueError, struct.error):
+            raise ValueError(
+                f"{path or BUNDLED_MODEL} is truncated or is not a Markov model file."
+            ) from None
+        return cls(order, tables)
+
+    def save(self, path: str) -> None:
+        parts = [HEADER.pack(MAGIC, self.order, len(self.tables))]
+        for context, (chars, cumulative) in sorted(self.tables.items()):
+            parts.append(CONTEXT.pack(len(context), len(chars)))
+            parts.append(context.encode("ascii") + chars.encode("ascii"))
+            parts.append(_pack_counts(cumulative))
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(b"".join(parts))
+        os.replace(tmp, path)
+
+    def table(self, context: str) -> tuple[str, array]:
+        """Return the table for ``context``, backing off to shorter suffixes."""
+        while context not in self.tables:
+            context = context[1:]
+        return self.tables[context]
+
+    def distribution(self, context: str) -> list[tuple[str, float]]:
+        chars, cumulative = self.table(context)
+        total = cumulative[-1]
+        previous = 0
+        result = []
+        for char, upto in zip(chars, cumulative):
+            result.append((char, (upto - previous) / total))
+            previous = upto
+        return result
+
+    def entropy(self, length: int) -> tuple[float, float, float, int]:
+        """Return Shannon, min- and collision entropy (bits) and the number of passwords."""
+        start = PAD * (self.order - 1)
+        # Context -> (probability, sum of squared path probabilities,
+        # best single-path log2 probability, paths).
+        states = {start: (1.0, 1.0, 0.0, 1)}
+        shannon = 0.0
+        for _ in range(length):
+            following: dict[str, tuple[float, float, float, int]] = {}
+            for context, (prob, squares, best, paths) in states.items():
+                dist = self.distribution(context)
+                shannon -= prob * sum(p * math.log2(p) for _, p in dist)
+                for char, p in dist:
+                    key = (context + char)[len(context) + 1 - len(start) :]
+                    old = following.get(key, (0.0, 0.0, -math.inf, 0))
+                    following[key] = (
+                        old[0] + prob * p,
+                        old[1] + squares * p * p,
+                        max(old[2], best + math.log2(p)),
+                        old[3] + paths,
+                    )
+            states = following
+        collision = -math.log2(sum(squares for _, squares, _, _ in states.values()))
+        min_entropy = -max(best for _, _, best, _ in states.values())
+        paths = sum(paths for _, _, _, paths in states.values())
+        return shannon, min_entropy, collision, paths
+
+
+class PronounceableGenerator:
+    """Pronounceable lowercase passwords sampled from a ``MarkovModel``."""
+
+    def __init__(
+        self,
+        model: MarkovModel,
+        length: int = 12,
+        source: ByteSource | None = None,
+    ):
+        if length < 1:
+            raise ValueError("length must be at least 1.")
+        self.model = model
+        self.length = length
+        self._random = RandomBytes(source=source)
+        self._entropy: tuple[float, float, float, int] | None = None
+
+    @classmethod
+    def from_file(
+        cls, path: str | None = None, **options: object
+    ) -> "PronounceableGenerator":
+        return cls(MarkovModel.load(path), **options)
+
+    @property
+    def entropy_bits(self) -> float:
+        return self._stats()[0]
+
+    @property
+    def min_entropy_bits(self) -> float:
+        return self._stats()[1]
+
+    @property
+    def collision_entropy_bits(self) -> float:
+        """``-log2`` of the probability that two passwords are equal."""
+        return self._stats()[2]
+
+    @property
+    def combinations(self) -> int:
+        """Number of distinct passwords the model can produce, not all equally likely."""
+        return self._stats()[3]
+
+    def generate(self) -> str:
+        model, randbelow = self.model, self._random.randbelow
+        keep = model.order - 1
+        context = PAD * keep
+        password = []
+        for _ in range(self.length):
+            chars, cumulative = model.table(context)
+            char = chars[bisect_right(cumulative, randbelow(cumulative[-1]))]
+            password.append(char)
+            context = (context + char)[len(context) + 1 - keep :]
+        return "".join(password)
+
+    def generate_many(self, count: int | None = None) -> Iterator[str]:
+        """Yield ``count`` passwords, or an endless stream when ``count`` is None."""
+        while count is None or count > 0:
+            yield self.generate()
+            if count is not None:
+                count -= 1
+
+    def _stats(self) -> tuple[float, float, float, int]:
+        if self._entropy is None:
+            self._entropy = self.model.entropy(self.length)
+        return self._entropy
+
+
+def _cumulative(counts: Iterable[int]) -> array:
+    cumulative = array("I")
+    total = 0
+    for count in counts:
+        total += count
+        cumulative.append(total)
+    return cumulative
+
+
+def _pack_counts(cumulative: Iterable[int]) -> bytes:
+    counts = array("I", cumulative)
+    if sys.byteorder != "little":
+        counts.byteswap()
+    return counts.tobytes()
+
+
+def _unpack_counts(data: bytes) -> array:
+    counts = array("I", data)
+    if sys.byteorder != "little":
+        counts.byteswap()
+    return counts
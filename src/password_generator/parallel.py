@@ -0,0 +1,144 @@
+"""Generate passwords on several processes.
+
+The requested count is split into fixed-size chunks, generated on a process
+pool. Chunks are either merged back in order into one stream, with only a
+few chunks in flight at a time, or written by each worker to its own shard
+file. The generator is described by a picklable ``factory`` that accepts a
+``source`` keyword, so each worker builds its own.
+
+With a ``seed``, chunk ``i`` draws its randomness from ``seeded_source(seed,
+i)``: the output then depends only on the seed and the count, not on the
+number of workers, and concatenating the shards in order gives the same text
+as the merged stream. Without a seed every chunk uses ``os.urandom``.
+
+``map_ordered`` is the ordered, bounded process-pool ``map`` underneath the
+merged stream, also used for other work such as hashing.
+"""
+
+import os
+import itertools
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Iterable, Iterator, TypeVar
+
+from password_generator.engine import ByteSource, seeded_source
+
+T = TypeVar("T")
+
+# Passwords per chunk of work.
+CHUNK_SIZE = 65536
+
+
+# Builds a generator (anything with ``generate_many``) from a ``source`` keyword.
+Factory = Callable[..., Any]
+
+
+def chunk_sizes(count: int, chunk_size: int = CHUNK_SIZE) -> list[int]:
+    if count < 0:
+        raise ValueError("count must not be negative.")
+    return [min(chunk_size, count - start) for start in range(0, count, chunk_size)]
+
+
+def generate_chunk(factory: Factory, count: int, seed: int | None, index: int) -> str:
+    """Return chunk ``index`` as newline-terminated text."""
+    source: ByteSource | None = None
+    if seed is not None:
+        source = seeded_source(seed, index)
+    passwords = list(factory(source=source).generate_many(count))
+    return "\n".join(passwords) + "\n" if passwords else ""
+
+
+def generate_ordered(
+    factory: Factory,
+    count: int | None,
+    workers: int = 1,
+    seed: int | None = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[str]:
+    """Yield the text of every chunk in order, generated on ``workers`` processes.
+
+    With ``count`` None, chunks are produced until the caller stops iterating.
+    """
+    if count is None:
+        sizes: Iterable[int] = itertools.repeat(chunk_size)
+    else:
+        sizes = chunk_sizes(count, chunk_size)
+    yield from map_ordered(
+        partial(generate_chunk, factory),
+        sizes,
+        itertools.repeat(seed),
+        itertools.count(),
+        workers=workers,
+    )
+
+
+def map_ordered(
+    function: Callable[..., T], *iterables: Iterable[Any], workers: int = 1
+) -> Iterator[T]:
+    """Like ``map``, but run on ``workers`` processes; results keep their order.
+
+    At most two calls per worker are in flight, so the inputs may be endless
+    and memory use does not depend on their length.
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1.")
+    if workers == 1:
+        yield from map(function, *iterables)
+        return
+
+    with ProcessPoolExecutor(workers) as pool:
+        pending: deque[Future] = deque()
+        for args in zip(*iterables):
+            pending.append(pool.submit(function, *args))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def write_shard(
+    factory: Factory, path: str, chunks: list[tuple[int, int]], seed: int | None
+) -> int:
+    """Write the given ``(index, size)`` chunks to ``path``; return the count."""
+    with open(path, "w", encoding="utf-8") as f:
+        for index, size in chunks:
+            f.write(generate_chunk(factory, size, seed, index))
+    return sum(size for _, size in chunks)
+
+
+def write_shards(
+    factory: Factory,
+    count: int,
+    directory: str,
+    workers: int = 1,
+    seed: int | None = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> list[str]:
+    """Write ``count`` passwords as one shard file per worker; return the paths.
+
+    Worker ``i`` writes ``shard-<i>.txt`` holding a contiguous run of chunks;
+    there are never more shards than chunks.
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1.")
+    os.makedirs(directory, exist_ok=True)
+    chunks = list(enumerate(chunk_sizes(count, chunk_size)))
+    workers = min(workers, len(chunks)) or 1
+    shards = [
+        chunks[i * len(chunks) // workers : (i + 1) * len(chunks) // workers]
+        for i in range(workers)
+    ]
+    paths = [os.path.join(directory, f"shard-{i:04d}.txt") for i in range(len(shards))]
+    if len(shards) <= 1:
+        for path, shard in zip(paths, shards):
+            write_shard(factory, path, shard, seed)
+        return paths
+    with ProcessPoolExecutor(len(shards)) as pool:
+        futures = [
+            pool.submit(write_shard, factory, path, shard, seed)
+            for path, shard in zip(paths, shards)
+        ]
+        for future in futures:
+            future.result()
+    return paths
@@ -1,8 +1,39 @@
 """Password Generator - Generate strong passwords."""
 
 import argparse
-import random
+import itertools
+import os
 import string
+import sys
+from functools import partial
+from typing import Callable, Iterable, Iterator, TextIO, TypeVar
+
+from password_generator.breach import BreachIndex
+from password_generator.breach import build as build_breach_file
+from password_generator.engine import ByteSource, CharSampler, seeded_source
+from password_generator.markov import MarkovModel, PronounceableGenerator
+from password_generator.policy import AMBIGUOUS, CLASSES, SPECIALS, Policy
+from password_generator.provision import (
+    ALGORITHMS,
+    FORMATS,
+    provision,
+    read_users,
+    write_records,
+)
+from password_generator.unique import (
+    collision_probability,
+    expected_duplicates,
+    unique,
+)
+from password_generator.wordlist import PassphraseGenerator
+
+# password_generator.parallel and password_generator.server are imported where
+# they are used: their process pool and asyncio imports would slow every run.
+
+T = TypeVar("T")
+
+# Passwords drawn per batch of randomness in generate_many().
+BLOCK_SIZE = 4096
 
 
 class PasswordGenerator:
@@ -11,36 +42,625 @@ class PasswordGenerator:
         length: int = 12,
         use_digits: bool = True,
         use_specials: bool = True,
+        *,
+        minimums: dict[str, int] | None = None,
+        exclude: str = "",
+        charsets: dict[str, str] | None = None,
+        max_repeat: int | None = None,
+        source: ByteSource | None = None,
     ):
         self.length = length
         self.use_digits = use_digits
         self.use_specials = use_specials
+        self.minimums = dict(minimums or {})
+        self.exclude = exclude
+        self.charsets = dict(charsets or {})
+        self.max_repeat = max_repeat
+        self.source = source
+        self._sampler: CharSampler | None = None
+        self._policy: tuple[tuple, Policy] | None = None
 
-    def generate(self) -> str:
+    @property
+    def alphabet(self) -> str:
+        if self.constrained:
+            return self.policy().alphabet
         chars = string.ascii_letters
         if self.use_digits:
             chars += string.digits
         if self.use_specials:
-            chars += "!@#$%^&*()-_=+[]{};:,.<>?/"
+            chars += SPECIALS
+        return "".join(c for c in chars if c not in self.exclude)
+
+    @property
+    def constrained(self) -> bool:
+        """Whether passwords must be built by a ``Policy``."""
+        return bool(self.minimums or self.charsets or self.max_repeat is not None)
+
+    @property
+    def combinations(self) -> int:
+        """Number of distinct passwords the current settings allow."""
+        return self.policy().combinations
+
+    @property
+    def entropy_bits(self) -> float:
+        return self.policy().entropy_bits
+
+    def generate(self) -> str:
+        if self.constrained:
+            return self.policy().generate()
+        return self.sampler().sample(self.length)
+
+    def policy(self) -> Policy:
+        """Return the compiled policy for the current settings."""
+        classes = dict(CLASSES)
+        if not self.use_digits:
+            del classes["digits"]
+        if not self.use_specials:
+            del classes["specials"]
+        classes.update(self.charsets)
+        key = (
+            self.length,
+            tuple(classes.items()),
+            tuple(self.minimums.items()),
+            self.exclude,
+            self.max_repeat,
+            self.source,
+        )
+        if self._policy is None or self._policy[0] != key:
+            policy = Policy(
+                self.length,
+                classes,
+                self.minimums,
+                self.exclude,
+                self.max_repeat,
+                self.source,
+            )
+            self._policy = (key, policy)
+        return self._policy[1]
+
+    def copy(self) -> "PasswordGenerator":
+        """Return a generator with the same settings and its own random state.
+
+        A policy that is already compiled is shared with the copy instead of
+        being compiled again. Generators are not thread-safe, so give each
+        thread its own copy.
+        """
+        clone = PasswordGenerator(
+            self.length,
+            self.use_digits,
+            self.use_specials,
+            minimums=self.minimums,
+            exclude=self.exclude,
+            charsets=self.charsets,
+            max_repeat=self.max_repeat,
+            source=self.source,
+        )
+        if self._policy is not None:
+            clone._policy = (self._policy[0], self._policy[1].copy())
+        return clone
+
+    def sampler(self) -> CharSampler:
+        """Return the sampler for the current alphabet, reusing it while unchanged."""
+        alphabet = self.alphabet
+        if self._sampler is None or self._sampler.alphabet != alphabet:
+            self._sampler = CharSampler(alphabet, self.source)
+        return self._sampler
 
-        return "".join(random.choice(chars) for _ in range(self.length))
+    def generate_many(self, count: int | None = None) -> Iterator[str]:
+        """Yield ``count`` passwords, or an endless stream when ``count`` is None.
 
+        The alphabet is built once and characters are drawn for a whole block
+        of passwords at a time, so memory use does not grow with ``count``.
+        The sampler is captured when iteration starts; later changes to the
+        generator's settings do not affect a running stream.
+        """
+        if count is not None and count < 0:
+            raise ValueError("count must not be negative.")
+        if self.constrained:
+            yield from self.policy().generate_many(count)
+            return
+        sampler, length = self.sampler(), self.length
+        remaining = count
+        while remaining is None or remaining > 0:
+            block = BLOCK_SIZE if remaining is None else min(remaining, BLOCK_SIZE)
+            if length > 0:
+                chars = sampler.sample(block * length)
+                for start in range(0, block * length, length):
+                    yield chars[start : start + length]
+            else:
+                yield from [""] * block
+            if remaining is not None:
+                remaining -= block
 
-def main() -> None:
+    def __iter__(self) -> Iterator[str]:
+        return self.generate_many()
+
+
+AnyGenerator = PasswordGenerator | PassphraseGenerator | PronounceableGenerator
+
+
+def write_passwords(
+    passwords: Iterable[str], out: TextIO, batch_size: int = BLOCK_SIZE
+) -> int:
+    """Write passwords one per line in large chunks; return how many were written."""
+    written = 0
+    batch: list[str] = []
+    for password in passwords:
+        batch.append(password)
+        if len(batch) >= batch_size:
+            out.write("\n".join(batch) + "\n")
+            written += len(batch)
+            batch.clear()
+    if batch:
+        out.write("\n".join(batch) + "\n")
+        written += len(batch)
+    return written
+
+
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Generate a random password.")
     parser.add_argument("-l", "--length", type=int, default=12, help="Password length")
     parser.add_argument("--no-digits", action="store_true", help="Exclude digits")
     parser.add_argument(
         "--no-specials", action="store_true", help="Exclude special characters"
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--min",
+        action="append",
+        default=[],
+        metavar="CLASS=N",
+        help="Require at least N characters of a class: lower, upper, digits, "
+        "specials or a --charset name (repeatable)",
+    )
+    parser.add_argument(
+        "--charset",
+        action="append",
+        default=[],
+        metavar="NAME=CHARS",
+        help="Add a character class, or replace a built-in one (repeatable)",
+    )
+    parser.add_argument(
+        "--exclude", default="", metavar="CHARS", help="Never use these characters"
+    )
+    parser.add_argument(
+        "--no-ambiguous",
+        action="store_true",
+        help=f"Exclude easily confused characters ({AMBIGUOUS})",
+    )
+    parser.add_argument(
+        "--max-repeat",
+        type=int,
+        metavar="N",
+        help="Allow a character at most N times in a row",
+    )
+    parser.add_argument(
+        "--entropy",
+        action="store_true",
+        help="Print the entropy of the password policy to standard error",
+    )
+    parser.add_argument(
+        "--words",
+        type=int,
+        metavar="N",
+        help="Generate a passphrase of N random words instead of a password",
+    )
+    parser.add_argument(
+        "--wordlist",
+        metavar="FILE",
+        help="Word list for --words, one word per line (default: bundled EFF list)",
+    )
+    parser.add_argument(
+        "--separator", default=" ", help="Separator between passphrase words"
+    )
+    parser.add_argument(
+        "--capitalize", action="store_true", help="Capitalize passphrase words"
+    )
+    parser.add_argument(
+        "--pronounceable",
+        action="store_true",
+        help="Generate lowercase pronounceable passwords from a Markov model",
+    )
+    parser.add_argument(
+        "--model",
+        metavar="FILE",
+        help="Model for --pronounceable, written by 'train-model' (default: bundled)",
+    )
+    parser.add_argument(
+        "-n",
+        "--count",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Number of passwords to generate, one per line (default: 1)",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        metavar="FILE",
+        help="Write passwords to FILE instead of standard output",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Generate on N processes; output keeps a fixed order (default: 1)",
+    )
+    parser.add_argument(
+        "--shards",
+        metavar="DIR",
+        help="Let each worker write its own file DIR/shard-NNNN.txt",
+    )
+    parser.add_argument(
+        "--unique",
+        action="store_true",
+        help="Never repeat a password within one run",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help="Reproducible output for testing only; never use for real passwords",
+    )
+    parser.add_argument(
+        "--reject-breached",
+        metavar="HASHFILE",
+        help="Skip passwords found in a breach hash file built with 'check --build'",
+    )
+
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    check = commands.add_parser(
+        "check",
+        help="Check passwords against a breach hash file",
+        description="Print the given passwords (or lines of standard input) that "
+        "appear in a breach hash file; exit with status 1 if there are any.",
+    )
+    check.add_argument("hashfile", help="Binary hash file written by --build")
+    check.add_argument("passwords", nargs="*", help="Passwords to check")
+    check.add_argument(
+        "--build",
+        metavar="DUMP",
+        help="Build HASHFILE from a text dump of SHA-1 hashes (HASH[:count] lines)",
+    )
+    train = commands.add_parser(
+        "train-model",
+        help="Train a Markov model for --pronounceable",
+        description="Train a character Markov model from a wordlist (one word per "
+        "line, last field of each line) and save it for --model.",
+    )
+    train.add_argument("wordlist", help="Word list to train on")
+    train.add_argument("model", help="Model file to write")
+    train.add_argument(
+        "--order",
+        type=int,
+        default=3,
+        metavar="N",
+        help="Characters per n-gram, including the one predicted (default: 3)",
+    )
+    serve = commands.add_parser(
+        "serve",
+        help="Vend passwords over a Unix domain socket",
+        description="Keep pools of ready passwords and answer 'GET [key=value ...]' "
+        "lines on a Unix domain socket. The general options set the default policy.",
+    )
+    serve.add_argument("socket", help="Path of the socket to create")
+    serve.add_argument(
+        "--pool-size",
+        type=int,
+        metavar="N",
+        help="Passwords kept ready per policy (default: 10000)",
+    )
+    prov = commands.add_parser(
+        "provision",
+        help="Generate a password and its stored hash for every user",
+        description="Read usernames (one per line) and write 'user,password,hash' "
+        "records in input order. Hashing runs on --workers processes; the general "
+        "options choose the passwords.",
+    )
+    prov.add_argument("users", help="File of usernames, or - for standard input")
+    prov.add_argument(
+        "--format", choices=FORMATS, default="csv", help="Output format (default: csv)"
+    )
+    prov.add_argument(
+        "--hash",
+        choices=ALGORITHMS,
+        default="scrypt",
+        help="Password hash (default: scrypt)",
+    )
+    prov.add_argument(
+        "--hash-cost",
+        type=int,
+        metavar="N",
+        help="scrypt N (a power of two, default 16384) or PBKDF2 iterations "
+        "(default 600000)",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command is not None:
+        commands = {
+            "check": run_check,
+            "train-model": run_train_model,
+            "serve": run_serve,
+            "provision": run_provision,
+        }
+        commands[args.command](parser, args)
+        return
+    check_arguments(parser, args)
+    factory = make_factory(parser, args)
+    generator = make_generator(parser, factory)
+    if args.entropy:
+        print(f"Entropy: {generator.entropy_bits:.1f} bits", file=sys.stderr)
+        if isinstance(generator, PronounceableGenerator):
+            print(
+                f"Min-entropy: {generator.min_entropy_bits:.1f} bits",
+                file=sys.stderr,
+            )
+    if args.unique:
+        report_collisions(parser, args.count, generator)
+
+    if args.shards:
+        from password_generator.parallel import write_shards
+
+        write_shards(factory, args.count, args.shards, args.workers, args.seed)
+    elif args.unique or args.reject_breached:
+        passwords = filtered_stream(parser, factory, generator, args)
+        write_output(args.output, lambda out: write_passwords(passwords, out))
+    elif args.workers > 1 or args.seed is not None:
+        from password_generator.parallel import generate_ordered
+
+        chunks = generate_ordered(factory, args.count, args.workers, args.seed)
+        write_output(args.output, lambda out: out.writelines(chunks))
+    else:
+        passwords = generator.generate_many(args.count)
+        write_output(args.output, lambda out: write_passwords(passwords, out))
+
+
+def generate_stream(
+    factory: Callable[..., AnyGenerator],
+    generator: AnyGenerator,
+    args: argparse.Namespace,
+) -> Iterator[str]:
+    """Yield passwords without end, in process or from the worker pool."""
+    if args.workers == 1 and args.seed is None:
+        return generator.generate_many()
+    from password_generator.parallel import generate_ordered
+
+    chunks = generate_ordered(factory, None, args.workers, args.seed)
+    return (password for chunk in chunks for password in chunk.splitlines())
+
+
+def filtered_stream(
+    parser: argparse.ArgumentParser,
+    factory: Callable[..., AnyGenerator],
+    generator: AnyGenerator,
+    args: argparse.Namespace,
+) -> Iterator[str]:
+    """Yield ``args.count`` passwords, skipping repeats and breached ones."""
+    passwords = generate_stream(factory, generator, args)
+    if args.reject_breached:
+        index = open_breach_index(parser, args.reject_breached)
+        passwords = (password for password in passwords if password not in index)
+    if args.unique:
+        return unique(passwords, args.count)
+    return itertools.islice(passwords, args.count)
 
-    generator = PasswordGenerator(
+
+def run_check(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    if args.build:
+        try:
+            with open(args.build, "rb") as dump:
+                count = build_breach_file(dump, args.hashfile)
+        except OSError as e:
+            sys.exit(f"Error: {e}")
+        except ValueError as e:
+            sys.exit(f"Error: {args.build}: {e}")
+        print(f"Wrote {count} hashes to {args.hashfile}", file=sys.stderr)
+        return
+
+    index = open_breach_index(parser, args.hashfile)
+    passwords = args.passwords or (line.rstrip("\r\n") for line in sys.stdin)
+    results = index.check_many(passwords)
+    breached = (password for password, is_breached in results if is_breached)
+    if write_output(None, lambda out: write_passwords(breached, out)):
+        sys.exit(1)
+
+
+def run_train_model(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    try:
+        with open(args.wordlist, encoding="utf-8") as f:
+            words = [line.split()[-1] for line in f if line.strip()]
+        model = MarkovModel.train(words, args.order)
+        model.save(args.model)
+    except OSError as e:
+        sys.exit(f"Error: {e}")
+    except ValueError as e:
+        sys.exit(f"Error: {args.wordlist}: {e}")
+    print(
+        f"Wrote {len(model.tables)} contexts to {args.model}",
+        file=sys.stderr,
+    )
+
+
+def run_serve(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    import asyncio
+
+    from password_generator.server import POOL_SIZE, PasswordServer
+
+    if args.words is not None or args.pronounceable:
+        parser.error("serve does not support --words or --pronounceable")
+    if args.pool_size is None:
+        args.pool_size = POOL_SIZE
+    if args.pool_size < 1:
+        parser.error("--pool-size must be at least 1")
+    factory = make_factory(parser, args)
+    make_generator(parser, factory)
+    server = PasswordServer(factory, args.pool_size)
+    try:
+        asyncio.run(server.serve(args.socket))
+    except (OSError, ValueError) as e:
+        server.close()
+        sys.exit(f"Error: {e}")
+
+
+def run_provision(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    check_arguments(parser, args)
+    if args.shards or args.unique or args.reject_breached:
+        parser.error(
+            "provision does not support --shards, --unique or --reject-breached"
+        )
+    factory = make_factory(parser, args)
+    salt_source = None
+    if args.seed is not None:
+        factory = partial(factory, source=seeded_source(args.seed))
+        salt_source = seeded_source(args.seed, 1)
+    generator = make_generator(parser, factory)
+    try:
+        users = sys.stdin if args.users == "-" else open(args.users, encoding="utf-8")
+    except OSError as e:
+        parser.error(f"cannot read {args.users}: {e.strerror or e}")
+    try:
+        records = provision(
+            read_users(users),
+            generator.generate_many(),
+            args.hash,
+            args.hash_cost,
+            args.workers,
+            salt_source,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    try:
+        write_output(args.output, lambda out: write_records(records, out, args.format))
+    finally:
+        if users is not sys.stdin:
+            users.close()
+
+
+def open_breach_index(parser: argparse.ArgumentParser, path: str) -> BreachIndex:
+    try:
+        return BreachIndex(path)
+    except OSError as e:
+        parser.error(f"cannot read {path}: {e.strerror or e}")
+    except ValueError as e:
+        parser.error(str(e))
+
+
+def report_collisions(
+    parser: argparse.ArgumentParser, count: int, generator: AnyGenerator
+) -> None:
+    combinations = generator.combinations
+    if count > combinations:
+        parser.error(
+            f"--unique: only {combinations} distinct passwords exist for these settings"
+        )
+    # Markov passwords are far from uniform, so repeats follow the collision
+    # entropy rather than the number of passwords.
+    collision = None
+    if isinstance(generator, PronounceableGenerator):
+        collision = 2.0**-generator.collision_entropy_bits
+    print(
+        f"Collision probability without --unique: "
+        f"{collision_probability(count, combinations, collision):.3g} "
+        f"(expected duplicates: "
+        f"{expected_duplicates(count, combinations, collision):.3g})",
+        file=sys.stderr,
+    )
+
+
+def check_arguments(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    if args.count < 1:
+        parser.error("--count must be at least 1")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.shards and args.output:
+        parser.error("--shards and --output cannot be combined")
+    if args.shards and args.unique:
+        parser.error("--unique cannot be combined with --shards")
+    if args.shards and args.reject_breached:
+        parser.error("--reject-breached cannot be combined with --shards")
+    if args.pronounceable and args.words is not None:
+        parser.error("--pronounceable and --words cannot be combined")
+
+
+def write_output(path: str | None, write: Callable[[TextIO], T]) -> T | None:
+    """Call ``write`` with the output file, or with standard output."""
+    if path:
+        with open(path, "w", encoding="utf-8") as f:
+            return write(f)
+    try:
+        result = write(sys.stdout)
+        sys.stdout.flush()
+        return result
+    except BrokenPipeError:
+        # The reader went away (e.g. piped into ``head``); stop quietly.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return None
+
+
+def make_factory(
+    parser: argparse.ArgumentParser, args: argparse.Namespace
+) -> Callable[..., AnyGenerator]:
+    """Return a picklable callable that builds the generator from a ``source``."""
+    if args.words is not None:
+        return partial(
+            PassphraseGenerator.from_file,
+            args.wordlist,
+            words=args.words,
+            separator=args.separator,
+            capitalize=args.capitalize,
+        )
+    if args.pronounceable:
+        return partial(PronounceableGenerator.from_file, args.model, length=args.length)
+    try:
+        minimums = {}
+        for name, value in parse_assignments(args.min, "--min"):
+            if not value.isdigit():
+                raise ValueError(f"--min expects CLASS=N, got {name}={value}.")
+            minimums[name] = int(value)
+        charsets = dict(parse_assignments(args.charset, "--charset"))
+    except ValueError as e:
+        parser.error(str(e))
+    return partial(
+        PasswordGenerator,
         length=args.length,
         use_digits=not args.no_digits,
         use_specials=not args.no_specials,
+        minimums=minimums,
+        exclude=args.exclude + (AMBIGUOUS if args.no_ambiguous else ""),
+        charsets=charsets,
+        max_repeat=args.max_repeat,
     )
-    print(generator.generate())
+
+
+def make_generator(
+    parser: argparse.ArgumentParser,
+    factory: Callable[..., AnyGenerator],
+) -> AnyGenerator:
+    """Build a generator from ``factory``, reporting invalid settings as usage errors."""
+    try:
+        generator = factory()
+        if isinstance(generator, PasswordGenerator):
+            # Compile the policy now so that invalid settings are reported here.
+            generator.policy()
+    except OSError as e:
+        parser.error(f"cannot read {e.filename or 'wordlist'}: {e.strerror or e}")
+    except ValueError as e:
+        parser.error(str(e))
+    return generator
+
+
+def parse_assignments(values: list[str], option: str) -> list[tuple[str, str]]:
+    """Split ``NAME=VALUE`` option values."""
+    pairs = []
+    for value in values:
+        name, sep, rest = value.partition("=")
+        if not sep or not name:
+            raise ValueError(f"{option} expects NAME=VALUE, got {value!r}.")
+        pairs.append((name, rest))
+    return pairs
 
 
 if __name__ == "__main__":
@@ -0,0 +1,285 @@
+"""Password policies: per-class minimums, exclusions and repeat limits.
+
+A ``Policy`` is compiled once and then builds passwords constructively, so
+strict policies cost no more than loose ones. The number of characters taken
+from each class is drawn first, with probabilities proportional to how many
+passwords have that composition; then each class's characters are sampled
+and the result is shuffled. Every password allowed by the minimums is
+therefore equally likely, and ``entropy_bits`` is exactly ``log2`` of their
+number.
+
+Classes must not share characters. With ``max_repeat``, passwords are
+built run by run instead: ``_Runs`` counts the passwords made of runs of at
+most ``max_repeat`` equal characters that still meet the minimums, and draws
+each run's class, character and length in proportion to how many passwords
+can follow it. These passwords are equally likely as well, and
+``entropy_bits`` stays exact.
+"""
+
+import copy
+import math
+import string
+from bisect import bisect_right
+from typing import Callable, Iterator
+
+from password_generator.engine import ByteSource, CharSampler, RandomBytes
+
+SPECIALS = "!@#$%^&*()-_=+[]{};:,.<>?/"
+AMBIGUOUS = "Il1O0"
+CLASSES = {
+    "lower": string.ascii_lowercase,
+    "upper": string.ascii_uppercase,
+    "digits": string.digits,
+    "specials": SPECIALS,
+}
+
+
+class Policy:
+    def __init__(
+        self,
+        length: int,
+        classes: dict[str, str] | None = None,
+        minimums: dict[str, int] | None = None,
+        exclude: str = "",
+        max_repeat: int | None = None,
+        source: ByteSource | None = None,
+    ):
+        classes = dict(CLASSES if classes is None else classes)
+        minimums = dict(minimums or {})
+        _check_arguments(length, classes, minimums, max_repeat)
+        self.length = length
+        self.max_repeat = max_repeat
+        self.classes = _compile_classes(classes, minimums, exclude)
+        self.minimums = [minimums.get(name, 0) for name in self.classes]
+        self.alphabet = "".join(self.classes.values())
+
+        self._constrained = any(self.minimums) or max_repeat is not None
+        self._runs = None
+        if max_repeat is not None and max_repeat < length:
+            self._runs = _Runs(self.length, self.classes, self.minimums, max_repeat)
+            if not self._runs.count():
+                raise ValueError("the policy allows no passwords.")
+        self._source = source
+        self._seed_random_state()
+        # Keyed by (class index, positions left); see _ways and _draw_count.
+        self._ways_cache: dict[tuple[int, int], int] = {}
+        self._cumulative: dict[tuple[int, int], list[int]] = {}
+
+    @property
+    def combinations(self) -> int:
+        """Number of distinct passwords that satisfy the policy."""
+        if self._runs is not None:
+            return self._runs.count()
+        return self._ways(0, self.length)
+
+    @property
+    def entropy_bits(self) -> float:
+        return math.log2(self.combinations) if self.combinations else 0.0
+
+    def generate(self) -> str:
+        if not self._constrained:
+            return self._alphabet_sampler.sample(self.length)
+        if self._runs is not None:
+            return self._runs.sample(self._random.randbelow)
+        chars: list[str] = []
+        remaining = self.length
+        for j, sampler in enumerate(self._samplers):
+            count = self._draw_count(j, remaining)
+            chars.extend(sampler.sample(count))
+            remaining -= count
+        self._random.shuffle(chars)
+        return "".join(chars)
+
+    def copy(self) -> "Policy":
+        """Return a policy sharing the compiled tables, with its own random state.
+
+        Policies are not thread-safe; give each thread its own copy.
+        """
+        clone = copy.copy(self)
+        clone._seed_random_state()
+        return clone
+
+    def generate_many(self, count: int | None = None) -> Iterator[str]:
+        """Yield ``count`` passwords, or an endless stream when ``count`` is None."""
+        while count is None or count > 0:
+            yield self.generate()
+            if count is not None:
+                count -= 1
+
+    def _seed_random_state(self) -> None:
+        self._alphabet_sampler = CharSampler(self.alphabet, self._source)
+        self._samplers = [CharSampler(c, self._source) for c in self.classes.values()]
+        self._random = RandomBytes(source=self._source)
+
+    def _ways(self, j: int, r: int) -> int:
+        """Ways to fill ``r`` positions using classes ``j`` and later only."""
+        if j == len(self._samplers):
+            return 1 if r == 0 else 0
+        key = (j, r)
+        if key not in self._ways_cache:
+            self._ways_cache[key] = sum(self._weights(j, r))
+        return self._ways_cache[key]
+
+    def _weights(self, j: int, r: int) -> list[int]:
+        size = len(self._samplers[j].alphabet)
+        return [
+            math.comb(r, k) * size**k * self._ways(j + 1, r - k)
+            for k in range(self.minimums[j], r + 1)
+        ]
+
+    def _draw_count(self, j: int, r: int) -> int:
+        """Draw how many of ``r`` positions class ``j`` gets."""
+        if j == len(self._samplers) - 1:
+            return r
+        key = (j, r)
+        cumulative = self._cumulative.get(key)
+        if cumulative is None:
+            cumulative, total = [], 0
+            for weight in self._weights(j, r):
+                total += weight
+                cumulative.append(total)
+            self._cumulative[key] = cumulative
+        index = bisect_right(cumulative, self._random.randbelow(cumulative[-1]))
+        return self.minimums[j] + index
+
+
+class _Runs:
+    """Count and sample passwords whose runs of equal characters are limited.
+
+    A password is a sequence of maximal runs, each repeating one character
+    1 to ``limit`` times and using a different character from the run before
+    it. ``_counts[r][state * stride + last]`` is the number of ways to fill
+    the last ``r`` positions, where ``state`` encodes how many characters
+    each class still needs (at most its minimum) and ``last`` is the class
+    of the previous run, or ``len(classes)`` before the first one.
+    """
+
+    def __init__(
+        self, length: int, classes: dict[str, str], minimums: list[int], limit: int
+    ):
+        self.length = length
+        self.limit = limit
+        self.charsets = list(classes.values())
+        self.minimums = minimums
+        self.stride = len(self.charsets) + 1
+        # Mixed-radix place value of each class's deficit in a state.
+        self.places = [
+            math.prod(m + 1 for m in minimums[:j]) for j in range(len(minimums))
+        ]
+        self.start = sum(m * place for m, place in zip(minimums, self.places))
+        states = self.start + 1
+        first = [0] * (states * self.stride)
+        first[: self.stride] = [1] * self.stride
+        self._counts = [first]
+        # _weights[r][state * classes + j]: see _weight; kept for sampling.
+        self._weights: list[list[int]] = [[]]
+        # _prefix[r] sums _counts[0] to _counts[r - 1].
+        self._prefix = [[0] * len(first), first]
+        for r in range(1, length + 1):
+            row, weights = [], []
+            for state in range(states):
+                ways = [self._weight(r, state, j) for j in range(len(self.charsets))]
+                total = sum(len(c) * w for c, w in zip(self.charsets, ways))
+                row.extend(total - w for w in ways)
+                row.append(total)
+                weights.extend(ways)
+            self._counts.append(row)
+            self._weights.append(weights)
+            self._prefix.append([a + b for a, b in zip(self._prefix[-1], row)])
+
+    def count(self) -> int:
+        return self._counts[self.length][self.start * self.stride + self.stride - 1]
+
+    def sample(self, randbelow: Callable[[int], int]) -> str:
+        """Build a password run by run, each choice weighted by its completions."""
+        runs: list[str] = []
+        r, state, last, previous = self.length, self.start, self.stride - 1, ""
+        while r:
+            value = randbelow(self._counts[r][state * self.stride + last])
+            weights, base = self._weights[r], state * (self.stride - 1)
+            for j, charset in enumerate(self.charsets):
+                weight = weights[base + j]
+                block = (len(charset) - (j == last)) * weight
+                if value < block:
+                    break
+                value -= block
+            index, value = divmod(value, weight)
+            if j == last and index >= charset.index(previous):
+                index += 1
+            for k in range(1, min(self.limit, r) + 1):
+                following = self._counts[r - k][
+                    self._step(state, j, k) * self.stride + j
+                ]
+                if value < following:
+                    break
+                value -= following
+            previous = charset[index]
+            runs.append(previous * k)
+            r, state, last = r - k, self._step(state, j, k), j
+        return "".join(runs)
+
+    def _step(self, state: int, j: int, k: int) -> int:
+        """The state after a run of ``k`` characters from class ``j``."""
+        return state - min(k, self._deficit(state, j)) * self.places[j]
+
+    def _deficit(self, state: int, j: int) -> int:
+        return state // self.places[j] % (self.minimums[j] + 1)
+
+    def _weight(self, r: int, state: int, j: int) -> int:
+        """Ways to fill ``r`` positions starting with a run of one class-``j`` char."""
+        longest = min(self.limit, r)
+        deficit = self._deficit(state, j)
+        total = sum(
+            self._counts[r - k][self._step(state, j, k) * self.stride + j]
+            for k in range(1, min(deficit - 1, longest) + 1)
+        )
+        # Runs of at least ``deficit`` characters all meet the class's minimum.
+        shortest = max(deficit, 1)
+        if shortest <= longest:
+            index = self._step(state, j, shortest) * self.stride + j
+            total += (
+                self._prefix[r - shortest + 1][index] - self._prefix[r - longest][index]
+            )
+        return total
+
+
+def _check_arguments(
+    length: int,
+    classes: dict[str, str],
+    minimums: dict[str, int],
+    max_repeat: int | None,
+) -> None:
+    if length < 0:
+        raise ValueError("length must not be negative.")
+    unknown = set(minimums) - set(classes)
+    if unknown:
+        raise ValueError(f"unknown character class: {', '.join(sorted(unknown))}.")
+    if any(count < 0 for count in minimums.values()):
+        raise ValueError("minimums must not be negative.")
+    if sum(minimums.values()) > length:
+        raise ValueError("minimums add up to more than the password length.")
+    if max_repeat is not None and max_repeat < 1:
+        raise ValueError("max_repeat must be at least 1.")
+
+
+def _compile_classes(
+    classes: dict[str, str],
+    minimums: dict[str, int],
+    exclude: str,
+) -> dict[str, str]:
+    """Remove excluded characters and drop classes left empty."""
+    compiled: dict[str, str] = {}
+    seen: set[str] = set()
+    for name, chars in classes.items():
+        chars = "".join(dict.fromkeys(c for c in chars if c not in exclude))
+        if seen.intersection(chars):
+            raise ValueError(f"class {name!r} shares characters with another class.")
+        seen.update(chars)
+        if not chars:
+            if minimums.get(name):
+                raise ValueError(f"class {name!r} has no characters left.")
+            continue
+        compiled[name] = chars
+    if not compiled:
+        raise ValueError("the policy allows no characters.")
+    return compiled
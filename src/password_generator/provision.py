@@ -0,0 +1,176 @@
+"""Bulk credential provisioning: a password and its stored hash per user.
+
+Passwords and salts are generated in the main process, in input order, and
+hashed in batches on a process pool with ``map_ordered``, so records come
+out in the order of the usernames while only a few batches are in memory.
+Hashing is the slow step (tens to hundreds of milliseconds per password by
+design), so it is the part that runs in parallel.
+
+Hashes use the encodings of Django's password hashers, which many other
+tools can verify:
+
+- ``scrypt$<salt>$<n>$<r>$<p>$<base64 hash>``
+- ``pbkdf2_sha256$<iterations>$<salt>$<base64 hash>``
+"""
+
+import csv
+import hmac
+import json
+import base64
+import string
+import hashlib
+from itertools import repeat
+from typing import Iterable, Iterator, TextIO
+
+from password_generator.engine import ByteSource, CharSampler
+
+ALGORITHMS = ("scrypt", "pbkdf2")
+FORMATS = ("csv", "jsonl")
+# Default costs: scrypt N (a power of two) and PBKDF2-HMAC-SHA256 iterations.
+SCRYPT_N = 2**14
+SCRYPT_R = 8
+SCRYPT_P = 1
+SCRYPT_DKLEN = 64
+PBKDF2_ITERATIONS = 600_000
+SALT_CHARS = string.ascii_letters + string.digits
+SALT_LENGTH = 22
+# Passwords hashed per task on the pool.
+BATCH_SIZE = 16
+
+# (user, password, hash)
+Record = tuple[str, str, str]
+
+
+def hash_password(
+    password: str, salt: str, algorithm: str = "scrypt", cost: int | None = None
+) -> str:
+    """Return the encoded hash of ``password``; ``cost`` is scrypt N or iterations."""
+    cost = resolve_cost(algorithm, cost)
+    secret, salt_bytes = password.encode("utf-8"), salt.encode("ascii")
+    if algorithm == "scrypt":
+        digest = hashlib.scrypt(
+            secret,
+            salt=salt_bytes,
+            n=cost,
+            r=SCRYPT_R,
+            p=SCRYPT_P,
+            maxmem=256 * SCRYPT_R * cost,
+            dklen=SCRYPT_DKLEN,
+        )
+        encoded = base64.b64encode(digest).decode("ascii")
+        return f"scrypt${salt}${cost}${SCRYPT_R}${SCRYPT_P}${encoded}"
+    digest = hashlib.pbkdf2_hmac("sha256", secret, salt_bytes, cost)
+    encoded = base64.b64encode(digest).decode("ascii")
+    return f"pbkdf2_sha256${cost}${salt}${encoded}"
+
+
+def resolve_cost(algorithm: str, cost: int | None) -> int:
+    """Validate ``algorithm`` and ``cost``; return the cost, or its default."""
+    if algorithm == "scrypt":
+        cost = SCRYPT_N if cost is None else cost
+        if cost < 2 or cost & (cost - 1):
+            raise ValueError("scrypt cost must be a power of two above 1.")
+    elif algorithm == "pbkdf2":
+        cost = PBKDF2_ITERATIONS if cost is None else cost
+        if cost < 1:
+            raise ValueError("pbkdf2 cost must be at least 1.")
+    else:
+        raise ValueError(f"unknown hash algorithm {algorithm!r}.")
+    return cost
+
+
+def verify_password(password: str, encoded: str) -> bool:
+    """Check ``password`` against a hash written by ``hash_password``."""
+    fields = encoded.split("$")
+    if fields[0] == "scrypt" and len(fields) == 6:
+        salt, cost = fields[1], int(fields[2])
+        expected = hash_password(password, salt, "scrypt", cost)
+    elif fields[0] == "pbkdf2_sha256" and len(fields) == 4:
+        cost, salt = int(fields[1]), fields[2]
+        expected = hash_password(password, salt, "pbkdf2", cost)
+    else:
+        raise ValueError("unsupported hash format.")
+    return hmac.compare_digest(expected, encoded)
+
+
+def hash_batch(
+    batch: list[tuple[str, str, str]], algorithm: str, cost: int | None
+) -> list[Record]:
+    """Hash a batch of ``(user, password, salt)``; return ``(user, password, hash)``."""
+    return [
+        (user, password, hash_password(password, salt, algorithm, cost))
+        for user, password, salt in batch
+    ]
+
+
+def provision(
+    users: Iterable[str],
+    passwords: Iterator[str],
+    algorithm: str = "scrypt",
+    cost: int | None = None,
+    workers: int = 1,
+    source: ByteSource | None = None,
+    batch_size: int = BATCH_SIZE,
+) -> Iterator[Record]:
+    """Return an iterator of records, one per user in order, hashed on ``workers``.
+
+    ``passwords`` supplies one password per user; ``source`` (default
+    ``os.urandom``) supplies the salts. Invalid settings raise ValueError
+    here, before anything is generated.
+    """
+    # The process pool is slow to import; the CLI only needs it for provision.
+    from password_generator.parallel import map_ordered
+
+    cost = resolve_cost(algorithm, cost)
+    if workers < 1:
+        raise ValueError("workers must be at least 1.")
+    salts = CharSampler(SALT_CHARS, source)
+    batches = _batches(users, passwords, salts, batch_size)
+    results = map_ordered(
+        hash_batch, batches, repeat(algorithm), repeat(cost), workers=workers
+    )
+    return (record for records in results for record in records)
+
+
+def write_records(records: Iterable[Record], out: TextIO, format: str = "csv") -> int:
+    """Write records as CSV (with a header) or JSON lines; return the count."""
+    written = 0
+    if format == "csv":
+        writer = csv.writer(out, lineterminator="\n")
+        writer.writerow(("user", "password", "hash"))
+        for record in records:
+            writer.writerow(record)
+            written += 1
+    elif format == "jsonl":
+        for user, password, hashed in records:
+            out.write(
+                json.dumps({"user": user, "password": password, "hash": hashed}) + "\n"
+            )
+            written += 1
+    else:
+        raise ValueError(f"unknown format {format!r}.")
+    return written
+
+
+def read_users(lines: Iterable[str]) -> Iterator[str]:
+    """Yield the username on each non-empty line, stripped of whitespace."""
+    for line in lines:
+        user = line.strip()
+        if user:
+            yield user
+
+
+def _batches(
+    users: Iterable[str],
+    passwords: Iterator[str],
+    salts: CharSampler,
+    batch_size: int,
+) -> Iterator[list[tuple[str, str, str]]]:
+    batch = []
+    for user in users:
+        batch.append((user, next(passwords), salts.sample(SALT_LENGTH)))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
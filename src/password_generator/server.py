@@ -0,0 +1,334 @@
+"""Vend passwords over a local Unix domain socket.
+
+``serve`` keeps password generators warm in one long-running process so
+clients do not pay interpreter startup for every credential. Each distinct
+policy gets a ``PasswordPool``: a bounded queue that a background thread
+keeps full from ``generate_many``, so passwords are produced in bulk and a
+request is usually answered straight from the queue. When a pool runs dry
+the request is served by a second generator kept for that purpose, so
+clients never wait for the filler thread. Both generators share one compiled
+policy. Compiling a new policy and serving a miss run on the event loop's
+executor, so a slow policy never holds up other clients.
+
+The protocol is one request per line, many requests per connection:
+
+``GET [key=value ...]``
+    Reply with one ``OK <password>`` line per password. Keys: ``count``,
+    ``length``, ``digits`` and ``specials`` (``yes``/``no``), ``exclude``,
+    ``max-repeat`` and ``min.CLASS``; they override the daemon's settings.
+``STATS``
+    Reply ``OK pools=N ready=N served=N``.
+``QUIT``
+    Close the connection.
+
+Errors are reported as one ``ERR <message>`` line. The socket is created
+accessible to its owner only.
+"""
+
+import os
+import stat
+import signal
+import queue
+import socket
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Iterator, Mapping
+
+# Passwords kept ready per policy.
+POOL_SIZE = 10_000
+# Policies kept warm at once; the least recently used pool is stopped first.
+MAX_POOLS = 16
+# Limits per request.
+MAX_COUNT = 1000
+MAX_LENGTH = 256
+MAX_LINE = 4096
+# Seconds the filler thread waits on a full pool before checking for close().
+FILL_POLL = 0.1
+
+BOOLEANS = {"yes": True, "1": True, "no": False, "0": False}
+# Request key -> (generator keyword, parser of the value).
+OPTIONS: dict[str, tuple[str, Callable[[str, str], Any]]] = {
+    "length": ("length", lambda key, value: _number(key, value, 0, MAX_LENGTH)),
+    "max-repeat": ("max_repeat", lambda key, value: _number(key, value, 1, MAX_LENGTH)),
+    "digits": ("use_digits", lambda key, value: _boolean(key, value)),
+    "specials": ("use_specials", lambda key, value: _boolean(key, value)),
+    "exclude": ("exclude", lambda key, value: value),
+}
+
+
+class PasswordPool:
+    """A bounded queue of passwords kept full by a background thread.
+
+    ``generator`` serves misses; the filler thread uses ``generator.copy()``,
+    which shares its compiled policy.
+    """
+
+    def __init__(self, generator: Any, size: int = POOL_SIZE):
+        if size < 1:
+            raise ValueError("size must be at least 1.")
+        # Generators are not thread-safe: one fills the pool, one serves misses.
+        self._fallback = generator
+        self._lock = threading.Lock()
+        self._queue: queue.Queue[str] = queue.Queue(size)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._fill, args=(generator.copy(),), daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def ready(self) -> int:
+        return self._queue.qsize()
+
+    def take(self, count: int = 1) -> list[str]:
+        """Return ``count`` passwords, from the pool while it has any."""
+        passwords = self.take_ready(count)
+        if len(passwords) < count:
+            passwords += self.generate(count - len(passwords))
+        return passwords
+
+    def take_ready(self, count: int) -> list[str]:
+        """Return up to ``count`` passwords that are already in the pool."""
+        passwords = []
+        try:
+            while len(passwords) < count:
+                passwords.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        return passwords
+
+    def generate(self, count: int) -> list[str]:
+        """Generate ``count`` passwords with the fallback generator."""
+        with self._lock:
+            return list(self._fallback.generate_many(count))
+
+    def close(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _fill(self, generator: Any) -> None:
+        put, stop = self._queue.put, self._stop
+        for password in generator.generate_many():
+            while True:
+                if stop.is_set():
+                    return
+                try:
+                    put(password, timeout=FILL_POLL)
+                    break
+                except queue.Full:
+                    pass
+
+
+class PasswordServer:
+    """Answer protocol requests from pools built by ``factory(**options)``."""
+
+    def __init__(
+        self,
+        factory: Callable[..., Any],
+        pool_size: int = POOL_SIZE,
+        max_pools: int = MAX_POOLS,
+    ):
+        self.factory = factory
+        self.pool_size = pool_size
+        self.max_pools = max_pools
+        self.served = 0
+        self._defaults = factory()
+        self._pools: OrderedDict[tuple, PasswordPool] = OrderedDict()
+
+    async def pool(self, options: dict[str, Any]) -> PasswordPool:
+        """Return the pool for ``options``, starting it on first use."""
+        key = tuple(sorted((k, _hashable(v)) for k, v in options.items()))
+        pool = self._pools.get(key)
+        if pool is None:
+            loop = asyncio.get_running_loop()
+            generator = self.factory(**options)
+            # Compile the policy, and report an invalid one, off the loop.
+            await loop.run_in_executor(None, generator.generate)
+            # Another request may have started the same pool meanwhile.
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = self._pools[key] = PasswordPool(generator, self.pool_size)
+                if len(self._pools) > self.max_pools:
+                    evicted = self._pools.popitem(last=False)[1]
+                    await loop.run_in_executor(None, evicted.close)
+                return pool
+        self._pools.move_to_end(key)
+        return pool
+
+    async def respond(self, line: str) -> str | None:
+        """Return the reply to one request line, or None to close."""
+        command, *params = line.split() or [""]
+        command = command.upper()
+        try:
+            if command == "GET":
+                count, options = self.parse_options(params)
+                pool = await self.pool(options)
+                passwords = pool.take_ready(count)
+                if len(passwords) < count:
+                    loop = asyncio.get_running_loop()
+                    missing = count - len(passwords)
+                    passwords += await loop.run_in_executor(
+                        None, pool.generate, missing
+                    )
+                self.served += len(passwords)
+                return "".join(f"OK {password}\n" for password in passwords)
+            if command == "STATS" and not params:
+                ready = sum(pool.ready for pool in self._pools.values())
+                return (
+                    f"OK pools={len(self._pools)} ready={ready} served={self.served}\n"
+                )
+            if command == "QUIT" and not params:
+                return None
+            raise ValueError(f"unknown request {line[:40]!r}.")
+        except ValueError as e:
+            return f"ERR {e}\n"
+
+    def parse_options(self, params: list[str]) -> tuple[int, dict[str, Any]]:
+        """Split ``key=value`` parameters into a count and generator options."""
+        count = 1
+        options: dict[str, Any] = {}
+        minimums: dict[str, int] = {}
+        for param in params:
+            key, sep, value = param.partition("=")
+            if not sep:
+                raise ValueError(f"expected key=value, got {param[:40]!r}.")
+            if key == "count":
+                count = _number(key, value, 1, MAX_COUNT)
+            elif key.startswith("min."):
+                minimums[key[len("min.") :]] = _number(key, value, 0, MAX_LENGTH)
+            elif key in OPTIONS:
+                name, parse = OPTIONS[key]
+                options[name] = parse(key, value)
+            else:
+                raise ValueError(f"unknown option {key[:40]!r}.")
+        if minimums:
+            options["minimums"] = {**self._defaults.minimums, **minimums}
+        return count, options
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                try:
+                    data = await reader.readline()
+                except ValueError:
+                    writer.write(b"ERR request line too long.\n")
+                    break
+                if not data:
+                    break
+                reply = await self.respond(data.decode("utf-8", "replace").strip())
+                if reply is None:
+                    break
+                writer.write(reply.encode("utf-8"))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, path: str) -> asyncio.AbstractServer:
+        """Listen on ``path``, replacing a stale socket left by a dead server."""
+        remove_stale_socket(path)
+        umask = os.umask(0o077)
+        try:
+            return await asyncio.start_unix_server(self.handle, path, limit=MAX_LINE)
+        finally:
+            os.umask(umask)
+
+    async def serve(self, path: str) -> None:
+        """Serve on ``path`` until SIGINT or SIGTERM; then remove the socket."""
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stop.set)
+        server = await self.start(path)
+        try:
+            async with server:
+                await stop.wait()
+        finally:
+            self.close()
+            if os.path.exists(path):
+                os.unlink(path)
+
+    def close(self) -> None:
+        while self._pools:
+            self._pools.popitem()[1].close()
+
+
+def remove_stale_socket(path: str) -> None:
+    """Unlink a socket nobody listens on; refuse to touch anything else."""
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise ValueError(f"{path} exists and is not a socket.")
+    with socket.socket(socket.AF_UNIX) as probe:
+        try:
+            probe.connect(path)
+        except ConnectionRefusedError:
+            os.unlink(path)
+            return
+    raise ValueError(f"a server is already listening on {path}.")
+
+
+def fetch(
+    path: str, count: int = 1, options: Mapping[str, object] | None = None
+) -> list[str]:
+    """Request ``count`` passwords from a server.
+
+    ``options`` maps protocol keys, such as ``max-repeat`` or ``min.digits``,
+    to their values.
+    """
+    params = [f"count={count}"]
+    for key, value in (options or {}).items():
+        param = f"{key}={value}"
+        if len(param.split()) != 1:
+            raise ValueError(f"option {key!r} must not contain whitespace.")
+        params.append(param)
+    with socket.socket(socket.AF_UNIX) as client:
+        client.connect(path)
+        client.sendall(("GET " + " ".join(params) + "\n").encode("utf-8"))
+        lines = list(_read_lines(client, count))
+    passwords = []
+    for line in lines:
+        if line.startswith("ERR "):
+            raise ValueError(line[len("ERR ") :])
+        passwords.append(line[len("OK ") :])
+    return passwords
+
+
+def _read_lines(client: socket.socket, count: int) -> Iterator[str]:
+    """Read replies until ``count`` lines or one error line have arrived."""
+    buffer = b""
+    received = 0
+    while received < count:
+        chunk = client.recv(65536)
+        if not chunk:
+            raise ConnectionError("the server closed the connection.")
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            text = line.decode("utf-8")
+            yield text
+            received += 1
+            if text.startswith("ERR "):
+                return
+
+
+def _number(key: str, value: str, low: int, high: int) -> int:
+    if not value.isdigit() or not low <= int(value) <= high:
+        raise ValueError(f"{key} must be a number from {low} to {high}.")
+    return int(value)
+
+
+def _boolean(key: str, value: str) -> bool:
+    if value not in BOOLEANS:
+        raise ValueError(f"{key} must be yes or no.")
+    return BOOLEANS[value]
+
+
+def _hashable(value: Any) -> Any:
+    return tuple(sorted(value.items())) if isinstance(value, dict) else value
@@ -0,0 +1,87 @@
+"""Guaranteed-unique bulk output in bounded memory.
+
+Instead of a set of strings, seen passwords are kept as 64-bit fingerprints
+(their string hash) in a flat open-addressing table, an ``array`` of
+unsigned 64-bit ints sized once for the requested count: 8 bytes per slot at
+most 75% full, so 11-22 bytes per password. Equal passwords always have
+equal fingerprints, so a repeat is never let through. Two different
+passwords sharing a fingerprint (odds around 2**-64 per pair) only means
+that one more candidate is drawn.
+"""
+
+import math
+from array import array
+from typing import Iterable, Iterator
+
+MAX_LOAD = 0.75
+MASK = 2**64 - 1
+
+
+class UniqueFilter:
+    def __init__(self, capacity: int):
+        if capacity < 0:
+            raise ValueError("capacity must not be negative.")
+        size = 8
+        while size * MAX_LOAD < capacity:
+            size *= 2
+        self._slots = array("Q", bytes(8 * size))
+        self._mask = size - 1
+        self.capacity = max(capacity, int(size * MAX_LOAD))
+        self.count = 0
+
+    @property
+    def nbytes(self) -> int:
+        return self._slots.itemsize * len(self._slots)
+
+    def add(self, item: str) -> bool:
+        """Record ``item``; return False if it was seen before."""
+        # 0 marks an empty slot.
+        fingerprint = hash(item) & MASK or 1
+        slots, mask = self._slots, self._mask
+        i = fingerprint & mask
+        while True:
+            slot = slots[i]
+            if slot == fingerprint:
+                return False
+            if not slot:
+                break
+            i = (i + 1) & mask
+        if self.count >= self.capacity:
+            raise ValueError("UniqueFilter is full.")
+        slots[i] = fingerprint
+        self.count += 1
+        return True
+
+
+def unique(items: Iterable[str], count: int) -> Iterator[str]:
+    """Yield the first ``count`` distinct items, skipping repeats."""
+    if count < 1:
+        return
+    seen = UniqueFilter(count)
+    for item in items:
+        if seen.add(item):
+            yield item
+            if seen.count >= count:
+                return
+
+
+def expected_duplicates(
+    count: int, combinations: int, collision: float | None = None
+) -> float:
+    """Expected number of repeated pairs among ``count`` draws.
+
+    Draws are uniform over ``combinations`` values unless ``collision``, the
+    probability that two draws are equal, is given.
+    """
+    if collision is None:
+        return count * (count - 1) / (2 * combinations)
+    return count * (count - 1) / 2 * collision
+
+
+def collision_probability(
+    count: int, combinations: int, collision: float | None = None
+) -> float:
+    """Probability that ``count`` draws contain at least one repeat."""
+    if count > combinations:
+        return 1.0
+    return -math.expm1(-expected_duplicates(count, combinations, collision))
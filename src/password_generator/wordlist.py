@@ -0,0 +1,195 @@
+"""Memory-mapped wordlists for diceware passphrases.
+
+A wordlist is a text file with one word per line; the word is the last
+whitespace-separated field, so the EFF format (``11111<TAB>abacus``) works
+unchanged, and blank lines and ``#`` comments are skipped. The first time a
+list is used, the start offset of every word is written to an index file
+next to it (``<list>.idx``). After that, both files are memory-mapped and
+any word is read in constant time without loading the list into memory.
+The index records the list's size and mtime and is rebuilt when they change;
+if it cannot be written, it is kept in memory for the current run.
+
+The default list is the EFF large wordlist (7776 words, CC BY 3.0 US), which
+ships with the package.
+"""
+
+import os
+import math
+import mmap
+import struct
+from array import array
+from typing import Iterator
+
+from password_generator.engine import ByteSource, RandomBytes
+
+BUNDLED_WORDLIST = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "wordlists", "eff_large_wordlist.txt"
+)
+INDEX_SUFFIX = ".idx"
+# Magic, offset type code, word count, list size and list mtime_ns; 32 bytes
+# keep the offsets that follow aligned.
+INDEX_HEADER = struct.Struct("<4s4sQQQ")
+INDEX_MAGIC = b"PWIX"
+
+
+class WordList:
+    def __init__(self, path: str | None = None):
+        self.path = path or BUNDLED_WORDLIST
+        self._file = open(self.path, "rb")
+        st = os.fstat(self._file.fileno())
+        if st.st_size == 0:
+            self._file.close()
+            raise ValueError(f"wordlist {self.path} is empty.")
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._index_data: mmap.mmap | None = None
+        self._offsets = self._load_index(st)
+        if not len(self._offsets):
+            self.close()
+            raise ValueError(f"wordlist {self.path} has no words.")
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __getitem__(self, i: int) -> str:
+        start = self._offsets[i]
+        end = self._data.find(b"\n", start)
+        if end < 0:
+            end = len(self._data)
+        return self._data[start:end].rstrip().decode("utf-8")
+
+    @property
+    def bits_per_word(self) -> float:
+        return math.log2(len(self))
+
+    def close(self) -> None:
+        if isinstance(self._offsets, memoryview):
+            self._offsets.release()
+        if self._index_data is not None:
+            self._index_data.close()
+        self._data.close()
+        self._file.close()
+
+    def _load_index(self, st: os.stat_result) -> "array | memoryview":
+        index_path = self.path + INDEX_SUFFIX
+        data = _map_index(index_path, st)
+        if data is not None:
+            self._index_data = data
+            typecode = INDEX_HEADER.unpack_from(data)[1].rstrip(b"\0").decode()
+            return memoryview(data)[INDEX_HEADER.size :].cast(typecode)
+
+        offsets = build_offsets(self._data)
+        try:
+            write_index(index_path, offsets, st)
+        except OSError:
+            pass  # Read-only location: keep the index in memory for this run.
+        return offsets
+
+
+def _map_index(path: str, st: os.stat_result) -> mmap.mmap | None:
+    """Map an index file if it is complete and matches the list's size and mtime."""
+    try:
+        with open(path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if len(data) >= INDEX_HEADER.size:
+        magic, typecode, count, size, mtime_ns = INDEX_HEADER.unpack_from(data)
+        typecode = typecode.rstrip(b"\0")
+        if (
+            magic == INDEX_MAGIC
+            and typecode in (b"I", b"Q")
+            and (size, mtime_ns) == (st.st_size, st.st_mtime_ns)
+            and len(data)
+            == INDEX_HEADER.size + count * array(typecode.decode()).itemsize
+        ):
+            return data
+    data.close()
+    return None
+
+
+def build_offsets(data: "mmap.mmap | bytes") -> array:
+    """Return the start offset of the word on each non-empty, non-comment line."""
+    offsets = array("I" if len(data) < 2**32 else "Q")
+    pos, size = 0, len(data)
+    while pos < size:
+        end = data.find(b"\n", pos)
+        if end < 0:
+            end = size
+        line = data[pos:end].rstrip()
+        if line and not line.startswith(b"#"):
+            fields = line.split()
+            offsets.append(pos + line.rindex(fields[-1]))
+        pos = end + 1
+    return offsets
+
+
+def write_index(path: str, offsets: array, st: os.stat_result) -> None:
+    """Write the index atomically, so a concurrent reader never sees half of it."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    header = INDEX_HEADER.pack(
+        INDEX_MAGIC,
+        offsets.typecode.encode("ascii"),
+        len(offsets),
+        st.st_size,
+        st.st_mtime_ns,
+    )
+    try:
+        with open(tmp, "wb") as f:
+            f.write(header)
+            offsets.tofile(f)
+        os.replace(tmp, path)
+    except OSError:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+class PassphraseGenerator:
+    """Diceware-style passphrases: ``words`` random words from a wordlist."""
+
+    def __init__(
+        self,
+        wordlist: WordList,
+        words: int = 6,
+        separator: str = " ",
+        capitalize: bool = False,
+        source: ByteSource | None = None,
+    ):
+        if words < 1:
+            raise ValueError("words must be at least 1.")
+        self.wordlist = wordlist
+        self.words = words
+        self.separator = separator
+        self.capitalize = capitalize
+        self._random = RandomBytes(source=source)
+
+    @classmethod
+    def from_file(
+        cls, path: str | None = None, **options: object
+    ) -> "PassphraseGenerator":
+        """Build a generator for the wordlist at ``path`` (default: bundled)."""
+        return cls(WordList(path), **options)
+
+    @property
+    def combinations(self) -> int:
+        """Number of distinct passphrases, assuming the list has no repeats."""
+        return len(self.wordlist) ** self.words
+
+    @property
+    def entropy_bits(self) -> float:
+        """Entropy assuming the words in the list are distinct."""
+        return self.words * self.wordlist.bits_per_word
+
+    def generate(self) -> str:
+        wordlist, size = self.wordlist, len(self.wordlist)
+        chosen = [wordlist[self._random.randbelow(size)] for _ in range(self.words)]
+        if self.capitalize:
+            chosen = [word.capitalize() for word in chosen]
+        return self.separator.join(chosen)
+
+    def generate_many(self, count: int | None = None) -> Iterator[str]:
+        """Yield ``count`` passphrases, or an endless stream when ``count`` is None."""
+        while count is None or count > 0:
+            yield self.generate()
+            if count is not None:
+                count -= 1
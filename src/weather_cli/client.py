@@ -0,0 +1,83 @@
+"""Shared HTTP client for the Open-Meteo APIs.
+
+A single ``requests.Session`` keeps connections alive between requests, so
+a geocoding lookup followed by a forecast (or many of them in one job)
+reuses the same TCP and TLS connections instead of opening new ones. Every
+request has a connect and a read timeout, so a stalled upstream fails fast
+instead of hanging the caller.
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Seconds to wait for the connection and for each read from the server.
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 10.0
+# Connections kept open per host.
+POOL_SIZE = 10
+
+_default_client = None
+
+
+class WeatherClient:
+    """
+    HTTP client with a pooled, keep-alive session and request timeouts.
+
+    Parameters
+    ----------
+    pool_size : int
+        Maximum number of connections kept open per host.
+    connect_timeout : float
+        Seconds to wait for a connection to be established.
+    read_timeout : float
+        Seconds to wait for the server between bytes of the response.
+
+    The client can be used as a context manager, which closes the session
+    and its connections on exit.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = POOL_SIZE,
+        connect_timeout: float = CONNECT_TIMEOUT,
+        read_timeout: float = READ_TIMEOUT,
+    ):
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1.")
+        if connect_timeout <= 0 or read_timeout <= 0:
+            raise ValueError("timeouts must be positive.")
+        self.timeout = (connect_timeout, read_timeout)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get_json(self, url: str, params: dict) -> dict:
+        """
+        Send a GET request and return the decoded JSON body.
+
+        Raises
+        ------
+        requests.exceptions.RequestException
+            If the request fails, times out or returns an error status.
+        """
+        response = self.session.get(url, params=params, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> "WeatherClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def default_client() -> WeatherClient:
+    """Return the client shared by calls that do not pass their own."""
+    global _default_client
+    if _default_client is None:
+        _default_client = WeatherClient()
+    return _default_client
@@ -1,12 +1,13 @@
 import argparse
-import requests
 import sys
 
+from weather_cli.client import WeatherClient, default_client
+
 GEOCODE_URL = "https://geocoding-api.open-meteo.com/v1/search"
 WEATHER_URL = "https://api.open-meteo.com/v1/forecast"
 
 
-def geocode_city(city: str):
+def geocode_city(city: str, client: WeatherClient | None = None):
     """
     Look up geographic coordinates for a given city name using Open-Meteo's geocoding API.
 
@@ -14,6 +15,8 @@ def geocode_city(city: str):
     ----------
     city : str
         Name of the city to geocode.
+    client : WeatherClient, optional
+        Client to send the request with (default: the shared client).
 
     Returns
     -------
@@ -26,9 +29,8 @@ def geocode_city(city: str):
         If the city cannot be found or the API request fails.
     """
     try:
-        response = requests.get(GEOCODE_URL, params={"name": city, "count": 1})
-        response.raise_for_status()
-        data = response.json()
+        client = client or default_client()
+        data = client.get_json(GEOCODE_URL, {"name": city, "count": 1})
 
         if "results" not in data or not data["results"]:
             print(f"❌ Location not found: {city}")
@@ -47,7 +49,7 @@ def geocode_city(city: str):
         sys.exit(1)
 
 
-def fetch_weather(lat: float, lon: float):
+def fetch_weather(lat: float, lon: float, client: WeatherClient | None = None):
     """
     Fetch current weather data for given geographic coordinates using Open-Meteo.
 
@@ -57,6 +59,8 @@ def fetch_weather(lat: float, lon: float):
         Latitude of the location.
     lon : float
         Longitude of the location.
+    client : WeatherClient, optional
+        Client to send the request with (default: the shared client).
 
     Returns
     -------
@@ -69,12 +73,11 @@ def fetch_weather(lat: float, lon: float):
         If the API request fails.
     """
     try:
-        response = requests.get(
+        client = client or default_client()
+        return client.get_json(
             WEATHER_URL,
-            params={"latitude": lat, "longitude": lon, "current_weather": True},
+            {"latitude": lat, "longitude": lon, "current_weather": True},
         )
-        response.raise_for_status()
-        return response.json()
 
     except Exception as e:
         print(f"❌ Weather API error: {e}")
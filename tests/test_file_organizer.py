@@ -9,20 +9,34 @@ This module tests:
 - Handling of multi-dot filenames
 - Ignoring nested directories
 - Idempotent behavior (running organize() twice)
+- Recursive scanning and parallel movers
+- Rename fast path, cross-device fallback and target directory caching
+- Journaled runs: dry run, resume after interruption and undo
+- Content-based classification
+- Duplicate handling (skip, hard link, report)
+- Name collision policies
+- Rule-based destinations
+- Output modes and reporters
+- SQLite index of moves
 - CLI behavior and argument parsing
 
 All filesystem operations use temporary directories to ensure isolation.
 """
 
 import os
+import errno
 import shutil
 import tempfile
+import json
+import datetime
 import argparse
 import pytest
 from unittest.mock import patch
 
-from file_organizer.file_organizer import FileOrganizer
-
+from file_organizer.file_organizer import STATE_DIR, FileOrganizer, build_parser
+from file_organizer.journal import JournalError
+from file_organizer.reporting import Reporter
+from file_organizer.rules import RuleSet
 
 # ============================================================
 # Helper
@@ -47,6 +61,13 @@ def test_invalid_directory():
         FileOrganizer("not_a_real_dir")
 
 
+def test_invalid_worker_count():
+    """Ensure FileOrganizer rejects a worker count below one."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with pytest.raises(ValueError):
+            FileOrganizer(tmpdir, workers=0)
+
+
 # ============================================================
 # Core organize() tests
 # ============================================================
@@ -154,6 +175,727 @@ def test_reorganize_is_idempotent():
         assert len(os.listdir(txt_dir)) == 2
 
 
+# ============================================================
+# Recursive / parallel organize() tests
+# ============================================================
+
+
+def create_nested_tree(base_dir):
+    """Create a small tree with files at several depths."""
+    os.makedirs(os.path.join(base_dir, "a", "b"))
+    create_temp_files(base_dir, ["root.txt"])
+    create_temp_files(os.path.join(base_dir, "a"), ["one.jpg", "two.TXT"])
+    create_temp_files(os.path.join(base_dir, "a", "b"), ["deep.zip", "README"])
+
+
+def test_recursive_moves_nested_files():
+    """Ensure recursive mode organizes files from every subdirectory."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        create_nested_tree(tmpdir)
+
+        FileOrganizer(tmpdir, recursive=True).organize()
+
+        assert os.path.isfile(os.path.join(tmpdir, "txt", "root.txt"))
+        assert os.path.isfile(os.path.join(tmpdir, "txt", "two.TXT"))
+        assert os.path.isfile(os.path.join(tmpdir, "jpg", "one.jpg"))
+        assert os.path.isfile(os.path.join(tmpdir, "zip", "deep.zip"))
+        assert os.path.isfile(os.path.join(tmpdir, "no_extension", "README"))
+        assert os.listdir(os.path.join(tmpdir, "a", "b")) == []
+
+
+@pytest.mark.skipif(
+    not hasattr(os, "geteuid") or os.geteuid() == 0,
+    reason="needs directory permissions to apply",
+)
+def test_recursive_skips_unreadable_subdirectory():
+    """Ensure an unreadable subdirectory is reported and the rest organized."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        create_nested_tree(tmpdir)
+        locked = os.path.join(tmpdir, "a", "b")
+        reporter = Reporter()
+        os.chmod(locked, 0)
+        try:
+            with patch.object(reporter, "failed") as failed:
+                FileOrganizer(tmpdir, recursive=True, reporter=reporter).organize()
+        finally:
+            os.chmod(locked, 0o755)
+
+        failed.assert_called_once_with(locked, "Permission denied")
+        assert os.path.isfile(os.path.join(tmpdir, "jpg", "one.jpg"))
+        assert sorted(os.listdir(locked)) == ["README", "deep.zip"]
+
+
+def test_recursive_skips_vanished_subdirectory():
+    """Ensure a subdirectory removed during the scan does not stop the run."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        create_nested_tree(tmpdir)
+        gone = os.path.join(tmpdir, "a", "b")
+        real_scandir = os.scandir
+
+        def scandir(path):
+            if path == gone:
+                raise FileNotFoundError(2, "No such file or directory", path)
+            return real_scandir(path)
+
+        reporter = Reporter()
+        with (
+            patch("os.scandir", side_effect=scandir),
+            patch.object(reporter, "failed") as failed,
+        ):
+            summary = FileOrganizer(
+                tmpdir, recursive=True, reporter=reporter
+            ).organize()
+
+        failed.assert_called_once_with(gone, "No such file or directory")
+        assert len(summary.moves) == 3
+
+
+def test_recursive_is_idempotent():
+    """Ensure already organized files are not moved again."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        create_nested_tree(tmpdir)
+
+        organizer = FileOrganizer(tmpdir, recursive=True)
+        organizer.organize()
+        assert organizer.organize().moves == []
+
+
+def test_parallel_results_match_sequential():
+    """Ensure the worker count does not change the returned moves."""
+    with (
+        tempfile.TemporaryDirectory() as seq_dir,
+        tempfile.TemporaryDirectory() as par_dir,
+    ):
+        for base in (seq_dir, par_dir):
+            create_nested_tree(base)
+            create_temp_files(base, [f"bulk{i}.dat" for i in range(50)])
+
+        sequential = FileOrganizer(seq_dir, recursive=True).organize().moves
+        parallel = FileOrganizer(par_dir, recursive=True, workers=4).organize().moves
+
+        def relative(moves, base):
+            return [
+                (os.path.relpath(src, base), os.path.relpath(dst, base))
+                for src, dst in moves
+            ]
+
+        assert relative(sequential, seq_dir) == relative(parallel, par_dir)
+        assert len(parallel) == 55
+
+
+def test_parallel_same_name_collision_keeps_last_in_scan_order():
+    """Ensure colliding names resolve the same way regardless of threads."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for sub in ("x", "y"):
+            os.makedirs(os.path.join(tmpdir, sub))
+            with open(os.path.join(tmpdir, sub, "same.txt"), "w") as fp:
+                fp.write(sub)
+
+        FileOrganizer(
+            tmpdir, recursive=True, workers=4, on_collision="overwrite"
+        ).organize()
+
+        with open(os.path.join(tmpdir, "txt", "same.txt")) as fp:
+            assert fp.read() == "y"
+
+
+# ============================================================
+# Move strategy tests
+# ============================================================
+
+
+def test_same_device_moves_are_renames():
+    """Ensure files on the same filesystem are moved with a rename."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        create_temp_files(tmpdir, ["a.txt", "b.txt", "c.jpg"])
+
+        summary = FileOrganizer(tmpdir).organize()
+
+        assert summary.renamed == 3
+        assert summary.copied == 0
+
+
+def test_cross_device_falls_back_to_copy():
+    """Ensure a rename refused with EXDEV falls back to copy and delete."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        create_temp_files(tmpdir, ["a.txt"])
+
+        real_replace = os.replace
+
+        def refuse_cross_device(src, dst):
+            if STATE_DIR in src:
+                return real_replace(src, dst)
+            raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+        with patch(
+            "file_organizer.file_organizer.os.replace",
+            side_effect=refuse_cross_device,
+        ):
+            summary = FileOrganizer(tmpdir).organize()
+
+        assert summary.copied == 1
+        assert summary.renamed == 0
+        assert not os.path.exists(os.path.join(tmpdir, "a.txt"))
+        with open(os.path.join(tmpdir, "txt", "a.txt")) as fp:
+            assert fp.read() == "dummy content"
+
+
+def test_cross_device_batch_deletes_sources_after_sync():
+    """Ensure copied sources are deleted only after the batch is durable."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        create_temp_files(tmpdir, [f"f{i}.txt" for i in range(5)] + ["g.pdf"])
+        organizer = FileOrganizer(tmpdir, batch_size=10)
+        synced = []
+
+        def record_sync(paths):
+            paths = sorted(paths)
+            # Every source still exists while its copy is being flushed.
+            assert all(
+                os.path.exists(os.path.join(tmpdir, os.path.basename(path)))
+                for path in paths
+            )
+            synced.append(paths)
+
+        with (
+            patch.object(organizer, "_device_of", return_value=-1),
+            patch(
+                "file_organizer.file_organizer.make_durable", side_effect=record_sync
+            ),
+        ):
+            summary = organizer.organize()
+
+        assert summary.copied == 6
+        assert len(synced) == 1
+        assert len(synced[0]) == 6
+        assert sorted(os.listdir(tmpdir)) == [STATE_DIR, "pdf", "txt"]
+
+
+def test_cross_device_undo_and_link_fallback_sync_once_per_batch():
+    """Ensure undo and refused hard links copy in batches, not file by file."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        create_temp_files(tmpdir, [f"f{i}.txt" for i in range(5)])
+        create_duplicates(tmpdir)
+        before = snapshot(tmpdir)
+        organizer = FileOrganizer(tmpdir, dedupe="hardlink", batch_size=20)
+
+        with (
+            patch.object(organizer, "_device_of", return_value=-1),
+            patch("file_organizer.file_organizer.os.link", side_effect=OSError),
+            patch("file_organizer.file_organizer.make_durable") as durable,
+        ):
+            moved = organizer.organize()
+            restored = organizer.undo()
+
+        assert moved.copied == restored.copied == 8
+        # Forward: the moves, then the refused link; undo: a single batch.
+        assert durable.call_count == 3
+        assert snapshot(tmpdir) == before
+
+
+def test_target_directory_created_once():
+    """Ensure each extension directory is created only once per run."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        create_temp_files(tmpdir, [f"f{i}.txt" for i in range(20)])
+
+        with patch(
+            "file_organizer.file_organizer.os.makedirs", wraps=os.makedirs
+        ) as makedirs:
+            FileOrganizer(tmpdir).organize()
+
+        created = [call.args[0] for call in makedirs.call_args_list]
+        assert created.count(os.path.join(tmpdir, "txt")) == 1
+
+
+# ============================================================
+# Journal / resume / undo tests
+# ============================================================
+
+
+def snapshot(base_dir):
+    """Return the relative paths of all files outside the state directory."""
+    found = set()
+    for dirpath, dirnames, filenames in os.walk(base_dir):
+        if STATE_DIR in dirnames:
+            dirnames.remove(STATE_DIR)
+        for name in filenames:
+            found.add(os.path.relpath(os.path.join(dirpath, name), base_dir))
+    return found
+
+
+def test_plan_does_not_touch_disk():
+    """Ensure plan() only reports moves."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        create_temp_files(tmpdir, ["a.txt", "b.jpg"])
+
+        planned = sorted((op.src, op.dst) for op in FileOrganizer(tmpdir).plan())
+
+        assert planned == [
+            (os.path.join(tmpdir, "a.txt"), os.path.join(tmpdir, "txt", "a.txt")),
+            (os.path.join(tmpdir, "b.jpg"), os.path.join(tmpdir, "jpg", "b.jpg")),
+        ]
+        assert sorted(os.listdir(tmpdir)) == ["a.txt", "b.jpg"]
+
+
+def test_resume_after_interruption():
+    """Ensure an interrupted run continues from its last checkpoint."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        create_temp_files(tmpdir, [f"f{i:02}.txt" for i in range(10)])
+        organizer = FileOrganizer(tmpdir, batch_size=3)
+        real_rename = organizer._rename
+        calls = []
+
+        def crash_on_fifth(src, dst):
+            calls.append(src)
+            if len(calls) == 5:
+                raise KeyboardInterrupt
+            return real_rename(src, dst)
+
+        with patch.object(organizer, "_rename", side_effect=crash_on_fifth):
+            with pytest.raises(KeyboardInterrupt):
+                organizer.organize()
+
+        assert organizer.journal.read_checkpoint()[0] == 3
+        with pytest.raises(JournalError):
+            organizer.organize()
+
+        summary = FileOrganizer(tmpdir, batch_size=3).resume()
+
+        # The fourth file was moved before the crash and is not moved again.
+        assert len(summary.moves) == 6
+        assert len(os.listdir(os.path.join(tmpdir, "txt"))) == 10
+        with pytest.raises(JournalError):
+            organizer.resume()
+
+
+def test_undo_restores_original_layout():
+    """Ensure undo moves files back and removes the created folders."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        create_nested_tree(tmpdir)
+        before = snapshot(tmpdir)
+
+        organizer = FileOrganizer(tmpdir, recursive=True, workers=2)
+        moved = organizer.organize()
+        restored = organizer.undo()
+
+        assert snapshot(tmpdir) == before
+        assert len(restored.moves) == len(moved.moves)
+        assert sorted(os.listdir(tmpdir)) == ["a", "root.txt"]
+
+
+def test_journal_stores_paths_relative_to_directory():
+    """Ensure journaled paths are relative, however the directory is spelled."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        create_nested_tree(tmpdir)
+        organizer = FileOrganizer(tmpdir + os.sep, recursive=True)
+        organizer.organize()
+
+        ops = list(organizer.journal.read_ops_reversed())
+        assert ("root.txt", os.path.join("txt", "root.txt")) in [
+            (op.src, op.dst) for op in ops
+        ]
+        assert not any(os.path.isabs(op.src) or os.path.isabs(op.dst) for op in ops)
+        organizer.undo()
+        assert sorted(os.listdir(tmpdir)) == ["a", "root.txt"]
+
+
+def test_undo_restores_overwritten_target_once():
+    """Ensure a target written twice goes back only to its last source."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for sub in ("x", "y"):
+            os.makedirs(os.path.join(tmpdir, sub))
+            with open(os.path.join(tmpdir, sub, "same.txt"), "w") as fp:
+                fp.write(sub)
+        organizer = FileOrganizer(tmpdir, recursive=True, on_collision="overwrite")
+        organizer.organize()
+
+        restored = organizer.undo()
+
+        assert restored.moves == [
+            (
+                os.path.join(tmpdir, "txt", "same.txt"),
+                os.path.join(tmpdir, "y", "same.txt"),
+            )
+        ]
+        with open(os.path.join(tmpdir, "y", "same.txt")) as fp:
+            assert fp.read() == "y"
+        assert not os.path.exists(os.path.join(tmpdir, "txt"))
+
+
+def test_undo_without_journal():
+    """Ensure undo refuses to run when nothing was journaled."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with pytest.raises(JournalError):
+            FileOrganizer(tmpdir).undo()
+
+
+def test_recursive_skips_state_directory():
+    """Ensure the journal is never organized along with user files."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        create_temp_files(tmpdir, ["a.txt"])
+        organizer = FileOrganizer(tmpdir, recursive=True)
+        organizer.organize()
+        create_temp_files(tmpdir, ["b.txt"])
+
+        organizer.organize()
+
+        assert organizer.journal.exists()
+        assert not os.path.isdir(os.path.join(tmpdir, "jsonl"))
+
+
+# ============================================================
+# Content-based classification tests
+# ============================================================
+
+
+def test_by_content_classifies_unlabeled_files():
+    """Ensure --by-content routes files by their magic bytes."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with open(os.path.join(tmpdir, "scan"), "wb") as fp:
+            fp.write(b"%PDF-1.4 body")
+        with open(os.path.join(tmpdir, "holiday.txt"), "wb") as fp:
+            fp.write(b"\xff\xd8\xff\xe0 jpeg body")
+        create_temp_files(tmpdir, ["notes.txt"])
+
+        FileOrganizer(tmpdir, by_content=True).organize()
+
+        assert os.path.isfile(os.path.join(tmpdir, "pdf", "scan"))
+        assert os.path.isfile(os.path.join(tmpdir, "jpg", "holiday.txt"))
+        assert os.path.isfile(os.path.join(tmpdir, "txt", "notes.txt"))
+        assert os.path.isfile(os.path.join(tmpdir, STATE_DIR, "sniff_cache.json"))
+
+
+# ============================================================
+# Dedupe tests
+# ============================================================
+
+
+def create_duplicates(base_dir):
+    """Create two identical files and one unique file."""
+    for name, data in (("a.txt", "same"), ("b.txt", "same"), ("c.txt", "other")):
+        with open(os.path.join(base_dir, name), "w") as fp:
+            fp.write(data)
+
+
+def test_dedupe_skip_leaves_duplicates_in_place():
+    """Ensure skipped duplicates are not moved."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        create_duplicates(tmpdir)
+
+        summary = FileOrganizer(tmpdir, dedupe="skip").organize()
+
+        assert sorted(os.listdir(os.path.join(tmpdir, "txt"))) == ["a.txt", "c.txt"]
+        assert os.path.isfile(os.path.join(tmpdir, "b.txt"))
+        assert summary.duplicates == [
+            [os.path.join(tmpdir, "a.txt"), os.path.join(tmpdir, "b.txt")]
+        ]
+
+
+def test_dedupe_hardlink_shares_inode():
+    """Ensure hard linked duplicates point at the kept file."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        create_duplicates(tmpdir)
+
+        summary = FileOrganizer(tmpdir, dedupe="hardlink", workers=2).organize()
+
+        kept = os.stat(os.path.join(tmpdir, "txt", "a.txt"))
+        linked = os.stat(os.path.join(tmpdir, "txt", "b.txt"))
+        assert kept.st_ino == linked.st_ino
+        assert summary.linked == 1
+        assert summary.renamed == 2
+
+
+def test_dedupe_hardlink_undo_restores_independent_files():
+    """Ensure undoing a hard link restores a separate copy."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        create_duplicates(tmpdir)
+        organizer = FileOrganizer(tmpdir, dedupe="hardlink")
+        organizer.organize()
+
+        organizer.undo()
+
+        assert sorted(os.listdir(tmpdir)) == ["a.txt", "b.txt", "c.txt"]
+        a = os.stat(os.path.join(tmpdir, "a.txt"))
+        b = os.stat(os.path.join(tmpdir, "b.txt"))
+        assert a.st_ino != b.st_ino
+
+
+def test_dedupe_prefers_file_already_in_place():
+    """Ensure a new copy of an organized file is the one treated as duplicate."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.makedirs(os.path.join(tmpdir, "txt"))
+        with open(os.path.join(tmpdir, "txt", "z.txt"), "w") as fp:
+            fp.write("same")
+        with open(os.path.join(tmpdir, "a.txt"), "w") as fp:
+            fp.write("same")
+
+        summary = FileOrganizer(tmpdir, recursive=True, dedupe="skip").organize()
+
+        assert summary.moves == []
+        assert summary.duplicates == [
+            [os.path.join(tmpdir, "txt", "z.txt"), os.path.join(tmpdir, "a.txt")]
+        ]
+
+
+def test_invalid_dedupe_policy():
+    """Ensure an unknown dedupe policy is rejected."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with pytest.raises(ValueError):
+            FileOrganizer(tmpdir, dedupe="delete")
+
+
+# ============================================================
+# Collision policy tests
+# ============================================================
+
+
+def create_collision(base_dir, count=2):
+    """Create ``count`` files called report.pdf in separate subfolders."""
+    for i in range(count):
+        sub = os.path.join(base_dir, f"drop{i}")
+        os.makedirs(sub)
+        with open(os.path.join(sub, "report.pdf"), "w") as fp:
+            fp.write(f"copy {i}")
+
+
+def test_collision_rename_is_default():
+    """Ensure colliding names get a numbered suffix instead of overwriting."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        create_collision(tmpdir, count=3)
+
+        FileOrganizer(tmpdir, recursive=True).organize()
+
+        assert sorted(os.listdir(os.path.join(tmpdir, "pdf"))) == [
+            "report (1).pdf",
+            "report (2).pdf",
+            "report.pdf",
+        ]
+
+
+def test_collision_rename_continues_existing_numbering():
+    """Ensure names already on disk are taken into account."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.makedirs(os.path.join(tmpdir, "pdf"))
+        create_temp_files(os.path.join(tmpdir, "pdf"), ["report.pdf", "report (1).pdf"])
+        create_temp_files(tmpdir, ["report.pdf"])
+
+        summary = FileOrganizer(tmpdir).organize()
+
+        assert summary.moves == [
+            (
+                os.path.join(tmpdir, "report.pdf"),
+                os.path.join(tmpdir, "pdf", "report (2).pdf"),
+            )
+        ]
+
+
+def test_collision_skip_leaves_file():
+    """Ensure the skip policy keeps the existing file and the new one."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        create_collision(tmpdir)
+
+        summary = FileOrganizer(tmpdir, recursive=True, on_collision="skip").organize()
+
+        assert os.listdir(os.path.join(tmpdir, "pdf")) == ["report.pdf"]
+        assert summary.skipped == [os.path.join(tmpdir, "drop1", "report.pdf")]
+
+
+def test_file_named_like_target_folder_is_skipped():
+    """Ensure a file named like a target folder does not stop planning."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        create_temp_files(tmpdir, ["a.txt", "txt"])
+
+        summary = FileOrganizer(tmpdir).organize()
+
+        assert summary.blocked == [os.path.join(tmpdir, "a.txt")]
+        assert summary.skipped == []
+        assert os.path.isfile(os.path.join(tmpdir, "no_extension", "txt"))
+        # With the file out of the way, the next run places a.txt.
+        FileOrganizer(tmpdir).organize()
+        assert os.path.isfile(os.path.join(tmpdir, "txt", "a.txt"))
+
+
+def test_collision_hash_suffix():
+    """Ensure the hash-suffix policy appends a content digest."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        create_collision(tmpdir)
+
+        FileOrganizer(tmpdir, recursive=True, on_collision="hash-suffix").organize()
+
+        names = sorted(os.listdir(os.path.join(tmpdir, "pdf")))
+        assert names[1] == "report.pdf"
+        assert names[0].startswith("report-") and names[0].endswith(".pdf")
+        assert len(names[0]) == len("report-.pdf") + 8
+
+
+def test_collision_index_lists_each_directory_once():
+    """Ensure picking free names does not probe the filesystem per file."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        create_collision(tmpdir, count=30)
+
+        with patch("file_organizer.naming.os.scandir", wraps=os.scandir) as scandir:
+            FileOrganizer(tmpdir, recursive=True).organize()
+
+        listed = [call.args[0] for call in scandir.call_args_list]
+        assert listed.count(os.path.join(tmpdir, "pdf")) == 1
+        assert len(os.listdir(os.path.join(tmpdir, "pdf"))) == 30
+
+
+def test_invalid_collision_policy():
+    """Ensure an unknown collision policy is rejected."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with pytest.raises(ValueError):
+            FileOrganizer(tmpdir, on_collision="ask")
+
+
+# ============================================================
+# Rule tests
+# ============================================================
+
+
+def write_rules(base_dir, rules):
+    """Write a JSON rules file next to (not inside) the organized directory."""
+    path = base_dir + ".rules.json"
+    with open(path, "w") as f:
+        json.dump({"rules": rules}, f)
+    return path
+
+
+def test_rules_take_precedence_over_extension():
+    """Ensure matching rules pick the folder and the rest fall back."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        create_temp_files(tmpdir, ["INV-1.pdf", "paper.pdf", "old.log"])
+        old = datetime.datetime(2020, 6, 1).timestamp()
+        os.utime(os.path.join(tmpdir, "old.log"), (old, old))
+        rules = RuleSet(
+            [
+                {"regex": "^INV-", "dest": "invoices"},
+                {"modified_before": "2024-01-01", "dest": "old/{year}"},
+            ]
+        )
+
+        FileOrganizer(tmpdir, rules=rules).organize()
+
+        assert os.path.isfile(os.path.join(tmpdir, "invoices", "INV-1.pdf"))
+        assert os.path.isfile(os.path.join(tmpdir, "pdf", "paper.pdf"))
+        assert os.path.isfile(os.path.join(tmpdir, "old", "2020", "old.log"))
+
+
+def test_rules_recursive_is_idempotent():
+    """Ensure files already in their rule folder stay put on a second run."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        create_temp_files(tmpdir, ["INV-1.pdf"])
+        rules = RuleSet([{"glob": "INV-*", "dest": "finance/invoices"}])
+
+        FileOrganizer(tmpdir, recursive=True, rules=rules).organize()
+        summary = FileOrganizer(tmpdir, recursive=True, rules=rules).organize()
+
+        assert summary.moves == []
+        assert os.path.isfile(os.path.join(tmpdir, "finance", "invoices", "INV-1.pdf"))
+
+
+# ============================================================
+# Output tests
+# ============================================================
+
+
+def test_organize_does_not_print(capsys):
+    """Ensure the Python API returns results instead of printing them."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        create_temp_files(tmpdir, ["a.txt", "b.pdf"])
+
+        summary = FileOrganizer(tmpdir).organize()
+
+        assert capsys.readouterr().out == ""
+        assert len(summary.moves) == 2
+        assert summary.elapsed > 0
+
+
+def test_reporter_receives_every_move():
+    """Ensure the reporter is told the total and sees each applied move."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        create_temp_files(tmpdir, ["a.txt", "b.pdf", "c.pdf"])
+        reporter = Reporter()
+
+        with (
+            patch.object(reporter, "start") as start,
+            patch.object(reporter, "moved") as moved,
+        ):
+            FileOrganizer(tmpdir, workers=2, batch_size=2, reporter=reporter).organize()
+
+        start.assert_called_once_with(3)
+        assert sorted(call.args[0] for call in moved.call_args_list) == [
+            os.path.join(tmpdir, name) for name in ("a.txt", "b.pdf", "c.pdf")
+        ]
+
+
+# ============================================================
+# Index tests
+# ============================================================
+
+
+def test_index_skips_placed_files_without_classifying():
+    """Ensure files an earlier run placed are not sniffed or moved again."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        create_temp_files(tmpdir, ["a.txt", "b.pdf"])
+        FileOrganizer(tmpdir, recursive=True, index=True).organize()
+        create_temp_files(tmpdir, ["c.txt"])
+        organizer = FileOrganizer(tmpdir, recursive=True, by_content=True, index=True)
+
+        with patch.object(
+            organizer.sniffer, "classify", wraps=organizer.sniffer.classify
+        ) as classify:
+            summary = organizer.organize()
+
+        assert [call.args[0].name for call in classify.call_args_list] == ["c.txt"]
+        assert summary.moves == [
+            (os.path.join(tmpdir, "c.txt"), os.path.join(tmpdir, "txt", "c.txt"))
+        ]
+        assert len(organizer.index.where("*")) == 3
+
+
+def test_index_forgets_undone_moves():
+    """Ensure undo removes the restored files from the index."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        create_temp_files(tmpdir, ["a.txt", "b.pdf"])
+        organizer = FileOrganizer(tmpdir, index=True)
+        organizer.organize()
+
+        organizer.undo()
+
+        assert organizer.index.where("*") == []
+        assert sorted(os.listdir(tmpdir)) == [STATE_DIR, "a.txt", "b.pdf"]
+
+
+def test_index_records_hash_suffix_digest():
+    """Ensure digests computed for collisions are stored in the index."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        create_collision(tmpdir)
+        organizer = FileOrganizer(
+            tmpdir, recursive=True, on_collision="hash-suffix", index=True
+        )
+        organizer.organize()
+
+        hashes = [move.hash for move in organizer.index.where("report*")]
+        assert len([value for value in hashes if value]) == 1
+
+
+def test_index_records_dedupe_digest():
+    """Ensure digests computed by duplicate detection are stored in the index."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        create_temp_files(tmpdir, ["a.txt", "b.txt"])
+        with open(os.path.join(tmpdir, "c.pdf"), "w") as fp:
+            fp.write("unique")
+        organizer = FileOrganizer(tmpdir, dedupe="report", index=True)
+        organizer.organize()
+
+        hashes = {move.dst: move.hash for move in organizer.index.where("*")}
+        assert (
+            hashes[os.path.join("txt", "a.txt")] == hashes[os.path.join("txt", "b.txt")]
+        )
+        assert hashes[os.path.join("txt", "a.txt")] is not None
+        assert hashes[os.path.join("pdf", "c.pdf")] is None
+
+
 # ============================================================
 # CLI tests
 # ============================================================
@@ -166,7 +908,7 @@ def test_cli_invocation(capsys):
 
         with patch(
             "argparse.ArgumentParser.parse_args",
-            return_value=argparse.Namespace(directory=tmpdir),
+            return_value=build_parser().parse_args([tmpdir]),
         ):
             from file_organizer.file_organizer import main
 
@@ -174,3 +916,222 @@ def test_cli_invocation(capsys):
 
         captured = capsys.readouterr()
         assert "Moved:" in captured.out
+        assert "Organized 1 files (1 renamed" in captured.out
+
+
+def test_cli_recursive_with_workers(capsys):
+    """Test CLI with --recursive and --workers options."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        create_nested_tree(tmpdir)
+
+        from file_organizer.file_organizer import main
+
+        main([tmpdir, "--recursive", "--workers", "3"])
+
+        assert os.path.isfile(os.path.join(tmpdir, "zip", "deep.zip"))
+        captured = capsys.readouterr()
+        assert "Moved: deep.zip" in captured.out
+
+
+def test_cli_dry_run(capsys):
+    """Test CLI --dry-run prints the plan and leaves files in place."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        create_temp_files(tmpdir, ["a.txt"])
+
+        from file_organizer.file_organizer import main
+
+        main([tmpdir, "--dry-run"])
+
+        captured = capsys.readouterr()
+        assert "Would move:" in captured.out
+        assert os.listdir(tmpdir) == ["a.txt"]
+
+
+def test_cli_undo(capsys):
+    """Test CLI --undo restores files moved by the previous run."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        create_temp_files(tmpdir, ["a.txt"])
+
+        from file_organizer.file_organizer import main
+
+        main([tmpdir])
+        main([tmpdir, "--undo"])
+
+        captured = capsys.readouterr()
+        assert "Restored 1 files" in captured.out
+        assert os.listdir(tmpdir) == ["a.txt"]
+
+
+def test_cli_resume_without_journal():
+    """Test CLI --resume exits with an error when there is nothing to resume."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        from file_organizer.file_organizer import main
+
+        with pytest.raises(SystemExit):
+            main([tmpdir, "--resume"])
+
+
+def test_cli_dedupe_report(capsys):
+    """Test CLI --dedupe report moves everything and lists duplicates."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        create_duplicates(tmpdir)
+
+        from file_organizer.file_organizer import main
+
+        main([tmpdir, "--dedupe", "report"])
+
+        captured = capsys.readouterr()
+        assert "Duplicate: " in captured.out
+        assert "Found 1 duplicates in 1 groups" in captured.out
+        assert len(os.listdir(os.path.join(tmpdir, "txt"))) == 3
+
+
+def test_cli_rules(capsys):
+    """Test CLI --rules loads a rules file."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        create_temp_files(tmpdir, ["a.log", "b.txt"])
+        path = write_rules(tmpdir, [{"glob": "*.log", "dest": "logs"}])
+
+        from file_organizer.file_organizer import main
+
+        try:
+            main([tmpdir, "--rules", path])
+        finally:
+            os.remove(path)
+
+        assert os.path.isfile(os.path.join(tmpdir, "logs", "a.log"))
+        assert os.path.isfile(os.path.join(tmpdir, "txt", "b.txt"))
+
+
+def test_cli_invalid_rules():
+    """Test CLI --rules exits with an error for a malformed rules file."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = write_rules(tmpdir, [{"glob": "*.log"}])
+
+        from file_organizer.file_organizer import main
+
+        try:
+            with pytest.raises(SystemExit):
+                main([tmpdir, "--rules", path])
+        finally:
+            os.remove(path)
+
+
+def test_cli_quiet(capsys):
+    """Test CLI --quiet prints nothing."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        create_temp_files(tmpdir, ["a.txt"])
+
+        from file_organizer.file_organizer import main
+
+        main([tmpdir, "--quiet"])
+
+        captured = capsys.readouterr()
+        assert captured.out == ""
+        assert captured.err == ""
+        assert os.path.isfile(os.path.join(tmpdir, "txt", "a.txt"))
+
+
+def test_cli_json_lines(capsys):
+    """Test CLI --json-lines prints one object per move and a summary."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        create_temp_files(tmpdir, ["a.txt", "b.txt", "c.pdf"])
+
+        from file_organizer.file_organizer import main
+
+        main([tmpdir, "--json-lines"])
+
+        records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert [record["action"] for record in records[:3]] == ["renamed"] * 3
+        assert records[3]["summary"]["extensions"] == {"txt": 2, "pdf": 1}
+
+
+def test_cli_progress(capsys):
+    """Test CLI --progress draws a progress line instead of per-file lines."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        create_temp_files(tmpdir, ["a.txt", "b.pdf"])
+
+        from file_organizer.file_organizer import main
+
+        main([tmpdir, "--progress"])
+
+        captured = capsys.readouterr()
+        assert "Moved:" not in captured.out
+        assert "Organized 2 files" in captured.out
+        assert "2/2 files" in captured.err
+
+
+def test_cli_where(capsys):
+    """Test CLI --where finds indexed files by name."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        create_temp_files(tmpdir, ["a.txt", "b.pdf"])
+
+        from file_organizer.file_organizer import main
+
+        main([tmpdir, "--index", "--quiet"])
+        main([tmpdir, "--where", "b.pdf"])
+        main([tmpdir, "--where", "missing.txt"])
+
+        captured = capsys.readouterr()
+        assert f"b.pdf -> {os.path.join('pdf', 'b.pdf')} (13 bytes" in captured.out
+        assert "No indexed file matches missing.txt" in captured.out
+
+
+def test_cli_where_without_index():
+    """Test CLI --where exits with an error when nothing was indexed."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        from file_organizer.file_organizer import main
+
+        with pytest.raises(SystemExit):
+            main([tmpdir, "--where", "a.txt"])
+
+
+def test_cli_multiple_roots(capsys):
+    """Test CLI with several directories prints each root and a total."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        roots = []
+        for name in ("one", "two"):
+            roots.append(os.path.join(tmpdir, name))
+            os.makedirs(roots[-1])
+            create_temp_files(roots[-1], ["a.txt"])
+        listing = os.path.join(tmpdir, "roots.txt")
+        with open(listing, "w") as f:
+            f.write(f"# uploads\n{roots[1]}\n\n")
+
+        from file_organizer.file_organizer import main
+
+        main([roots[0], "--roots-from", listing])
+
+        captured = capsys.readouterr()
+        for root in roots:
+            assert f"{root}: Organized 1 files" in captured.out
+            assert os.path.isfile(os.path.join(root, "txt", "a.txt"))
+        assert "\nOrganized 2 files" in captured.out
+
+
+def test_cli_multiple_roots_with_failure(capsys):
+    """Test CLI exits with an error when one of several roots fails."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        create_temp_files(tmpdir, ["a.txt"])
+        missing = os.path.join(tmpdir, "missing")
+
+        from file_organizer.file_organizer import main
+
+        with pytest.raises(SystemExit) as exc:
+            main([tmpdir, missing])
+
+        assert "1 of 2 directories failed" in str(exc.value)
+        captured = capsys.readouterr()
+        assert f"{missing}: Failed: ValueError" in captured.out
+        assert os.path.isfile(os.path.join(tmpdir, "txt", "a.txt"))
+
+
+def test_cli_multiple_roots_single_directory_modes():
+    """Test CLI rejects several directories for --dry-run."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        from file_organizer.file_organizer import main
+
+        with pytest.raises(SystemExit):
+            main([tmpdir, tmpdir, "--dry-run"])
+        with pytest.raises(SystemExit):
+            main([])
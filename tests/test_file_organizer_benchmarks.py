@@ -0,0 +1,90 @@
+"""
+Smoke test for the FileOrganizer benchmark suite.
+
+This module tests:
+- Synthetic tree generation
+- A tiny benchmark run writing JSON results
+- Regression detection against a baseline
+"""
+
+import os
+import sys
+import json
+import tempfile
+
+# Benchmarks are scripts, not part of the package; cases run in worker
+# processes, which must be able to import the module by name.
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+
+import bench_file_organizer as bench  # noqa: E402
+
+
+def test_generate_tree_shape():
+    """Ensure generated trees have the requested file count and depth."""
+    case = bench.Case(200, "mixed", "mixed", 2, "disk", "default")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        bench.generate_tree(tmpdir, case, 200, seed=1)
+
+        files = [
+            os.path.join(path, name)
+            for path, _, names in os.walk(tmpdir)
+            for name in names
+        ]
+        depths = {os.path.relpath(path, tmpdir).count(os.sep) for path in files}
+
+    assert len(files) == 200
+    assert depths == {0, 1, 2}
+
+
+def test_benchmark_run_writes_results():
+    """Ensure a tiny run reports throughput, syscalls and memory as JSON."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output = os.path.join(tmpdir, "results.json")
+        argv = ["--files", "100", "--syscall-sample", "50", "--base", tmpdir]
+        argv += ["--modes", "default", "rules", "--output", output]
+
+        assert bench.main(argv) == 0
+
+        with open(output) as f:
+            report = json.load(f)
+        leftovers = [name for name in os.listdir(tmpdir) if name != "results.json"]
+
+    assert report["benchmark"] == "file_organizer"
+    assert [result["case"]["mode"] for result in report["results"]] == [
+        "default",
+        "rules",
+    ]
+    for result in report["results"]:
+        assert result["moved"] == 100
+        assert result["files_per_sec"] > 0
+        assert result["syscalls_per_file"] > 0
+        assert result["peak_rss_kib"] > 0
+    assert leftovers == []
+
+
+def test_compare_flags_regressions():
+    """Ensure cases slower than the tolerance are reported."""
+    case = {
+        "files": 10,
+        "extensions": "uniform",
+        "sizes": "small",
+        "depth": 0,
+        "location": "disk",
+        "mode": "default",
+    }
+    baseline = {"results": [{"case": case, "files_per_sec": 1000.0}]}
+
+    assert (
+        bench.compare(
+            [{"case": case, "files_per_sec": 950.0}], baseline, 0.1, "files_per_sec"
+        )
+        == []
+    )
+    assert (
+        len(
+            bench.compare(
+                [{"case": case, "files_per_sec": 800.0}], baseline, 0.1, "files_per_sec"
+            )
+        )
+        == 1
+    )
@@ -0,0 +1,120 @@
+"""
+Test suite for duplicate file detection.
+
+This module tests:
+- Grouping by size, edge blocks and full content
+- Files that only differ in the middle
+- Empty and unreadable files
+- Content digests handed back to the caller
+"""
+
+import os
+import tempfile
+from unittest.mock import patch
+
+from file_organizer.dedupe import EDGE_BLOCK_SIZE, find_duplicates, full_digest
+
+
+def write_files(base_dir, contents):
+    """Write ``{name: bytes}`` and return ``(path, size)`` pairs."""
+    files = []
+    for name, data in contents.items():
+        path = os.path.join(base_dir, name)
+        with open(path, "wb") as fp:
+            fp.write(data)
+        files.append((path, len(data)))
+    return files
+
+
+def test_identical_files_are_grouped():
+    """Ensure identical files form one sorted group."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        files = write_files(
+            tmpdir, {"b.txt": b"same", "a.txt": b"same", "c.txt": b"diff"}
+        )
+
+        groups = find_duplicates(files)
+
+        assert groups == [
+            [os.path.join(tmpdir, "a.txt"), os.path.join(tmpdir, "b.txt")]
+        ]
+
+
+def test_files_differing_in_the_middle_are_not_grouped():
+    """Ensure matching edge blocks are confirmed by a full hash."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        edge = b"x" * EDGE_BLOCK_SIZE
+        files = write_files(
+            tmpdir,
+            {
+                "one.bin": edge + b"A" * 100 + edge,
+                "two.bin": edge + b"B" * 100 + edge,
+                "three.bin": edge + b"A" * 100 + edge,
+            },
+        )
+
+        groups = find_duplicates(files, workers=3)
+
+        assert groups == [
+            [os.path.join(tmpdir, "one.bin"), os.path.join(tmpdir, "three.bin")]
+        ]
+
+
+def test_small_files_skip_full_hash():
+    """Ensure files covered by the edge blocks are never fully hashed."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        files = write_files(tmpdir, {"a": b"12345", "b": b"12345"})
+
+        with patch("file_organizer.dedupe.full_digest") as full_digest:
+            groups = find_duplicates(files)
+
+        full_digest.assert_not_called()
+        assert len(groups) == 1
+
+
+def test_unique_sizes_are_never_read():
+    """Ensure files with a unique size are not opened at all."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        files = write_files(tmpdir, {"a": b"1", "b": b"22", "c": b"333"})
+
+        with patch("file_organizer.dedupe.edge_digest") as edge_digest:
+            assert find_duplicates(files) == []
+
+        edge_digest.assert_not_called()
+
+
+def test_empty_and_missing_files_are_ignored():
+    """Ensure empty files and files that cannot be read are never reported."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        files = write_files(tmpdir, {"e1": b"", "e2": b"", "real": b"data"})
+        files.append((os.path.join(tmpdir, "gone"), 4))
+
+        assert find_duplicates(files) == []
+
+
+def test_whole_file_digests_are_returned():
+    """Ensure full-content digests are handed back, but edge-only ones are not."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        edge = b"x" * EDGE_BLOCK_SIZE
+        files = write_files(
+            tmpdir,
+            {
+                "small1": b"12345",
+                "small2": b"12345",
+                "small3": b"54321",
+                "big1": edge + b"A" + edge,
+                "big2": edge + b"A" + edge,
+                "other": b"y" * (2 * EDGE_BLOCK_SIZE + 1),
+                "lonely": b"1",
+            },
+        )
+        digests = {}
+
+        find_duplicates(files, digests=digests)
+
+        expected = {
+            path: full_digest(path, size).hex()
+            for path, size in files
+            if os.path.basename(path) not in ("lonely", "other")
+        }
+        assert digests == expected
@@ -0,0 +1,116 @@
+"""
+Test suite for the SQLite move index.
+
+This module tests:
+- Recording moves in one transaction per batch
+- Recognizing files a previous run placed
+- Name and glob lookups
+- Forgetting undone moves
+"""
+
+import os
+import tempfile
+
+from file_organizer.index import MoveIndex
+
+
+def setup_moved(tmpdir, names, folder="txt"):
+    """Create files as if they had been moved into ``folder``."""
+    os.makedirs(os.path.join(tmpdir, folder), exist_ok=True)
+    moves = []
+    for name in names:
+        dst = os.path.join(tmpdir, folder, name)
+        with open(dst, "w") as f:
+            f.write("content")
+        moves.append((os.path.join(tmpdir, name), dst))
+    return moves
+
+
+def entries_of(directory):
+    with os.scandir(directory) as it:
+        return {entry.name: entry for entry in it}
+
+
+# ============================================================================
+# Recording and lookups
+# ============================================================================
+
+
+def test_add_and_where():
+    """Ensure recorded moves can be found by original or new name."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        index = MoveIndex(os.path.join(tmpdir, "state", "index.sqlite3"), tmpdir)
+        moves = setup_moved(tmpdir, ["a.txt", "b.txt"])
+
+        index.add(moves, {moves[0][0]: "abc123"})
+
+        [found] = index.where("a.txt")
+        assert found.src == "a.txt"
+        assert found.dst == os.path.join("txt", "a.txt")
+        assert found.size == len("content")
+        assert found.hash == "abc123"
+        assert [move.dst for move in index.where("*.txt")] == [
+            os.path.join("txt", "a.txt"),
+            os.path.join("txt", "b.txt"),
+        ]
+        assert index.where("c.txt") == []
+
+
+def test_missing_index_is_empty_and_not_created():
+    """Ensure lookups on a missing index do not create it."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "state", "index.sqlite3")
+        index = MoveIndex(path, tmpdir)
+        setup_moved(tmpdir, ["a.txt"])
+        entry = entries_of(os.path.join(tmpdir, "txt"))["a.txt"]
+
+        assert index.where("*") == []
+        assert not index.is_placed(entry)
+        assert not os.path.exists(path)
+
+
+def test_is_placed_matches_name_and_inode():
+    """Ensure only the very file that was moved counts as placed."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        index = MoveIndex(os.path.join(tmpdir, "index.sqlite3"), tmpdir)
+        moves = setup_moved(tmpdir, ["a.txt", "b.txt"])
+        index.add(moves, {})
+        # b.txt is replaced by a different file under the same name.
+        with open(os.path.join(tmpdir, "other"), "w") as f:
+            f.write("new")
+        os.replace(os.path.join(tmpdir, "other"), os.path.join(tmpdir, "txt", "b.txt"))
+        with open(os.path.join(tmpdir, "txt", "c.txt"), "w") as f:
+            f.write("new")
+
+        entries = entries_of(os.path.join(tmpdir, "txt"))
+        fresh = MoveIndex(index.path, tmpdir)
+
+        assert fresh.is_placed(entries["a.txt"])
+        assert not fresh.is_placed(entries["b.txt"])
+        assert not fresh.is_placed(entries["c.txt"])
+
+
+def test_directory_rows_loaded_once():
+    """Ensure each directory is looked up in the database only once."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        index = MoveIndex(os.path.join(tmpdir, "index.sqlite3"), tmpdir)
+        index.add(setup_moved(tmpdir, [f"{i}.txt" for i in range(5)]), {})
+        fresh = MoveIndex(index.path, tmpdir)
+        queries = []
+        fresh._connect().set_trace_callback(queries.append)
+
+        for entry in entries_of(os.path.join(tmpdir, "txt")).values():
+            assert fresh.is_placed(entry)
+
+        assert len([query for query in queries if "dst_dir" in query]) == 1
+
+
+def test_forget_removes_rows():
+    """Ensure undone moves disappear from the index."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        index = MoveIndex(os.path.join(tmpdir, "index.sqlite3"), tmpdir)
+        index.add(setup_moved(tmpdir, ["a.txt", "b.txt"]), {})
+
+        index.forget([os.path.join("txt", "a.txt")])
+
+        assert [move.src for move in index.where("*")] == ["b.txt"]
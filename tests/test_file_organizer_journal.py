@@ -0,0 +1,116 @@
+"""
+Test suite for the File Organizer journal.
+
+This module tests:
+- Writing a plan and reading its operations back
+- Checkpoint persistence and pending-run detection
+- Reverse reading across block boundaries and torn last lines
+"""
+
+import os
+import tempfile
+from unittest.mock import patch
+
+from file_organizer.journal import Journal, Operation
+
+
+def write_journal(path, count):
+    """Write a complete journal with ``count`` operations."""
+    journal = Journal(path)
+    writer = journal.writer()
+    for i in range(count):
+        writer.append(Operation(f"f{i}.txt", os.path.join("txt", f"f{i}.txt")))
+    writer.close()
+    return journal
+
+
+def test_empty_plan_writes_nothing():
+    """Ensure a writer without operations does not create the journal."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        journal = Journal(os.path.join(tmpdir, "state", "journal.jsonl"))
+        journal.writer().close()
+
+        assert not journal.exists()
+        assert not os.path.exists(os.path.join(tmpdir, "state"))
+
+
+def test_read_ops_round_trip():
+    """Ensure operations are read back in order with increasing offsets."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        journal = write_journal(os.path.join(tmpdir, "journal.jsonl"), 3)
+
+        ops = list(journal.read_ops())
+
+        assert [op.src for op, _ in ops] == ["f0.txt", "f1.txt", "f2.txt"]
+        assert journal.total() == 3
+        offsets = [offset for _, offset in ops]
+        assert offsets == sorted(offsets)
+
+        resumed = list(journal.read_ops(offsets[0]))
+        assert [op.src for op, _ in resumed] == ["f1.txt", "f2.txt"]
+
+
+def test_checkpoint_marks_progress():
+    """Ensure pending detection follows the checkpoint."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        journal = write_journal(os.path.join(tmpdir, "journal.jsonl"), 2)
+        assert journal.is_pending()
+        assert journal.read_checkpoint() == (0, 0)
+
+        journal.write_checkpoint(2, 123)
+
+        assert journal.read_checkpoint() == (2, 123)
+        assert not journal.is_pending()
+
+
+def test_unfinished_plan_is_not_pending():
+    """Ensure a journal without an end marker is not considered resumable."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        journal = Journal(os.path.join(tmpdir, "journal.jsonl"))
+        writer = journal.writer()
+        writer.append(Operation("a.txt", "txt/a.txt"))
+        writer._file.write(b'{"src": "b.t')
+        writer._file.close()
+
+        assert journal.total() is None
+        assert not journal.is_pending()
+        assert list(journal.read_ops_reversed()) == [Operation("a.txt", "txt/a.txt")]
+
+
+def test_reversed_read_across_blocks():
+    """Ensure reverse reading is correct when lines span block boundaries."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        journal = write_journal(os.path.join(tmpdir, "journal.jsonl"), 50)
+
+        with patch("file_organizer.journal.READ_BLOCK_SIZE", 7):
+            ops = list(journal.read_ops_reversed())
+
+        assert [op.src for op in ops] == [f"f{i}.txt" for i in reversed(range(50))]
+
+
+def test_link_operations_round_trip():
+    """Ensure the hard link target of an operation is preserved."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        journal = Journal(os.path.join(tmpdir, "journal.jsonl"))
+        writer = journal.writer()
+        writer.append(Operation("a.txt", "txt/a.txt"))
+        writer.append(Operation("b.txt", "txt/b.txt", link="txt/a.txt"))
+        writer.close()
+
+        assert [op for op, _ in journal.read_ops()] == [
+            Operation("a.txt", "txt/a.txt"),
+            Operation("b.txt", "txt/b.txt", "txt/a.txt"),
+        ]
+
+
+def test_new_plan_replaces_previous_journal():
+    """Ensure starting a new plan clears the old journal and checkpoint."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "journal.jsonl")
+        journal = write_journal(path, 5)
+        journal.write_checkpoint(5, 0)
+
+        journal = write_journal(path, 1)
+
+        assert journal.total() == 1
+        assert journal.read_checkpoint() == (0, 0)
@@ -0,0 +1,63 @@
+"""
+Test suite for collision-free destination names.
+
+This module tests:
+- Claiming names against a directory listing
+- Target directories whose path is taken by a file
+- Numbered candidates and their running counter
+- Hash-suffixed names
+"""
+
+import os
+import tempfile
+
+from file_organizer.naming import NameIndex, hash_suffixed
+
+
+def test_claim_against_existing_listing():
+    """Ensure names on disk and names claimed earlier are both taken."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        open(os.path.join(tmpdir, "a.txt"), "w").close()
+        index = NameIndex()
+
+        assert not index.claim(tmpdir, "a.txt")
+        assert index.claim(tmpdir, "b.txt")
+        assert not index.claim(tmpdir, "b.txt")
+
+
+def test_claim_in_missing_directory():
+    """Ensure a directory that does not exist yet starts out empty."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        index = NameIndex()
+
+        assert index.claim(os.path.join(tmpdir, "new"), "a.txt")
+
+
+def test_file_in_place_of_directory_is_not_usable():
+    """Ensure a file named like the target directory blocks it without raising."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        open(os.path.join(tmpdir, "txt"), "w").close()
+        index = NameIndex()
+
+        assert not index.usable(os.path.join(tmpdir, "txt"))
+        assert not index.usable(os.path.join(tmpdir, "txt", "old"))
+        assert index.usable(os.path.join(tmpdir, "pdf"))
+        assert index.usable(tmpdir)
+
+
+def test_claim_numbered_skips_taken_numbers():
+    """Ensure numbered names skip existing ones and keep counting."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for name in ("report.pdf", "report (1).pdf", "report (3).pdf"):
+            open(os.path.join(tmpdir, name), "w").close()
+        index = NameIndex()
+
+        assert index.claim_numbered(tmpdir, "report.pdf") == "report (2).pdf"
+        assert index.claim_numbered(tmpdir, "report.pdf") == "report (4).pdf"
+        assert index.claim_numbered(tmpdir, ".env") == ".env (1)"
+
+
+def test_hash_suffixed():
+    """Ensure the digest goes before the extension."""
+    assert hash_suffixed("report.pdf", "abc123") == "report-abc123.pdf"
+    assert hash_suffixed("README", "abc123") == "README-abc123"
@@ -0,0 +1,178 @@
+"""
+Test suite for organize run output.
+
+This module tests:
+- Chunked writes through the buffered writer
+- Text, progress and JSON lines reporters
+- Summary lines with per-extension counts and elapsed time
+- Byte and duration formatting
+"""
+
+import io
+import os
+import json
+import tempfile
+from unittest.mock import patch
+
+from file_organizer.file_organizer import OrganizeSummary
+from file_organizer.journal import Operation
+from file_organizer.reporting import (
+    BufferedWriter,
+    JsonLinesReporter,
+    ProgressReporter,
+    TextReporter,
+    extension_counts,
+    format_bytes,
+    format_duration,
+    summary_lines,
+)
+
+
+class CountingStream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+def make_summary():
+    summary = OrganizeSummary(elapsed=1.5)
+    summary.record("/d/a.txt", "/d/txt/a.txt", "renamed")
+    summary.record("/d/b.txt", "/d/txt/b.txt", "renamed")
+    summary.record("/d/c.PDF", "/d/pdf/c.PDF", "copied")
+    summary.record("/d/README", "/d/no_extension/README", "renamed")
+    return summary
+
+
+# ============================================================================
+# Buffered writer
+# ============================================================================
+
+
+def test_buffered_writer_writes_in_chunks():
+    """Ensure many small writes reach the stream as a few large ones."""
+    stream = CountingStream()
+    out = BufferedWriter(stream)
+    with patch("file_organizer.reporting.FLUSH_SIZE", 100):
+        for _ in range(50):
+            out.write("0123456789\n")
+        out.flush()
+
+    assert stream.getvalue() == "0123456789\n" * 50
+    assert stream.writes == 5
+
+
+# ============================================================================
+# Reporters
+# ============================================================================
+
+
+def test_text_reporter_lines_and_summary():
+    """Ensure the text reporter prints one line per file and the summary."""
+    stream = io.StringIO()
+    reporter = TextReporter(stream)
+    reporter.moved("/d/a.txt", "/d/txt/a.txt", "renamed")
+    reporter.moved("/d/x.txt", "/d/txt/x.txt", "linked")
+    assert stream.getvalue() == ""
+
+    reporter.finish(make_summary(), "Organized")
+
+    lines = stream.getvalue().splitlines()
+    assert lines[0] == "Moved: a.txt -> /d/txt"
+    assert lines[1] == "Linked: x.txt -> /d/txt"
+    assert lines[2] == "Organized 4 files (3 renamed, 1 copied across devices) in 1.50s"
+    assert lines[3] == "By extension: txt 2, no_extension 1, pdf 1"
+
+
+def test_progress_reporter_throttles_redraws():
+    """Ensure the progress line is redrawn by time, not per file."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        dst = os.path.join(tmpdir, "a.txt")
+        with open(dst, "wb") as f:
+            f.write(b"x" * 1500)
+        stream, progress = io.StringIO(), io.StringIO()
+        reporter = ProgressReporter(stream, progress)
+
+        with patch("file_organizer.reporting.time.monotonic", return_value=10.0):
+            reporter.start(4)
+            for _ in range(3):
+                reporter.moved("a.txt", dst, "renamed")
+        assert progress.getvalue() == ""
+
+        with patch("file_organizer.reporting.time.monotonic", return_value=11.0):
+            reporter.moved("a.txt", dst, "renamed")
+            reporter.finish(make_summary(), "Organized")
+
+    assert progress.getvalue().count("\r") == 2
+    assert "4/4 files, 4 files/s, 6.0 KB moved" in progress.getvalue()
+    assert "Moved:" not in stream.getvalue()
+    assert stream.getvalue().startswith("Organized 4 files")
+
+
+def test_progress_reporter_eta():
+    """Ensure the ETA is derived from the rate so far."""
+    progress = io.StringIO()
+    reporter = ProgressReporter(io.StringIO(), progress)
+    with patch("file_organizer.reporting.time.monotonic", return_value=0.0):
+        reporter.start(30)
+    with patch("file_organizer.reporting.time.monotonic", return_value=0.1):
+        for _ in range(9):
+            reporter.moved("a", "/nonexistent/a", "renamed")
+    with patch("file_organizer.reporting.time.monotonic", return_value=1.0):
+        reporter.moved("a", "/nonexistent/a", "renamed")
+
+    assert "10/30 files, 10 files/s, 0 B moved, ETA 2.00s" in progress.getvalue()
+
+
+def test_json_lines_reporter():
+    """Ensure every operation and the summary are separate JSON objects."""
+    stream = io.StringIO()
+    reporter = JsonLinesReporter(stream)
+    reporter.planned(Operation("/d/a.txt", "/d/txt/a.txt"))
+    reporter.moved("/d/a.txt", "/d/txt/a.txt", "renamed")
+    reporter.finish(make_summary(), "Organized")
+
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert records[0] == {"action": "plan", "src": "/d/a.txt", "dst": "/d/txt/a.txt"}
+    assert records[1]["action"] == "renamed"
+    summary = records[2]["summary"]
+    assert summary["files"] == 4
+    assert summary["extensions"] == {"txt": 2, "no_extension": 1, "pdf": 1}
+    assert summary["elapsed"] == 1.5
+
+
+# ============================================================================
+# Formatting
+# ============================================================================
+
+
+def test_summary_lines_without_moves():
+    """Ensure an empty run has no per-extension line."""
+    lines = summary_lines(OrganizeSummary(), "Organized")
+
+    assert lines == ["Organized 0 files (0 renamed, 0 copied across devices) in 0.00s"]
+    assert extension_counts(OrganizeSummary()) == {}
+
+
+def test_summary_lines_count_skipped_and_blocked_files():
+    """Ensure taken names and blocked folders are reported separately."""
+    summary = OrganizeSummary(skipped=["/d/a.txt"], blocked=["/d/b.txt", "/d/c.txt"])
+
+    lines = summary_lines(summary, "Organized")
+
+    assert lines[-2:] == [
+        "Skipped 1 files whose name was already taken",
+        "Skipped 2 files whose target folder is a file",
+    ]
+
+
+def test_format_helpers():
+    """Ensure sizes and durations are shortened for display."""
+    assert format_bytes(999) == "999 B"
+    assert format_bytes(1_500_000) == "1.5 MB"
+    assert format_duration(0.25) == "0.25s"
+    assert format_duration(125) == "2m05s"
+    assert format_duration(3725) == "1h02m05s"
@@ -0,0 +1,149 @@
+"""
+Test suite for organizing several directories in parallel.
+
+This module tests:
+- Running roots on a process pool
+- Isolation of failing roots, including workers that die
+- Rules files loaded by the workers
+- Merging summaries
+"""
+
+import os
+import json
+import tempfile
+
+import pytest
+
+from file_organizer.file_organizer import OrganizeSummary
+from file_organizer.reporting import Reporter
+from file_organizer.roots import merge_summaries, organize_roots
+
+
+def create_roots(base_dir, count):
+    roots = []
+    for i in range(count):
+        root = os.path.join(base_dir, f"root{i}")
+        os.makedirs(root)
+        for name in (f"a{i}.txt", f"b{i}.pdf"):
+            with open(os.path.join(root, name), "w") as f:
+                f.write("content")
+        roots.append(root)
+    return roots
+
+
+class CrashingReporter(Reporter):
+    """Kill the worker process when it moves a file named ``crash.txt``."""
+
+    def moved(self, src, dst, method):
+        if os.path.basename(src) == "crash.txt":
+            os._exit(1)
+
+
+# ============================================================================
+# Process pool
+# ============================================================================
+
+
+def test_organize_roots_in_parallel():
+    """Ensure every root is organized by its own organizer."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        roots = create_roots(tmpdir, 3)
+
+        results = list(organize_roots(roots, processes=2))
+
+        assert sorted(result.directory for result in results) == roots
+        assert all(result.error is None for result in results)
+        assert all(len(result.summary.moves) == 2 for result in results)
+        for i, root in enumerate(roots):
+            assert os.path.isfile(os.path.join(root, "txt", f"a{i}.txt"))
+
+
+def test_failing_root_is_isolated():
+    """Ensure a broken root is reported while the others are organized."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        roots = create_roots(tmpdir, 2)
+        missing = os.path.join(tmpdir, "missing")
+
+        results = {
+            result.directory: result
+            for result in organize_roots(roots + [missing], processes=3)
+        }
+
+        assert "ValueError" in results[missing].error
+        assert results[missing].summary is None
+        assert all(results[root].error is None for root in roots)
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_dead_worker_only_fails_its_root(processes):
+    """Ensure a worker that exits abruptly takes no other root down with it."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        doomed = os.path.join(tmpdir, "doomed")
+        os.makedirs(doomed)
+        with open(os.path.join(doomed, "crash.txt"), "w") as f:
+            f.write("content")
+        roots = create_roots(tmpdir, 3)
+
+        results = {
+            result.directory: result
+            for result in organize_roots(
+                [doomed] + roots, processes=processes, reporter=CrashingReporter()
+            )
+        }
+
+        assert "BrokenProcessPool" in results[doomed].error
+        assert all(results[root].error is None for root in roots)
+        for i, root in enumerate(roots):
+            assert os.path.isfile(os.path.join(root, "txt", f"a{i}.txt"))
+
+
+def test_roots_resume_without_journal_fails_per_root():
+    """Ensure journal errors are returned for each root, not raised."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        roots = create_roots(tmpdir, 2)
+
+        results = list(organize_roots(roots, mode="resume"))
+
+        assert all("JournalError" in result.error for result in results)
+
+
+def test_roots_load_rules_in_workers():
+    """Ensure workers load the rules file themselves."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        roots = create_roots(tmpdir, 2)
+        rules = os.path.join(tmpdir, "rules.json")
+        with open(rules, "w") as f:
+            json.dump({"rules": [{"glob": "*.pdf", "dest": "documents"}]}, f)
+
+        list(organize_roots(roots, rules=rules, recursive=True))
+
+        assert os.path.isfile(os.path.join(roots[1], "documents", "b1.pdf"))
+
+
+def test_invalid_mode_and_processes():
+    """Ensure unknown modes and empty pools are rejected."""
+    with pytest.raises(ValueError):
+        list(organize_roots(["."], mode="watch"))
+    with pytest.raises(ValueError):
+        list(organize_roots(["."], processes=0))
+
+
+# ============================================================================
+# Summaries
+# ============================================================================
+
+
+def test_merge_summaries():
+    """Ensure counters add up and moves stay sorted."""
+    first, second = OrganizeSummary(), OrganizeSummary()
+    first.record("/b/x.txt", "/b/txt/x.txt", "renamed")
+    second.record("/a/y.txt", "/a/txt/y.txt", "copied")
+    second.skipped.append("/a/z.txt")
+    second.blocked.append("/a/y.txt")
+
+    merged = merge_summaries([first, second])
+
+    assert merged.moves == [("/a/y.txt", "/a/txt/y.txt"), ("/b/x.txt", "/b/txt/x.txt")]
+    assert (merged.renamed, merged.copied) == (1, 1)
+    assert merged.skipped == ["/a/z.txt"]
+    assert merged.blocked == ["/a/y.txt"]
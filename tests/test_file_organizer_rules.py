@@ -0,0 +1,244 @@
+"""
+Test suite for the rule engine.
+
+This module tests:
+- Glob, regex, size and date rules
+- First-match ordering and fallthrough on predicates
+- Dispatch table and combined prefilter, and patterns kept out of it
+- Lazy stat calls
+- Loading rules from JSON and TOML files
+- Rejection of invalid rules
+"""
+
+import os
+import json
+import tempfile
+import datetime
+from unittest.mock import Mock
+
+import pytest
+
+from file_organizer.rules import RuleSet, parse_size
+
+
+def entry_for(directory, name, size=0, mtime=None):
+    path = os.path.join(directory, name)
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    with os.scandir(directory) as it:
+        return next(entry for entry in it if entry.name == name)
+
+
+def ext_of(name):
+    return os.path.splitext(name)[1].lower().strip(".")
+
+
+# ============================================================================
+# Matching
+# ============================================================================
+
+
+def test_glob_with_min_size():
+    """Ensure a size predicate decides between matching and falling back."""
+    rules = RuleSet([{"glob": "*.log", "min_size": "1KB", "dest": "archive"}])
+    with tempfile.TemporaryDirectory() as tmpdir:
+        big = entry_for(tmpdir, "big.LOG", size=2000)
+        small = entry_for(tmpdir, "small.log", size=10)
+
+        assert rules.destination(big, "log") == "archive"
+        assert rules.destination(small, "log") is None
+
+
+def test_regex_is_searched_in_name():
+    """Ensure regex rules match anywhere in the name and are case-sensitive."""
+    rules = RuleSet([{"regex": r"INV-\d+", "dest": "invoices"}])
+    with tempfile.TemporaryDirectory() as tmpdir:
+        hit = entry_for(tmpdir, "2024 INV-17.pdf")
+        miss = entry_for(tmpdir, "inv-17.pdf")
+
+        assert rules.destination(hit, "pdf") == "invoices"
+        assert rules.destination(miss, "pdf") is None
+
+
+def test_modified_before_with_date_template():
+    """Ensure date rules use the mtime and fill in the template fields."""
+    mtime = datetime.datetime(2021, 3, 4, 12).timestamp()
+    rules = RuleSet(
+        [{"modified_before": "2024-01-01", "dest": "old/{year}/{month}-{ext}"}]
+    )
+    with tempfile.TemporaryDirectory() as tmpdir:
+        old = entry_for(tmpdir, "old.txt", mtime=mtime)
+        new = entry_for(tmpdir, "new.txt")
+        bare = entry_for(tmpdir, "README", mtime=mtime)
+
+        assert rules.destination(old, "txt") == "old/2021/03-txt"
+        assert rules.destination(new, "txt") is None
+        assert rules.destination(bare, "") == "old/2021/03-no_extension"
+
+
+def test_first_matching_rule_wins():
+    """Ensure rules are tried in file order, across match strategies."""
+    rules = RuleSet(
+        [
+            {"regex": "^report", "dest": "reports"},
+            {"glob": "*.pdf", "dest": "documents"},
+            {"dest": "everything-else"},
+        ]
+    )
+    with tempfile.TemporaryDirectory() as tmpdir:
+        names = ["report.pdf", "paper.pdf", "report.txt", "notes.txt"]
+        folders = [
+            rules.destination(entry_for(tmpdir, name), ext_of(name)) for name in names
+        ]
+
+    assert folders == ["reports", "documents", "reports", "everything-else"]
+
+
+def test_dispatch_table_and_prefilter():
+    """Ensure extension globs are dispatched and other patterns prefiltered."""
+    rules = RuleSet(
+        [
+            {"glob": "*.jpg", "dest": "photos"},
+            {"glob": "IMG_*", "dest": "camera"},
+            {"regex": "draft", "dest": "drafts"},
+            {"glob": "*.tar.gz", "dest": "archives"},
+        ]
+    )
+
+    assert set(rules._by_extension) == {".jpg"}
+    assert [rule.dest for rule in rules._patterned] == ["camera", "drafts", "archives"]
+    assert rules._prefilter.search("img_0001.png")
+    assert rules._prefilter.search("backup.TAR.GZ")
+    assert not rules._prefilter.search("notes.txt")
+    assert [rule.dest for rule in rules._candidates("IMG_1.jpg")] == [
+        "photos",
+        "camera",
+    ]
+    assert rules._candidates("notes.txt") == []
+
+
+def test_backreferences_are_not_prefiltered():
+    """Ensure patterns with backreferences or named groups are tried alone."""
+    rules = RuleSet(
+        [
+            {"regex": "^(zz)", "dest": "a"},
+            {"regex": r"(\d)\1", "dest": "b"},
+            {"regex": r"(?P<word>[a-z]+)-(?P=word)", "dest": "c"},
+            {"regex": r"(?P<year>\d{4})", "dest": "d"},
+        ]
+    )
+
+    assert [rule.dest for rule in rules._patterned] == ["a"]
+    assert [rule.dest for rule in rules._standalone] == ["b", "c", "d"]
+    assert [rule.dest for rule in rules._candidates("x11.txt")] == ["b"]
+    assert [rule.dest for rule in rules._candidates("zz-zz.txt")] == ["a", "c"]
+    assert [rule.dest for rule in rules._candidates("2024 zz.txt")] == ["d"]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        assert rules.destination(entry_for(tmpdir, "x11.txt"), "txt") == "b"
+
+
+def test_stat_only_when_needed():
+    """Ensure files are not stat'ed unless a candidate rule needs it."""
+    rules = RuleSet(
+        [
+            {"glob": "*.txt", "dest": "text"},
+            {"glob": "*.log", "max_size": 100, "dest": "logs"},
+        ]
+    )
+    with tempfile.TemporaryDirectory() as tmpdir:
+        text = entry_for(tmpdir, "a.txt")
+        log = entry_for(tmpdir, "a.log")
+        fakes = [Mock(wraps=entry) for entry in (text, log)]
+        for fake, entry in zip(fakes, (text, log)):
+            fake.name = entry.name
+
+        assert rules.destination(fakes[0], "txt") == "text"
+        assert rules.destination(fakes[1], "log") == "logs"
+
+    assert fakes[0].stat.call_count == 0
+    assert fakes[1].stat.call_count == 1
+
+
+def test_parse_size_units():
+    """Ensure sizes accept plain numbers and decimal or binary units."""
+    assert parse_size(512, 1) == 512
+    assert parse_size("2KB", 1) == 2000
+    assert parse_size("1.5 MiB", 1) == 1536 * 1024
+    with pytest.raises(ValueError):
+        parse_size("10 parsecs", 1)
+
+
+# ============================================================================
+# Loading and validation
+# ============================================================================
+
+
+def test_load_json_rules():
+    """Ensure rules load from a JSON file."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "rules.json")
+        with open(path, "w") as f:
+            json.dump({"rules": [{"glob": "*.log", "dest": "logs"}]}, f)
+        rules = RuleSet.load(path)
+        entry = entry_for(tmpdir, "x.log")
+
+        assert rules.destination(entry, "log") == "logs"
+
+
+def test_load_toml_rules():
+    """Ensure rules load from a TOML file, including native dates."""
+    pytest.importorskip("tomllib")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "rules.toml")
+        with open(path, "w") as f:
+            f.write(
+                "[[rules]]\n"
+                'glob = "*.log"\n'
+                'min_size = "1KB"\n'
+                'dest = "archive"\n'
+                "\n"
+                "[[rules]]\n"
+                "modified_before = 2024-01-01\n"
+                'dest = "old/{year}"\n'
+            )
+        rules = RuleSet.load(path)
+        old = entry_for(
+            tmpdir, "old.txt", mtime=datetime.datetime(2020, 5, 1).timestamp()
+        )
+
+        assert rules.destination(old, "txt") == "old/2020"
+
+
+@pytest.mark.parametrize(
+    "specs",
+    [
+        {"glob": "*.log"},
+        [{"glob": "*.log"}],
+        [{"glob": "*.log", "regex": "log", "dest": "logs"}],
+        [{"regex": "(", "dest": "logs"}],
+        [{"glob": "*.log", "dest": "logs", "colour": "red"}],
+        [{"min_size": "big", "dest": "logs"}],
+        [{"modified_after": "yesterday", "dest": "logs"}],
+        [{"dest": "../outside"}],
+        [{"dest": "by/{owner}"}],
+    ],
+)
+def test_invalid_rules(specs):
+    """Ensure malformed rules are rejected with ValueError."""
+    with pytest.raises(ValueError):
+        RuleSet(specs)
+
+
+def test_load_rejects_bad_files():
+    """Ensure unreadable or malformed rules files raise ValueError."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "rules.json")
+        with open(path, "w") as f:
+            f.write("{not json")
+
+        with pytest.raises(ValueError):
+            RuleSet.load(path)
+        with pytest.raises(ValueError):
+            RuleSet.load(os.path.join(tmpdir, "missing.json"))
@@ -0,0 +1,109 @@
+"""
+Test suite for content-based file type detection.
+
+This module tests:
+- Signature matching at different offsets
+- Keeping specific extensions that agree with the detected type
+- The persistent (st_dev, st_ino, st_size, st_mtime_ns) cache
+"""
+
+import os
+import tempfile
+from unittest.mock import patch
+
+from file_organizer.sniffer import HEADER_SIZE, ContentSniffer, detect
+
+PNG_HEADER = b"\x89PNG\r\n\x1a\n" + b"\x00" * 8
+
+
+def write_file(path, data):
+    """Write raw bytes to ``path``."""
+    with open(path, "wb") as fp:
+        fp.write(data)
+
+
+def entry_for(directory, name):
+    """Return the ``os.DirEntry`` for ``name`` inside ``directory``."""
+    with os.scandir(directory) as it:
+        return next(entry for entry in it if entry.name == name)
+
+
+def test_detect_known_signatures():
+    """Ensure common signatures are recognized, including non-zero offsets."""
+    assert detect(b"%PDF-1.7\n") == "pdf"
+    assert detect(PNG_HEADER) == "png"
+    assert detect(b"\x00\x00\x00\x18ftypmp42") == "mp4"
+    assert detect(b"RIFF\x00\x00\x00\x00WEBPVP8 ") == "webp"
+    assert detect(b"\x00" * 257 + b"ustar\x00") == "tar"
+    assert len(b"\x00" * 257 + b"ustar") <= HEADER_SIZE
+
+
+def test_detect_unknown_content():
+    """Ensure plain text and empty files are not classified."""
+    assert detect(b"hello world") is None
+    assert detect(b"") is None
+
+
+def test_classify_prefers_content_over_wrong_extension():
+    """Ensure a mislabeled or extensionless file gets its real type."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        write_file(os.path.join(tmpdir, "scan.txt"), b"%PDF-1.4 ...")
+        write_file(os.path.join(tmpdir, "image"), PNG_HEADER)
+        sniffer = ContentSniffer(os.path.join(tmpdir, "cache.json"))
+
+        assert sniffer.classify(entry_for(tmpdir, "scan.txt"), "txt") == "pdf"
+        assert sniffer.classify(entry_for(tmpdir, "image"), "") == "png"
+
+
+def test_classify_keeps_compatible_extension():
+    """Ensure zip-based documents keep their more specific extension."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        write_file(os.path.join(tmpdir, "report.docx"), b"PK\x03\x04rest")
+        write_file(os.path.join(tmpdir, "notes.md"), b"# Notes")
+        sniffer = ContentSniffer(os.path.join(tmpdir, "cache.json"))
+
+        assert sniffer.classify(entry_for(tmpdir, "report.docx"), "docx") == "docx"
+        assert sniffer.classify(entry_for(tmpdir, "notes.md"), "md") == "md"
+
+
+def test_cache_avoids_rereading_headers():
+    """Ensure a second run over unchanged files reads no headers."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        data_dir = os.path.join(tmpdir, "data")
+        os.makedirs(data_dir)
+        for i in range(5):
+            write_file(os.path.join(data_dir, f"img{i}"), PNG_HEADER)
+        cache_path = os.path.join(tmpdir, "state", "cache.json")
+
+        first = ContentSniffer(cache_path)
+        for i in range(5):
+            first.sniff(entry_for(data_dir, f"img{i}"))
+        first.save()
+
+        # Renaming keeps inode, size and mtime, so the cache still applies.
+        os.rename(os.path.join(data_dir, "img0"), os.path.join(data_dir, "moved"))
+
+        second = ContentSniffer(cache_path)
+        with patch("file_organizer.sniffer.read_header") as read_header:
+            assert second.sniff(entry_for(data_dir, "moved")) == "png"
+            for i in range(1, 5):
+                assert second.sniff(entry_for(data_dir, f"img{i}")) == "png"
+
+        read_header.assert_not_called()
+        assert second.hits == 5
+        assert second.misses == 0
+
+
+def test_cache_invalidated_by_modification():
+    """Ensure rewriting a file with new content triggers a fresh read."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "blob")
+        write_file(path, PNG_HEADER)
+        cache_path = os.path.join(tmpdir, "cache.json")
+        first = ContentSniffer(cache_path)
+        first.sniff(entry_for(tmpdir, "blob"))
+        first.save()
+
+        write_file(path, b"%PDF-1.5 and a longer body")
+
+        assert ContentSniffer(cache_path).sniff(entry_for(tmpdir, "blob")) == "pdf"
@@ -0,0 +1,202 @@
+"""
+Test suite for cross-device copies.
+
+This module tests:
+- Kernel copy methods and their fallbacks
+- Metadata and symbolic links in copied files
+- The byte budget for concurrent copies
+- Batched durability
+"""
+
+import os
+import errno
+import tempfile
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from file_organizer import transfer
+from file_organizer.transfer import ByteBudget, copy_data, copy_file, make_durable
+
+DATA = bytes(range(256)) * 1000
+
+
+def write_file(path, data=DATA):
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+def copy_between(tmpdir):
+    src = write_file(os.path.join(tmpdir, "src.bin"))
+    dst = os.path.join(tmpdir, "dst.bin")
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        copied = copy_data(fsrc.fileno(), fdst.fileno())
+    with open(dst, "rb") as f:
+        return copied, f.read()
+
+
+# ============================================================================
+# Copy methods
+# ============================================================================
+
+
+def test_copy_data_small_chunks():
+    """Ensure data is copied completely in several chunks."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with patch.object(transfer, "COPY_CHUNK", 4096):
+            copied, data = copy_between(tmpdir)
+
+    assert copied == len(DATA)
+    assert data == DATA
+
+
+def test_copy_data_falls_back_when_unsupported():
+    """Ensure refused kernel copies fall back to sendfile, then read/write."""
+    refused = OSError(errno.EXDEV, "Invalid cross-device link")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with (
+            patch("os.copy_file_range", side_effect=refused, create=True),
+            patch(
+                "os.sendfile", side_effect=OSError(errno.EINVAL, "Invalid"), create=True
+            ) as sendfile,
+        ):
+            copied, data = copy_between(tmpdir)
+
+    assert sendfile.called
+    assert copied == len(DATA)
+    assert data == DATA
+
+
+def test_copy_data_switches_method_mid_file():
+    """Ensure a fallback continues at the offset where the last method stopped."""
+    real_copy = getattr(os, "copy_file_range", None)
+    if real_copy is None:
+        pytest.skip("os.copy_file_range is not available")
+    calls = []
+
+    def fail_second_call(*args):
+        calls.append(args)
+        if len(calls) > 1:
+            raise OSError(errno.ENOSYS, "Not implemented")
+        return real_copy(*args)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with (
+            patch.object(transfer, "COPY_CHUNK", 10000),
+            patch("os.copy_file_range", side_effect=fail_second_call),
+        ):
+            copied, data = copy_between(tmpdir)
+
+    assert copied == len(DATA)
+    assert data == DATA
+
+
+def test_copy_data_reraises_real_errors():
+    """Ensure errors other than "unsupported" are not hidden by fallbacks."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with patch(
+            "os.copy_file_range", side_effect=OSError(errno.ENOSPC, "Full"), create=True
+        ):
+            with pytest.raises(OSError):
+                copy_between(tmpdir)
+
+
+def test_copy_file_preserves_metadata():
+    """Ensure permissions and modification time survive the copy."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        src = write_file(os.path.join(tmpdir, "src.bin"))
+        os.chmod(src, 0o640)
+        os.utime(src, (1_000_000_000, 1_000_000_000))
+        dst = os.path.join(tmpdir, "dst.bin")
+
+        assert copy_file(src, dst) == len(DATA)
+
+        assert os.stat(dst).st_mode & 0o777 == 0o640
+        assert os.stat(dst).st_mtime == 1_000_000_000
+
+
+def test_copy_file_recreates_symlink():
+    """Ensure a symbolic link is copied as a link, not as its target."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.symlink("target.txt", os.path.join(tmpdir, "link"))
+        dst = os.path.join(tmpdir, "copy")
+
+        assert copy_file(os.path.join(tmpdir, "link"), dst) == 0
+        assert os.readlink(dst) == "target.txt"
+
+
+# ============================================================================
+# Byte budget
+# ============================================================================
+
+
+def test_byte_budget_limits_bytes_in_flight():
+    """Ensure copies wait while the budget is used up."""
+    budget = ByteBudget(100)
+    peak = []
+    lock = threading.Lock()
+    release = threading.Event()
+
+    def copy(size):
+        with budget.reserve(size):
+            with lock:
+                peak.append(budget.in_flight)
+            release.wait(0.05)
+
+    threads = [threading.Thread(target=copy, args=(60,)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(peak) == 60
+    assert budget.in_flight == 0
+
+
+def test_byte_budget_admits_oversized_file_alone():
+    """Ensure a file larger than the budget can still be copied."""
+    budget = ByteBudget(10)
+    with budget.reserve(1000):
+        assert budget.in_flight == 1000
+    with pytest.raises(ValueError):
+        ByteBudget(0)
+
+
+# ============================================================================
+# Durability
+# ============================================================================
+
+
+def test_make_durable_syncs_each_filesystem_and_directory_once():
+    """Ensure one syncfs per filesystem and one fsync per directory."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = []
+        for folder in ("a", "b"):
+            os.mkdir(os.path.join(tmpdir, folder))
+            for i in range(3):
+                paths.append(write_file(os.path.join(tmpdir, folder, f"{i}"), b"x"))
+
+        with (
+            patch.object(transfer, "_syncfs", return_value=True) as syncfs,
+            patch("file_organizer.transfer.os.fsync") as fsync,
+        ):
+            make_durable(paths)
+
+    assert syncfs.call_count == 1
+    assert fsync.call_count == 2
+
+
+def test_make_durable_without_syncfs():
+    """Ensure every file is synced when the filesystem cannot be flushed."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = [write_file(os.path.join(tmpdir, f"{i}"), b"x") for i in range(3)]
+
+        with (
+            patch.object(transfer, "_syncfs", return_value=False),
+            patch("file_organizer.transfer.os.fsync") as fsync,
+        ):
+            make_durable(paths)
+
+    assert fsync.call_count == 4
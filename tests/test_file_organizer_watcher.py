@@ -0,0 +1,246 @@
+"""
+Test suite for the File Organizer watch mode.
+
+This module tests:
+- Polling watcher change detection (new files, growing files, new folders)
+- Inotify watcher events on Linux
+- The watch loop end to end, including debouncing of files being written
+- Batches that fail because a file vanished before its move
+"""
+
+import os
+import sys
+import time
+import tempfile
+import threading
+
+import pytest
+
+from file_organizer.file_organizer import FileOrganizer
+from file_organizer.reporting import Reporter
+from file_organizer.watcher import InotifyWatcher, PollingWatcher, watch
+
+linux_only = pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="inotify is Linux only"
+)
+
+
+def write(path, data="dummy content", mode="w"):
+    """Write ``data`` to ``path``."""
+    with open(path, mode) as fp:
+        fp.write(data)
+
+
+def bump_mtime(path):
+    """Move the mtime of ``path`` forward so coarse clocks see a change."""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+class VanishingOrganizer(FileOrganizer):
+    """Deletes ``*.tmp`` files right after planning, before they are moved."""
+
+    def plan(self, paths=None):
+        ops = list(super().plan(paths))
+        for op in ops:
+            if op.src.endswith(".tmp") and os.path.exists(op.src):
+                os.unlink(op.src)
+        return iter(ops)
+
+
+class FailureReporter(Reporter):
+    def __init__(self):
+        self.failures = []
+
+    def failed(self, root, error):
+        self.failures.append((root, error))
+
+
+def wait_for(condition, timeout=10.0):
+    """Poll ``condition`` until it is true or ``timeout`` expires."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+# ============================================================
+# PollingWatcher tests
+# ============================================================
+
+
+def test_polling_reports_only_new_files():
+    """Ensure files present at start are not reported, new ones are."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        write(os.path.join(tmpdir, "old.txt"))
+        watcher = PollingWatcher([tmpdir], interval=0)
+
+        write(os.path.join(tmpdir, "new.txt"))
+        bump_mtime(tmpdir)
+
+        assert watcher.changes(0) == {os.path.join(tmpdir, "new.txt")}
+        assert watcher.changes(0) == set()
+
+
+def test_polling_reports_growing_file_again():
+    """Ensure a file still being written is reported on every change."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "big.log")
+        watcher = PollingWatcher([tmpdir], interval=0)
+        write(path, "part 1\n")
+        bump_mtime(tmpdir)
+        assert watcher.changes(0) == {path}
+
+        write(path, "part 2\n", mode="a")
+        bump_mtime(path)
+
+        assert watcher.changes(0) == {path}
+
+
+def test_polling_recursive_new_folder():
+    """Ensure files inside a new subfolder are reported in recursive mode."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        watcher = PollingWatcher([tmpdir], recursive=True, interval=0)
+        os.makedirs(os.path.join(tmpdir, "drop"))
+        write(os.path.join(tmpdir, "drop", "a.txt"))
+        bump_mtime(tmpdir)
+
+        assert watcher.changes(0) == {os.path.join(tmpdir, "drop", "a.txt")}
+
+
+# ============================================================
+# InotifyWatcher tests
+# ============================================================
+
+
+@linux_only
+def test_inotify_reports_closed_file():
+    """Ensure a file written and closed in the watched folder is reported."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        watcher = InotifyWatcher([tmpdir])
+        try:
+            write(os.path.join(tmpdir, "a.txt"))
+            assert watcher.changes(1.0) == {os.path.join(tmpdir, "a.txt")}
+        finally:
+            watcher.close()
+
+
+@linux_only
+def test_inotify_recursive_watches_new_folders():
+    """Ensure new subfolders are watched and their files reported."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        watcher = InotifyWatcher([tmpdir], recursive=True)
+        try:
+            os.makedirs(os.path.join(tmpdir, "drop"))
+            watcher.changes(1.0)
+            write(os.path.join(tmpdir, "drop", "b.txt"))
+
+            changed = set()
+            assert wait_for(lambda: changed.update(watcher.changes(0.1)) or changed)
+            assert changed == {os.path.join(tmpdir, "drop", "b.txt")}
+        finally:
+            watcher.close()
+
+
+# ============================================================
+# watch() loop tests
+# ============================================================
+
+
+@pytest.mark.parametrize("polling", [True, False])
+def test_watch_organizes_new_files(polling):
+    """Ensure existing and newly arriving files are organized."""
+    if not polling and not sys.platform.startswith("linux"):
+        pytest.skip("inotify is Linux only")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        write(os.path.join(tmpdir, "before.txt"))
+        organizer = FileOrganizer(tmpdir)
+        stop = threading.Event()
+        batches = []
+        thread = threading.Thread(
+            target=watch,
+            args=(organizer,),
+            kwargs={
+                "settle": 0.1,
+                "stop": stop,
+                "on_batch": batches.append,
+                "polling": polling,
+            },
+        )
+        thread.start()
+        try:
+            assert wait_for(
+                lambda: os.path.isfile(os.path.join(tmpdir, "txt", "before.txt"))
+            )
+            write(os.path.join(tmpdir, "after.jpg"))
+            bump_mtime(tmpdir)
+            assert wait_for(
+                lambda: os.path.isfile(os.path.join(tmpdir, "jpg", "after.jpg"))
+            )
+        finally:
+            stop.set()
+            thread.join()
+
+        assert sum(len(summary.moves) for summary in batches) == 2
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify only")
+def test_watch_waits_for_writes_to_settle():
+    """Ensure a file that keeps changing is not moved until it is quiet."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "upload.bin")
+        stop = threading.Event()
+        thread = threading.Thread(
+            target=watch,
+            args=(FileOrganizer(tmpdir),),
+            kwargs={"settle": 0.5, "stop": stop},
+        )
+        thread.start()
+        try:
+            time.sleep(0.2)
+            for _ in range(10):
+                write(path, "chunk", mode="a")
+                time.sleep(0.1)
+            assert os.path.isfile(path)
+            assert wait_for(
+                lambda: os.path.isfile(os.path.join(tmpdir, "bin", "upload.bin"))
+            )
+        finally:
+            stop.set()
+            thread.join()
+
+
+def test_watch_survives_a_file_vanishing_before_its_move():
+    """Ensure a failed batch is reported and later batches still run."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        write(os.path.join(tmpdir, "a.tmp"))
+        write(os.path.join(tmpdir, "b.txt"))
+        reporter = FailureReporter()
+        organizer = VanishingOrganizer(tmpdir, reporter=reporter)
+        stop = threading.Event()
+        thread = threading.Thread(
+            target=watch,
+            args=(organizer,),
+            kwargs={"settle": 0.1, "stop": stop, "polling": True},
+        )
+        thread.start()
+        try:
+            assert wait_for(
+                lambda: os.path.isfile(os.path.join(tmpdir, "txt", "b.txt"))
+            )
+            write(os.path.join(tmpdir, "c.jpg"))
+            bump_mtime(tmpdir)
+            assert wait_for(
+                lambda: os.path.isfile(os.path.join(tmpdir, "jpg", "c.jpg"))
+            )
+            assert thread.is_alive()
+        finally:
+            stop.set()
+            thread.join()
+
+        assert len(reporter.failures) == 1
+        assert reporter.failures[0][0] == tmpdir
+        assert "a.tmp" in reporter.failures[0][1]
+        assert not organizer.journal.is_pending()
@@ -4,15 +4,32 @@ Comprehensive test suite for the Password Generator application.
 This module tests:
 - PasswordGenerator class behavior (length, character sets, edge cases)
 - CLI argument parsing and output generation
-- Deterministic behavior via mocking random.choice
+- Deterministic behavior via mocking the entropy source
+- Bulk generation and buffered streaming output
+- Password policy options on the command line
+- Passphrase mode on the command line
+- Parallel, sharded and seeded generation on the command line
+- Unique output on the command line
+- Breached-password checks on the command line
+- Pronounceable passwords and model training on the command line
 """
 
-import argparse
+import hashlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
 import pytest
 from unittest.mock import patch
 
-from password_generator.password_generator import PasswordGenerator
-
+from password_generator import password_generator
+from password_generator.password_generator import (
+    PasswordGenerator,
+    build_parser,
+    main,
+    write_passwords,
+)
 
 # ============================================================
 # PasswordGenerator class tests
@@ -76,11 +93,67 @@ def test_min_length():
 
 
 def test_generate_deterministic_with_mock():
-    """Ensure deterministic output when random.choice is mocked."""
-    with patch("random.choice", return_value="X"):
+    """Ensure deterministic output when the entropy source is mocked."""
+    with patch("os.urandom", side_effect=lambda n: b"\x00" * n):
         gen = PasswordGenerator(length=5)
         pwd = gen.generate()
-        assert pwd == "XXXXX"
+        assert pwd == "aaaaa"
+
+
+# ============================================================
+# Bulk generation tests
+# ============================================================
+
+
+def test_generate_many_count_and_alphabet():
+    """Ensure generate_many yields the requested number of valid passwords."""
+    gen = PasswordGenerator(length=7, use_specials=False)
+    pwds = list(gen.generate_many(10_000))
+    assert len(pwds) == 10_000
+    assert all(len(pwd) == 7 for pwd in pwds)
+    assert set("".join(pwds)) <= set(gen.alphabet)
+
+
+def test_generate_many_draws_randomness_in_blocks():
+    """Ensure characters are sampled once per block, not once per character."""
+    gen = PasswordGenerator(length=4)
+    with (
+        patch.object(password_generator, "BLOCK_SIZE", 100),
+        patch.object(
+            password_generator.CharSampler,
+            "sample",
+            autospec=True,
+            side_effect=lambda self, k: "x" * k,
+        ) as sample,
+    ):
+        pwds = list(gen.generate_many(250))
+    assert pwds == ["xxxx"] * 250
+    assert [call.args[1] for call in sample.call_args_list] == [400, 400, 200]
+
+
+def test_generate_many_edge_cases():
+    """Ensure zero counts, empty passwords and negative counts are handled."""
+    assert list(PasswordGenerator().generate_many(0)) == []
+    assert list(PasswordGenerator(length=0).generate_many(3)) == ["", "", ""]
+    with pytest.raises(ValueError):
+        list(PasswordGenerator().generate_many(-1))
+
+
+def test_iterator_is_endless():
+    """Ensure iterating a generator yields passwords without limit."""
+    it = iter(PasswordGenerator(length=5))
+    pwds = [next(it) for _ in range(password_generator.BLOCK_SIZE + 10)]
+    assert all(len(pwd) == 5 for pwd in pwds)
+
+
+def test_write_passwords_in_batches():
+    """Ensure passwords are written one per line in large chunks."""
+    out = io.StringIO()
+    with patch.object(out, "write", wraps=out.write) as write:
+        written = write_passwords((str(i) for i in range(10)), out, batch_size=4)
+    assert written == 10
+    assert out.getvalue() == "".join(f"{i}\n" for i in range(10))
+    assert write.call_count == 3
 
 
 # ============================================================
@@ -93,13 +166,11 @@ def test_cli_default_length(capsys):
     with (
         patch(
             "argparse.ArgumentParser.parse_args",
-            return_value=argparse.Namespace(
-                length=12, no_digits=False, no_specials=False
-            ),
+            return_value=build_parser().parse_args([]),
         ),
         patch(
-            "password_generator.password_generator.PasswordGenerator.generate",
-            return_value="ABC123!@#XYZ",
+            "password_generator.password_generator.PasswordGenerator.generate_many",
+            return_value=["ABC123!@#XYZ"],
         ),
     ):
         from password_generator.password_generator import main
@@ -114,13 +185,11 @@ def test_cli_no_digits(capsys):
     with (
         patch(
             "argparse.ArgumentParser.parse_args",
-            return_value=argparse.Namespace(
-                length=8, no_digits=True, no_specials=False
-            ),
+            return_value=build_parser().parse_args(["-l", "8", "--no-digits"]),
         ),
         patch(
-            "password_generator.password_generator.PasswordGenerator.generate",
-            return_value="Ab!Cd!Ef",
+            "password_generator.password_generator.PasswordGenerator.generate_many",
+            return_value=["Ab!Cd!Ef"],
         ),
     ):
         from password_generator.password_generator import main
@@ -135,13 +204,11 @@ def test_cli_no_specials(capsys):
     with (
         patch(
             "argparse.ArgumentParser.parse_args",
-            return_value=argparse.Namespace(
-                length=8, no_digits=False, no_specials=True
-            ),
+            return_value=build_parser().parse_args(["-l", "8", "--no-specials"]),
         ),
         patch(
-            "password_generator.password_generator.PasswordGenerator.generate",
-            return_value="Ab12Cd34",
+            "password_generator.password_generator.PasswordGenerator.generate_many",
+            return_value=["Ab12Cd34"],
         ),
     ):
         from password_generator.password_generator import main
@@ -156,13 +223,11 @@ def test_cli_custom_length(capsys):
     with (
         patch(
             "argparse.ArgumentParser.parse_args",
-            return_value=argparse.Namespace(
-                length=5, no_digits=False, no_specials=False
-            ),
+            return_value=build_parser().parse_args(["-l", "5"]),
         ),
         patch(
-            "password_generator.password_generator.PasswordGenerator.generate",
-            return_value="ABCDE",
+            "password_generator.password_generator.PasswordGenerator.generate_many",
+            return_value=["ABCDE"],
         ),
     ):
         from password_generator.password_generator import main
@@ -170,3 +235,268 @@ def test_cli_custom_length(capsys):
         main()
         captured = capsys.readouterr()
         assert "ABCDE" in captured.out
+
+
+def test_cli_startup_skips_server_and_pool_modules():
+    """Ensure importing the CLI does not load the server or the process pool."""
+    slow = {
+        "asyncio",
+        "concurrent.futures.process",
+        "password_generator.parallel",
+        "password_generator.server",
+    }
+    code = (
+        "import sys, password_generator.password_generator; "
+        f"print(sorted({slow!r} & set(sys.modules)))"
+    )
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    result = subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, text=True
+    )
+    assert result.stdout.strip() == "[]"
+
+
+def test_cli_count_to_file():
+    """Ensure --count and --output write that many passwords to a file."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "passwords.txt")
+        main(["-n", "5000", "-l", "10", "-o", path])
+        with open(path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    assert len(lines) == 5000
+    assert all(len(line) == 10 for line in lines)
+
+
+def test_cli_count_to_stdout(capsys):
+    """Ensure --count streams passwords to standard output."""
+    main(["--count", "3", "--length", "6"])
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 3
+    assert all(len(line) == 6 for line in lines)
+
+
+def test_cli_rejects_invalid_count():
+    """Ensure a count below one is rejected."""
+    with pytest.raises(SystemExit):
+        main(["--count", "0"])
+
+
+def test_cli_policy_options(capsys):
+    """Ensure policy options constrain the output and report entropy."""
+    main(["-n", "50", "-l", "10", "--min", "digits=3", "--no-ambiguous", "--entropy"])
+    captured = capsys.readouterr()
+    lines = captured.out.splitlines()
+    assert len(lines) == 50
+    assert all(sum(c.isdigit() for c in line) >= 3 for line in lines)
+    assert not set("".join(lines)) & set("Il1O0")
+    assert captured.err.startswith("Entropy: ")
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["--min", "digits"],
+        ["--min", "digits=x"],
+        ["--min", "digits=20"],
+        ["--charset", "hex=abc"],
+        ["--max-repeat", "0"],
+    ],
+)
+def test_cli_rejects_invalid_policy(argv):
+    """Ensure malformed or impossible policies are reported as usage errors."""
+    with pytest.raises(SystemExit):
+        main(argv)
+
+
+def test_cli_passphrases(capsys):
+    """Ensure --words prints passphrases from the given word list."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "words.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("red\ngreen\nblue\n")
+        main(["--words", "4", "--wordlist", path, "--separator", ".", "-n", "10"])
+
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 10
+    assert all(set(line.split(".")) <= {"red", "green", "blue"} for line in lines)
+    assert all(len(line.split(".")) == 4 for line in lines)
+
+
+def test_cli_passphrases_missing_wordlist():
+    """Ensure a missing word list is a usage error."""
+    with pytest.raises(SystemExit):
+        main(["--words", "4", "--wordlist", "/nonexistent/words.txt"])
+
+
+def test_cli_workers_with_seed(capsys):
+    """Ensure seeded output is the same with one or several workers."""
+    main(["-n", "300", "--seed", "9"])
+    single = capsys.readouterr().out
+    main(["-n", "300", "--seed", "9", "--workers", "2"])
+    assert capsys.readouterr().out == single
+    assert len(single.splitlines()) == 300
+
+
+def test_cli_shards():
+    """Ensure --shards writes shard files to the given directory."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        main(["-n", "10", "--shards", tmpdir, "--workers", "2"])
+        assert os.listdir(tmpdir) == ["shard-0000.txt"]
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["--workers", "0"],
+        ["--shards", "out", "-o", "out.txt"],
+        ["--shards", "out", "--unique"],
+    ],
+)
+def test_cli_rejects_invalid_workers(argv):
+    """Ensure invalid parallel options are usage errors."""
+    with pytest.raises(SystemExit):
+        main(argv)
+
+
+def test_cli_shards_reject_breached(capsys):
+    """Ensure --reject-breached with --shards is an error, not a silent no-op."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with pytest.raises(SystemExit):
+            main(["--shards", tmpdir, "--reject-breached", "hashes.bin"])
+        assert os.listdir(tmpdir) == []
+    assert "--reject-breached cannot be combined" in capsys.readouterr().err
+
+
+def test_cli_unique(capsys):
+    """Ensure --unique reports the collision estimate and never repeats."""
+    main(["-l", "2", "--no-digits", "--no-specials", "-n", "2000", "--unique"])
+    captured = capsys.readouterr()
+    lines = captured.out.splitlines()
+    assert len(lines) == len(set(lines)) == 2000
+    assert "Collision probability" in captured.err
+
+
+def test_cli_unique_with_workers(capsys):
+    """Ensure --unique also applies to output merged from several workers."""
+    main(["-l", "2", "--no-specials", "-n", "3000", "--unique", "--workers", "2"])
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == len(set(lines)) == 3000
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["-l", "1", "--no-digits", "--no-specials", "-n", "53", "--unique"],
+        ["-l", "2", "--no-digits", "--no-specials", "--charset", "lower=abc"]
+        + ["--charset", "upper=ABC", "--max-repeat", "1", "--unique", "-n", "33"],
+        ["--unique", "--shards", "out"],
+    ],
+)
+def test_cli_rejects_impossible_unique(argv):
+    """Ensure impossible --unique requests are usage errors."""
+    with pytest.raises(SystemExit):
+        main(argv)
+
+
+def test_cli_check_builds_and_checks(capsys):
+    """Ensure 'check --build' writes a hash file and 'check' reports hits."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        dump = os.path.join(tmpdir, "dump.txt")
+        with open(dump, "w") as f:
+            f.write("7C4A8D09CA3762AF61E59520943DC26494F8941B:37359195\n")  # 123456
+        hashfile = os.path.join(tmpdir, "breach.bin")
+        main(["check", hashfile, "--build", dump])
+        assert "Wrote 1 hashes" in capsys.readouterr().err
+
+        with pytest.raises(SystemExit) as exc:
+            main(["check", hashfile, "123456", "not breached"])
+        assert exc.value.code == 1
+        assert capsys.readouterr().out == "123456\n"
+
+        main(["check", hashfile, "not breached"])
+        assert capsys.readouterr().out == ""
+
+
+def test_cli_check_reads_standard_input(capsys):
+    """Ensure 'check' without passwords reads one per line from stdin."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        dump = os.path.join(tmpdir, "dump.txt")
+        with open(dump, "w") as f:
+            f.write("7C4A8D09CA3762AF61E59520943DC26494F8941B\n")
+        hashfile = os.path.join(tmpdir, "breach.bin")
+        main(["check", hashfile, "--build", dump])
+        with (
+            patch("sys.stdin", io.StringIO("abc\n123456\r\n")),
+            pytest.raises(SystemExit),
+        ):
+            main(["check", hashfile])
+    assert capsys.readouterr().out == "123456\n"
+
+
+def test_cli_reject_breached(capsys):
+    """Ensure breached candidates are replaced during generation."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        dump = os.path.join(tmpdir, "dump.txt")
+        with open(dump, "w") as f:
+            for word in ("aa", "ab", "ba"):
+                f.write(hashlib.sha1(word.encode()).hexdigest() + "\n")
+        hashfile = os.path.join(tmpdir, "breach.bin")
+        main(["check", hashfile, "--build", dump])
+        capsys.readouterr()
+        main(
+            ["-l", "2", "--no-digits", "--no-specials", "-n", "20"]
+            + ["--charset", "lower=ab", "--charset", "upper="]
+            + ["--reject-breached", hashfile]
+        )
+    assert set(capsys.readouterr().out.split()) == {"bb"}
+
+
+def test_cli_check_invalid_files():
+    """Ensure a bad dump or hash file ends with an error."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        dump = os.path.join(tmpdir, "dump.txt")
+        with open(dump, "w") as f:
+            f.write("not a hash\n")
+        with pytest.raises(SystemExit):
+            main(["check", os.path.join(tmpdir, "out.bin"), "--build", dump])
+        with pytest.raises(SystemExit):
+            main(["check", dump, "password"])
+
+
+def test_cli_pronounceable(capsys):
+    """Ensure --pronounceable prints lowercase passwords and both entropies."""
+    main(["--pronounceable", "-l", "10", "-n", "5", "--entropy"])
+    captured = capsys.readouterr()
+    lines = captured.out.splitlines()
+    assert len(lines) == 5
+    assert all(len(line) == 10 and line.isalpha() and line.islower() for line in lines)
+    assert "Entropy:" in captured.err
+    assert "Min-entropy:" in captured.err
+
+
+def test_cli_train_model(capsys):
+    """Ensure 'train-model' writes a model usable with --model."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        words = os.path.join(tmpdir, "words.txt")
+        with open(words, "w", encoding="utf-8") as f:
+            f.write("11111\tbanana\n11112\tcabana\n")
+        model = os.path.join(tmpdir, "model.bin")
+        main(["train-model", words, model, "--order", "2"])
+        assert "Wrote" in capsys.readouterr().err
+        main(["--pronounceable", "--model", model, "--seed", "1", "-n", "3"])
+    assert len(capsys.readouterr().out.splitlines()) == 3
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["--pronounceable", "--words", "4"],
+        ["--pronounceable", "--model", "/nonexistent/model.bin"],
+        ["--pronounceable", "-l", "0"],
+        ["train-model", "/nonexistent/words.txt", "model.bin"],
+    ],
+)
+def test_cli_rejects_invalid_pronounceable(argv):
+    """Ensure bad pronounceable settings or files end with an error."""
+    with pytest.raises(SystemExit):
+        main(argv)
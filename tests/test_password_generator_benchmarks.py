@@ -0,0 +1,100 @@
+"""
+Smoke test for the password generation benchmarks.
+
+This module tests:
+- A tiny engine comparison run
+- The policy check behind the retrying reference implementation
+- A tiny run of every suite writing JSON results
+- Regression detection against a baseline
+"""
+
+import os
+import sys
+import json
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+
+import bench_password_generator as bench  # noqa: E402
+
+
+def test_time_engines_reports_every_engine():
+    """Ensure each engine reports a positive throughput."""
+    timings = bench.time_engines(count=50, length=8)
+    assert set(timings) == {
+        "random.choice",
+        "csprng generate()",
+        "csprng generate_many()",
+    }
+    assert all(rate > 0 for rate in timings.values())
+
+
+def test_legacy_generate_uses_alphabet():
+    """Ensure the reference implementation draws from the given alphabet."""
+    assert set(bench.legacy_generate("ab", 100)) <= {"a", "b"}
+
+
+def test_satisfies_checks_minimums_and_runs():
+    """Ensure the reference policy check matches the policy definition."""
+    options = {"minimums": {"digits": 2}, "max_repeat": 2}
+    assert bench.satisfies("ab12", options)
+    assert not bench.satisfies("abc1", options)
+    assert not bench.satisfies("a111", options)
+    password = bench.legacy_policy_generate("a1", 6, options)
+    assert bench.satisfies(password, options)
+
+
+def test_benchmark_run_writes_results():
+    """Ensure a tiny run of every suite reports throughput as JSON."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output = os.path.join(tmpdir, "results.json")
+        argv = ["--count", "50", "--latency-count", "20", "--policy-count", "20"]
+        argv += ["--scaling-count", "200", "--workers", "1", "2", "--length", "8"]
+        argv += ["--alphabets", "letters", "--policies", "strict", "--output", output]
+
+        assert bench.main(argv) == 0
+
+        with open(output) as f:
+            report = json.load(f)
+
+    assert report["benchmark"] == "password_generator"
+    suites = [result["case"]["suite"] for result in report["results"]]
+    assert suites == ["latency"] * 4 + ["bulk"] * 3 + ["policy"] * 3 + ["scaling"] * 2
+    assert all(result["passwords_per_sec"] > 0 for result in report["results"])
+    latency = report["results"][0]
+    assert 0 < latency["median_us"] <= latency["p99_us"]
+    assert report["results"][-2]["speedup"] == 1.0
+
+
+def test_compare_flags_regressions():
+    """Ensure cases slower than the tolerance are reported."""
+    case = {
+        "suite": "bulk",
+        "engine": "csprng generate_many()",
+        "length": 12,
+        "alphabet": "full",
+        "policy": "none",
+        "workers": 1,
+    }
+    baseline = {"results": [{"case": case, "passwords_per_sec": 1000.0}]}
+
+    assert (
+        bench.compare(
+            [{"case": case, "passwords_per_sec": 950.0}],
+            baseline,
+            0.1,
+            "passwords_per_sec",
+        )
+        == []
+    )
+    assert (
+        len(
+            bench.compare(
+                [{"case": case, "passwords_per_sec": 800.0}],
+                baseline,
+                0.1,
+                "passwords_per_sec",
+            )
+        )
+        == 1
+    )
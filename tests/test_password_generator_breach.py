@@ -0,0 +1,132 @@
+"""
+Test suite for offline breached-password checks.
+
+This module tests:
+- Parsing HASH[:count] text dumps
+- Building the sorted binary hash file from unsorted input in several runs
+- Lookups through the fan-out table and binary search
+- Rejecting files that are not breach hash files
+"""
+
+import hashlib
+import io
+import os
+import tempfile
+from unittest.mock import patch
+
+import pytest
+
+from password_generator import breach
+from password_generator.breach import BreachIndex, build, parse_hashes
+
+BREACHED = [f"password{i}" for i in range(500)] + ["123456", "hunter2", ""]
+
+
+def dump_of(passwords, suffix=":42"):
+    lines = [hashlib.sha1(p.encode()).hexdigest().upper() + suffix for p in passwords]
+    return io.BytesIO(("\n".join(reversed(lines)) + "\n").encode())
+
+
+def build_index(tmpdir, passwords=BREACHED, **kwargs):
+    path = os.path.join(tmpdir, "breach.bin")
+    count = build(dump_of(passwords), path, **kwargs)
+    return path, count
+
+
+# ============================================================================
+# Building
+# ============================================================================
+
+
+def test_parse_hashes_accepts_counts_case_and_blank_lines():
+    """Ensure HIBP-style lines, lowercase hashes and blank lines are parsed."""
+    digest = hashlib.sha1(b"x").digest()
+    dump = io.BytesIO(f"{digest.hex().upper()}:7\r\n\n{digest.hex()}\n".encode("ascii"))
+    assert list(parse_hashes(dump)) == [digest, digest]
+
+
+def test_parse_hashes_rejects_garbage():
+    """Ensure lines that are not SHA-1 hashes are reported with their number."""
+    with pytest.raises(ValueError, match="line 2"):
+        list(parse_hashes(io.BytesIO(b"%s\nnot-a-hash\n" % (b"a" * 40))))
+
+
+def test_build_sorts_and_deduplicates_across_runs():
+    """Ensure unsorted input split into runs is merged into one sorted file."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path, count = build_index(tmpdir, BREACHED + BREACHED[:10], run_size=64)
+        index = BreachIndex(path)
+        records = [
+            index._data[start : start + 20]
+            for start in range(breach.DATA_OFFSET, len(index._data), 20)
+        ]
+        index.close()
+        assert os.listdir(tmpdir) == ["breach.bin"]
+
+    assert count == len(BREACHED)
+    assert records == sorted(set(records))
+    assert len(records) == len(BREACHED)
+
+
+def test_build_empty_dump():
+    """Ensure an empty dump gives an empty but valid hash file."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path, count = build_index(tmpdir, [])
+        index = BreachIndex(path)
+        assert count == len(index) == 0
+        assert "anything" not in index
+        index.close()
+
+
+# ============================================================================
+# Lookups
+# ============================================================================
+
+
+def test_lookups_find_every_breached_password():
+    """Ensure breached passwords are found and others are not."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path, _ = build_index(tmpdir)
+        index = BreachIndex(path)
+        assert all(password in index for password in BREACHED)
+        assert not any(f"safe{i}" in index for i in range(500))
+        assert list(index.check_many(["hunter2", "correct horse"])) == [
+            ("hunter2", True),
+            ("correct horse", False),
+        ]
+        index.close()
+
+
+def test_lookup_reads_only_its_prefix_bucket():
+    """Ensure the fan-out table limits the search to records with one prefix."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path, _ = build_index(tmpdir)
+        index = BreachIndex(path)
+        digest = breach.sha1("hunter2")
+        prefix = int.from_bytes(digest[:2], "big")
+        bucket = index._fanout[prefix + 1] - index._fanout[prefix]
+        assert 1 <= bucket <= 3
+        assert index._fanout[-1] == len(index)
+        index.close()
+
+
+def test_rejects_files_that_are_not_hash_files():
+    """Ensure text dumps and truncated files are refused."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path, _ = build_index(tmpdir)
+        with open(path, "rb") as f:
+            data = f.read()
+        for content in (b"A" * 40 + b":1\n", data[:-1], b"XXXX" + data[4:]):
+            with open(path, "wb") as f:
+                f.write(content)
+            with pytest.raises(ValueError):
+                BreachIndex(path)
+
+
+def test_build_failure_leaves_no_partial_file():
+    """Ensure a failed build does not leave a half-written hash file behind."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with patch.object(breach, "_write_index", side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                build_index(tmpdir)
+        assert os.listdir(tmpdir) == []
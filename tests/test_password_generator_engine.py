@@ -0,0 +1,110 @@
+"""
+Test suite for the CSPRNG character sampler.
+
+This module tests:
+- Alphabet validation
+- The rejection sampling translate table
+- Buffered entropy across calls and forks
+- Non-ASCII alphabets
+- Random indexes and shuffles
+- Seeded sources for reproducible tests
+"""
+
+import os
+from collections import Counter
+from unittest.mock import patch
+
+import pytest
+
+from password_generator import engine
+from password_generator.engine import CharSampler, RandomBytes, seeded_source
+
+# ============================================================================
+# Sampling
+# ============================================================================
+
+
+def test_rejects_invalid_alphabets():
+    """Ensure empty, duplicated and oversized alphabets are refused."""
+    for alphabet in ("", "aab", "".join(chr(i) for i in range(300))):
+        with pytest.raises(ValueError):
+            CharSampler(alphabet)
+
+
+def test_rejection_sampling_drops_biased_bytes():
+    """Ensure bytes above the largest multiple of the alphabet size are dropped."""
+    # 256 % 3 == 1, so byte 255 would make "a" more likely and must be dropped.
+    data = bytes([0, 1, 2, 3, 255, 255, 254])
+    with patch("os.urandom", side_effect=[data, b"\x05" * 64]):
+        sampler = CharSampler("abc")
+        with patch.object(engine, "REFILL_SIZE", 1):
+            assert sampler.sample(6) == "abcacc"
+
+
+def test_distribution_is_uniform():
+    """Ensure every character is drawn about equally often."""
+    sampler = CharSampler("abcdefg")
+    counts = Counter(sampler.sample(70_000))
+    assert set(counts) == set("abcdefg")
+    assert all(9_000 < count < 11_000 for count in counts.values())
+
+
+def test_buffer_serves_several_calls_from_one_read():
+    """Ensure small requests are served from one bulk read."""
+    sampler = CharSampler("0123456789")
+    with patch("os.urandom", wraps=os.urandom) as urandom:
+        chunks = [sampler.sample(12) for _ in range(100)]
+    assert urandom.call_count == 1
+    assert len(set(chunks)) == 100
+
+
+def test_buffer_is_discarded_after_fork():
+    """Ensure a forked child does not reuse bytes buffered by its parent."""
+    sampler = CharSampler("ab")
+    sampler.sample(1)
+    with (
+        patch("os.getpid", return_value=-1),
+        patch("os.urandom", side_effect=lambda n: b"\x01" * n),
+    ):
+        assert sampler.sample(8) == "bbbbbbbb"
+
+
+def test_non_ascii_alphabet():
+    """Ensure alphabets with non-ASCII characters map indexes back to characters."""
+    sampler = CharSampler("äöüß")
+    assert set(sampler.sample(1000)) == set("äöüß")
+
+
+# ============================================================================
+# Random indexes and shuffles
+# ============================================================================
+
+
+def test_randbelow_range_and_large_values():
+    """Ensure random indexes stay in range, including for very large bounds."""
+    rand = RandomBytes()
+    assert {rand.randbelow(3) for _ in range(300)} == {0, 1, 2}
+    assert rand.randbelow(1) == 0
+    assert 0 <= rand.randbelow(2**200) < 2**200
+    with pytest.raises(ValueError):
+        rand.randbelow(0)
+
+
+def test_shuffle_gives_every_permutation():
+    """Ensure all permutations are produced about equally often."""
+    rand = RandomBytes()
+    counts = Counter()
+    for _ in range(24_000):
+        items = list("abcd")
+        rand.shuffle(items)
+        counts["".join(items)] += 1
+    assert len(counts) == 24
+    assert all(800 < count < 1200 for count in counts.values())
+
+
+def test_seeded_source_is_reproducible():
+    """Ensure seeded sources repeat per (seed, stream) and differ otherwise."""
+    assert seeded_source(1)(32) == seeded_source(1)(32)
+    assert seeded_source(1, 0)(32) != seeded_source(1, 1)(32)
+    sampler = CharSampler("abcdef", source=seeded_source(3))
+    assert sampler.sample(50) == CharSampler("abcdef", seeded_source(3)).sample(50)
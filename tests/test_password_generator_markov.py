@@ -0,0 +1,201 @@
+"""
+Test suite for pronounceable passwords from a Markov model.
+
+This module tests:
+- Training, back-off and smoothing
+- Saving and loading model files
+- Exact entropy, min-entropy and collision entropy of a model
+- Pronounceable password generation
+"""
+
+import math
+import os
+import struct
+import tempfile
+from collections import Counter
+
+import pytest
+
+from password_generator.engine import seeded_source
+from password_generator.markov import MarkovModel, PronounceableGenerator
+from password_generator.unique import expected_duplicates
+
+# ============================================================================
+# Training and model files
+# ============================================================================
+
+
+def test_train_counts_transitions_as_cumulative_weights():
+    """Ensure each context stores its next characters with cumulative counts."""
+    model = MarkovModel.train(["ab", "aa", "Ab", "a-b"], order=2, smoothing=0)
+    assert model.tables["^"] == ("a", model.tables["^"][1])
+    assert list(model.tables["^"][1]) == [3]
+    chars, cumulative = model.tables["a"]
+    assert chars == "ab"
+    assert list(cumulative) == [1, 3]
+
+
+def test_table_backs_off_to_shorter_contexts():
+    """Ensure an unseen context uses its longest known suffix."""
+    model = MarkovModel.train(["abc"], order=3, smoothing=0)
+    assert model.table("zb") == model.tables["b"]
+    assert model.table("zz") == model.tables[""]
+
+
+def test_smoothing_covers_every_letter():
+    """Ensure smoothing gives every letter a weight in every context."""
+    model = MarkovModel.train(["ab"], order=2)
+    chars, cumulative = model.tables["a"]
+    assert chars == "abcdefghijklmnopqrstuvwxyz"
+    assert cumulative[-1] == 26 + 1
+
+
+@pytest.mark.parametrize(
+    "words, options",
+    [([], {}), (["a1", "--"], {}), (["ab"], {"order": 0}), (["ab"], {"smoothing": -1})],
+)
+def test_train_rejects_invalid_input(words, options):
+    """Ensure empty corpora and bad settings raise ValueError."""
+    with pytest.raises(ValueError):
+        MarkovModel.train(words, **options)
+
+
+def test_save_and_load_round_trip():
+    """Ensure a saved model loads with the same tables."""
+    model = MarkovModel.train(["hello", "world", "help"], order=3)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "model.bin")
+        model.save(path)
+        loaded = MarkovModel.load(path)
+    assert loaded.order == 3
+    assert loaded.tables == model.tables
+
+
+def test_load_rejects_other_files():
+    """Ensure a file that is not a model raises ValueError."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "model.bin")
+        with open(path, "wb") as f:
+            f.write(b"not a model at all")
+        with pytest.raises(ValueError, match="not a Markov model"):
+            MarkovModel.load(path)
+
+
+def test_saved_counts_are_little_endian():
+    """Ensure cumulative counts are written little-endian on any host."""
+    model = MarkovModel.train(["ab"] * 300, order=1, smoothing=0)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "model.bin")
+        model.save(path)
+        with open(path, "rb") as f:
+            data = f.read()
+    assert data.endswith(b"ab" + struct.pack("<2I", 300, 600))
+
+
+@pytest.mark.parametrize("cut", [1, 4, 5 * 26])
+def test_load_rejects_truncated_files(cut):
+    """Ensure a model file shorter than its header claims raises ValueError."""
+    model = MarkovModel.train(["hello", "world"], order=2)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "model.bin")
+        model.save(path)
+        with open(path, "rb") as f:
+            data = f.read()
+        with open(path, "wb") as f:
+            f.write(data[:-cut])
+        with pytest.raises(ValueError, match="truncated"):
+            MarkovModel.load(path)
+
+
+def test_load_rejects_trailing_data():
+    """Ensure bytes after the last table are not silently ignored."""
+    model = MarkovModel.train(["hello"], order=2)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "model.bin")
+        model.save(path)
+        with open(path, "ab") as f:
+            f.write(b"\0\0\0\0")
+        with pytest.raises(ValueError):
+            MarkovModel.load(path)
+
+
+def test_bundled_model_loads():
+    """Ensure the model shipped with the package is usable."""
+    model = MarkovModel.load()
+    assert model.order == 3
+    assert "" in model.tables
+
+
+# ============================================================================
+# Entropy
+# ============================================================================
+
+
+def test_entropy_matches_hand_computation():
+    """Ensure Shannon and min-entropy are computed exactly, with back-off."""
+    # ^ -> a; a -> a or b (1:1); b is unseen and backs off to a:b = 3:1.
+    model = MarkovModel.train(["ab", "aa"], order=2, smoothing=0)
+    shannon, min_entropy, collision, combinations = model.entropy(3)
+    h = -(0.75 * math.log2(0.75) + 0.25 * math.log2(0.25))
+    assert shannon == pytest.approx(1 + 0.5 + 0.5 * h)
+    # The likeliest password is "aba" with probability 1/2 * 3/4.
+    assert min_entropy == pytest.approx(-math.log2(0.375))
+    # aaa, aab, aba and abb have probabilities 1/4, 1/4, 3/8 and 1/8.
+    assert collision == pytest.approx(-math.log2((4 + 4 + 9 + 1) / 64))
+    assert combinations == 4
+
+
+def test_min_entropy_grows_with_length():
+    """Ensure the bundled model adds min-entropy with every character."""
+    bits = [
+        PronounceableGenerator.from_file(length=n).min_entropy_bits for n in (8, 12, 16)
+    ]
+    assert bits[0] < bits[1] < bits[2]
+    shannon = PronounceableGenerator.from_file(length=12).entropy_bits
+    assert bits[1] < shannon < 12 * math.log2(26)
+
+
+def test_collision_entropy_predicts_repeats():
+    """Ensure the collision estimate matches the repeats of a sampled run."""
+    model = MarkovModel.train(["banana", "bandana", "cabana", "canal"], order=2)
+    gen = PronounceableGenerator(model, length=4, source=seeded_source(7))
+    count = 20_000
+    repeats = Counter(gen.generate_many(count))
+    pairs = sum(n * (n - 1) // 2 for n in repeats.values())
+
+    expected = expected_duplicates(
+        count, gen.combinations, 2**-gen.collision_entropy_bits
+    )
+    assert gen.min_entropy_bits < gen.collision_entropy_bits < gen.entropy_bits
+    # Far more repeats than a uniform draw from the 26**4 passwords.
+    assert expected > 5 * expected_duplicates(count, gen.combinations)
+    assert pairs == pytest.approx(expected, rel=0.1)
+
+
+# ============================================================================
+# Generation
+# ============================================================================
+
+
+def test_generate_follows_the_model():
+    """Ensure passwords only use transitions present in the model."""
+    model = MarkovModel.train(["abab", "baba"], order=2, smoothing=0)
+    generator = PronounceableGenerator(model, length=9)
+    for password in generator.generate_many(50):
+        assert len(password) == 9
+        assert "aa" not in password and "bb" not in password
+
+
+def test_generate_is_reproducible_with_a_seeded_source():
+    """Ensure the same source gives the same passwords."""
+    model = MarkovModel.load()
+    first = PronounceableGenerator(model, source=seeded_source(5))
+    second = PronounceableGenerator(model, source=seeded_source(5))
+    assert list(first.generate_many(5)) == list(second.generate_many(5))
+    assert all(password.isalpha() for password in first.generate_many(20))
+
+
+def test_generator_rejects_invalid_length():
+    """Ensure a length below 1 raises ValueError."""
+    with pytest.raises(ValueError):
+        PronounceableGenerator(MarkovModel.load(), length=0)
@@ -0,0 +1,108 @@
+"""
+Test suite for multi-process password generation.
+
+This module tests:
+- Splitting counts into chunks
+- Ordered merging across worker processes
+- The ordered process-pool map
+- Shard files written by each worker
+- Reproducible output in seeded test mode
+"""
+
+import itertools
+import os
+import tempfile
+from functools import partial
+
+import pytest
+
+from password_generator.parallel import (
+    chunk_sizes,
+    generate_ordered,
+    map_ordered,
+    write_shards,
+)
+from password_generator.password_generator import PasswordGenerator
+
+FACTORY = partial(PasswordGenerator, length=8)
+
+
+def merged(factory=FACTORY, count=1000, workers=1, seed=None):
+    return "".join(generate_ordered(factory, count, workers, seed, chunk_size=128))
+
+
+# ============================================================================
+# Ordered merge
+# ============================================================================
+
+
+def test_chunk_sizes():
+    """Ensure counts are split into full chunks and one remainder."""
+    assert chunk_sizes(10, 4) == [4, 4, 2]
+    assert chunk_sizes(8, 4) == [4, 4]
+    assert chunk_sizes(0, 4) == []
+    with pytest.raises(ValueError):
+        chunk_sizes(-1)
+
+
+def test_ordered_merge_produces_every_password():
+    """Ensure the merged stream holds the requested number of passwords."""
+    lines = merged(count=1000, workers=3).splitlines()
+    assert len(lines) == 1000
+    assert all(len(line) == 8 for line in lines)
+    assert len(set(lines)) > 990
+
+
+def test_seed_is_independent_of_worker_count():
+    """Ensure seeded output is identical for any number of workers."""
+    single = merged(count=1000, workers=1, seed=42)
+    assert merged(count=1000, workers=3, seed=42) == single
+    assert merged(count=1000, workers=2, seed=43) != single
+
+
+def test_unseeded_runs_differ():
+    """Ensure normal mode draws fresh OS entropy every run."""
+    assert merged(count=100) != merged(count=100)
+
+
+def test_invalid_workers():
+    """Ensure fewer than one worker is rejected."""
+    with pytest.raises(ValueError):
+        merged(workers=0)
+
+
+def test_map_ordered_keeps_order_with_endless_input():
+    """Ensure results follow input order and endless inputs are consumed lazily."""
+    results = map_ordered(pow, itertools.count(), itertools.repeat(2), workers=2)
+    assert list(itertools.islice(results, 50)) == [i * i for i in range(50)]
+    results.close()
+    assert list(map_ordered(divmod, [7, 9], [2, 4])) == [(3, 1), (2, 1)]
+
+
+# ============================================================================
+# Shards
+# ============================================================================
+
+
+def test_shards_concatenate_to_merged_stream():
+    """Ensure shards, read in order, equal the merged output for the same seed."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = write_shards(FACTORY, 1000, tmpdir, workers=3, seed=5, chunk_size=128)
+        assert [os.path.basename(path) for path in paths] == [
+            "shard-0000.txt",
+            "shard-0001.txt",
+            "shard-0002.txt",
+        ]
+        text = ""
+        for path in paths:
+            with open(path, encoding="utf-8") as f:
+                text += f.read()
+
+    assert text == merged(count=1000, workers=1, seed=5)
+
+
+def test_never_more_shards_than_chunks():
+    """Ensure small jobs do not create empty shards."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = write_shards(FACTORY, 100, tmpdir, workers=4, chunk_size=64)
+        assert len(paths) == 2
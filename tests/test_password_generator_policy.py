@@ -0,0 +1,156 @@
+"""
+Test suite for password policies.
+
+This module tests:
+- Validation of classes, minimums and repeat limits
+- Constructive generation meeting every minimum
+- Uniformity and exact entropy
+- Repeat limits and exclusions
+- PasswordGenerator integration
+"""
+
+import math
+from collections import Counter
+from itertools import groupby, product
+
+import pytest
+
+from password_generator.password_generator import PasswordGenerator
+from password_generator.policy import AMBIGUOUS, Policy
+
+HEX = {"letters": "abcdef", "digits": "0123456789"}
+
+# ============================================================================
+# Validation
+# ============================================================================
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"length": 4, "minimums": {"digits": 3, "specials": 2}},
+        {"length": 8, "minimums": {"emoji": 1}},
+        {"length": 8, "minimums": {"digits": -1}},
+        {"length": 8, "max_repeat": 0},
+        {"length": 8, "classes": {"a": "abc", "b": "cde"}},
+        {"length": 3, "classes": {"a": "a"}, "max_repeat": 2},
+        {"length": 8, "minimums": {"digits": 1}, "exclude": "0123456789"},
+        {"length": 8, "classes": {"a": "abc"}, "exclude": "abc"},
+    ],
+)
+def test_invalid_policies(kwargs):
+    """Ensure impossible or inconsistent policies are rejected up front."""
+    with pytest.raises(ValueError):
+        Policy(**kwargs)
+
+
+# ============================================================================
+# Generation
+# ============================================================================
+
+
+def test_minimums_always_met():
+    """Ensure every password contains the required characters."""
+    policy = Policy(10, minimums={"digits": 2, "specials": 1, "upper": 1})
+    for password in policy.generate_many(2000):
+        assert len(password) == 10
+        assert sum(c.isdigit() for c in password) >= 2
+        assert sum(c.isupper() for c in password) >= 1
+        assert sum(c in policy.classes["specials"] for c in password) >= 1
+
+
+def test_minimums_can_fill_the_whole_password():
+    """Ensure minimums adding up to the length are satisfied exactly."""
+    policy = Policy(4, HEX, {"letters": 2, "digits": 2})
+    for password in policy.generate_many(200):
+        assert sorted(c.isdigit() for c in password) == [False, False, True, True]
+
+
+def test_constrained_output_is_uniform():
+    """Ensure every allowed password is equally likely."""
+    policy = Policy(2, {"a": "ab", "d": "01"}, {"d": 1})
+    counts = Counter(policy.generate_many(48_000))
+
+    assert policy.combinations == 12
+    assert len(counts) == 12
+    assert all(3_500 < count < 4_500 for count in counts.values())
+
+
+def test_entropy_counts_allowed_passwords():
+    """Ensure entropy is log2 of the number of passwords the policy allows."""
+    assert Policy(8, HEX).entropy_bits == pytest.approx(8 * math.log2(16))
+    # 4-character hex strings with at least one digit.
+    policy = Policy(4, HEX, {"digits": 1})
+    assert policy.combinations == 16**4 - 6**4
+    assert policy.entropy_bits == pytest.approx(math.log2(16**4 - 6**4))
+
+
+def test_max_repeat_is_respected():
+    """Ensure no character repeats more often in a row than allowed."""
+    policy = Policy(12, {"a": "abc"}, max_repeat=1)
+    for password in policy.generate_many(500):
+        assert max(len(list(run)) for _, run in groupby(password)) == 1
+
+
+def test_max_repeat_counts_and_samples_exactly():
+    """Ensure run limits are counted exactly and every password is equally likely."""
+    assert Policy(4, {"x": "abc"}, max_repeat=1).combinations == 3 * 2**3
+    policy = Policy(4, {"a": "ab", "d": "01"}, {"d": 1}, max_repeat=2)
+    allowed = {
+        "".join(chars)
+        for chars in product("ab01", repeat=4)
+        if any(c in "01" for c in chars)
+        and max(len(list(run)) for _, run in groupby(chars)) <= 2
+    }
+    counts = Counter(policy.generate_many(40_000))
+
+    assert policy.combinations == len(allowed) == 218
+    assert policy.entropy_bits == pytest.approx(math.log2(218))
+    assert set(counts) == allowed
+    assert all(120 < count < 250 for count in counts.values())
+
+
+def test_exclusions_and_duplicates_removed():
+    """Ensure excluded characters never appear and classes are deduplicated."""
+    policy = Policy(16, exclude=AMBIGUOUS, minimums={"digits": 4})
+    assert not set(AMBIGUOUS) & set(policy.alphabet)
+    assert not set(AMBIGUOUS) & set("".join(policy.generate_many(500)))
+    assert Policy(4, {"a": "aabbc"}).classes == {"a": "abc"}
+
+
+# ============================================================================
+# PasswordGenerator integration
+# ============================================================================
+
+
+def test_generator_uses_policy_when_constrained():
+    """Ensure minimums and custom charsets switch the generator to a policy."""
+    gen = PasswordGenerator(
+        length=8,
+        use_specials=False,
+        minimums={"symbols": 3},
+        charsets={"symbols": "+-*"},
+    )
+    assert gen.constrained
+    assert set(gen.alphabet) == set(gen.policy().alphabet)
+    for password in gen.generate_many(200):
+        assert sum(c in "+-*" for c in password) >= 3
+        assert not set(password) & set("!@#$%")
+
+
+def test_generator_policy_is_recompiled_after_changes():
+    """Ensure changed settings produce a new compiled policy."""
+    gen = PasswordGenerator(length=8, minimums={"digits": 1})
+    first = gen.policy()
+    assert gen.policy() is first
+    gen.length = 9
+    assert gen.policy() is not first
+    assert len(gen.generate()) == 9
+
+
+def test_generator_entropy_and_exclusions():
+    """Ensure the unconstrained generator reports entropy and honours exclude."""
+    gen = PasswordGenerator(length=10, use_specials=False, exclude=AMBIGUOUS)
+    assert not gen.constrained
+    assert len(gen.alphabet) == 62 - len(AMBIGUOUS)
+    assert gen.entropy_bits == pytest.approx(10 * math.log2(57))
@@ -0,0 +1,176 @@
+"""
+Test suite for bulk credential provisioning.
+
+This module tests:
+- scrypt and PBKDF2 hashes in Django's encodings, and verification
+- Ordered records hashed on one or several processes
+- CSV and JSON-lines output
+- The provision subcommand
+"""
+
+import base64
+import csv
+import hashlib
+import io
+import json
+import os
+import tempfile
+from unittest.mock import patch
+
+import pytest
+
+from password_generator.engine import seeded_source
+from password_generator.password_generator import PasswordGenerator, main
+from password_generator.provision import (
+    hash_password,
+    provision,
+    read_users,
+    verify_password,
+    write_records,
+)
+
+USERS = [f"user{i}" for i in range(40)]
+
+
+def records(**options):
+    generator = PasswordGenerator(10, source=seeded_source(1))
+    options.setdefault("cost", 16)
+    return list(
+        provision(USERS, generator.generate_many(), source=seeded_source(2), **options)
+    )
+
+
+# ============================================================================
+# Hashes
+# ============================================================================
+
+
+def test_pbkdf2_hash_encoding():
+    """Ensure PBKDF2 hashes use the pbkdf2_sha256$iterations$salt$hash format."""
+    encoded = hash_password("secret", "NaCl", "pbkdf2", 1000)
+    digest = hashlib.pbkdf2_hmac("sha256", b"secret", b"NaCl", 1000)
+    assert encoded == "pbkdf2_sha256$1000$NaCl$" + base64.b64encode(digest).decode()
+
+
+def test_scrypt_hash_encoding():
+    """Ensure scrypt hashes use the scrypt$salt$n$r$p$hash format."""
+    encoded = hash_password("secret", "NaCl", "scrypt", 16)
+    digest = hashlib.scrypt(b"secret", salt=b"NaCl", n=16, r=8, p=1, dklen=64)
+    assert encoded == "scrypt$NaCl$16$8$1$" + base64.b64encode(digest).decode()
+
+
+@pytest.mark.parametrize("algorithm, cost", [("scrypt", 16), ("pbkdf2", 10)])
+def test_verify_password(algorithm, cost):
+    """Ensure hashes verify against the right password only."""
+    encoded = hash_password("pässword", "salt", algorithm, cost)
+    assert verify_password("pässword", encoded)
+    assert not verify_password("password", encoded)
+
+
+@pytest.mark.parametrize(
+    "algorithm, cost", [("scrypt", 1000), ("scrypt", 1), ("pbkdf2", 0), ("md5", None)]
+)
+def test_invalid_hash_settings(algorithm, cost):
+    """Ensure unknown algorithms and bad costs raise ValueError."""
+    with pytest.raises(ValueError):
+        hash_password("secret", "salt", algorithm, cost)
+
+
+# ============================================================================
+# Records
+# ============================================================================
+
+
+def test_records_keep_user_order_and_verify():
+    """Ensure there is one record per user, in order, with a matching hash."""
+    result = records(batch_size=7)
+    assert [user for user, _, _ in result] == USERS
+    assert all(verify_password(password, hashed) for _, password, hashed in result)
+    salts = {hashed.split("$")[1] for _, _, hashed in result}
+    assert len(salts) == len(USERS)
+
+
+def test_records_are_the_same_with_several_workers():
+    """Ensure hashing on a process pool changes neither order nor content."""
+    assert records(workers=2, batch_size=3) == records(workers=1)
+
+
+def test_provision_rejects_bad_settings_immediately():
+    """Ensure invalid settings fail before anything is generated."""
+    passwords = iter(["never used"])
+    with pytest.raises(ValueError):
+        provision(["a"], passwords, "scrypt", cost=3)
+    with pytest.raises(ValueError):
+        provision(["a"], passwords, workers=0)
+    assert next(passwords) == "never used"
+
+
+def test_write_records_formats():
+    """Ensure CSV has a header and quoting, and JSON lines one object each."""
+    rows = [("a,b", 'p"w', "h1"), ("c", "pw", "h2")]
+    out = io.StringIO()
+    assert write_records(rows, out, "csv") == 2
+    assert list(csv.reader(io.StringIO(out.getvalue()))) == [
+        ["user", "password", "hash"],
+        ["a,b", 'p"w', "h1"],
+        ["c", "pw", "h2"],
+    ]
+
+    out = io.StringIO()
+    assert write_records(rows, out, "jsonl") == 2
+    first = json.loads(out.getvalue().splitlines()[0])
+    assert first == {"user": "a,b", "password": 'p"w', "hash": "h1"}
+
+
+def test_read_users_skips_blank_lines():
+    """Ensure usernames are stripped and blank lines ignored."""
+    assert list(read_users([" alice \n", "\n", "bob\r\n"])) == ["alice", "bob"]
+
+
+# ============================================================================
+# Command line
+# ============================================================================
+
+
+def test_cli_provision_to_file():
+    """Ensure 'provision' writes a verified record per user, reproducibly."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        users = os.path.join(tmpdir, "users.txt")
+        with open(users, "w") as f:
+            f.write("alice\nbob\n")
+        outputs = []
+        for workers in ("1", "2"):
+            output = os.path.join(tmpdir, f"out{workers}.jsonl")
+            main(
+                ["--seed", "4", "--workers", workers, "-o", output]
+                + ["provision", users, "--format", "jsonl", "--hash-cost", "16"]
+            )
+            with open(output) as f:
+                outputs.append([json.loads(line) for line in f])
+    assert outputs[0] == outputs[1]
+    assert [record["user"] for record in outputs[0]] == ["alice", "bob"]
+    assert all(verify_password(r["password"], r["hash"]) for r in outputs[0])
+
+
+def test_cli_provision_reads_standard_input(capsys):
+    """Ensure '-' reads usernames from stdin and CSV goes to stdout."""
+    with patch("sys.stdin", io.StringIO("carol\n")):
+        main(["provision", "-", "--hash", "pbkdf2", "--hash-cost", "10"])
+    rows = list(csv.reader(io.StringIO(capsys.readouterr().out)))
+    assert rows[0] == ["user", "password", "hash"]
+    assert rows[1][0] == "carol"
+    assert rows[1][2].startswith("pbkdf2_sha256$10$")
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["provision", "/nonexistent/users.txt"],
+        ["provision", "-", "--hash-cost", "3"],
+        ["--unique", "provision", "-"],
+    ],
+)
+def test_cli_provision_rejects_invalid_settings(argv):
+    """Ensure unreadable input and bad settings are usage errors."""
+    with pytest.raises(SystemExit):
+        main(argv)
@@ -0,0 +1,296 @@
+"""
+Test suite for the password vending server.
+
+This module tests:
+- Password pools, their background filler thread and shared policies
+- Request parsing, per-request policies and error replies
+- Concurrent clients over a Unix domain socket
+- Stale socket handling and the fetch() client
+"""
+
+import asyncio
+import os
+import socket
+import stat
+import tempfile
+import time
+from functools import partial
+
+import pytest
+
+from password_generator.password_generator import PasswordGenerator, main
+from password_generator.server import POOL_SIZE, PasswordPool, PasswordServer, fetch
+from password_generator.server import remove_stale_socket
+
+
+def make_server(**options):
+    return PasswordServer(partial(PasswordGenerator, length=10), **options)
+
+
+def ask(server, line):
+    return asyncio.run(server.respond(line))
+
+
+class SlowGenerator(PasswordGenerator):
+    """A generator whose first password takes long, like a large policy."""
+
+    def generate(self):
+        time.sleep(0.5)
+        return super().generate()
+
+
+# ============================================================================
+# Pools
+# ============================================================================
+
+
+def test_pool_fills_in_the_background():
+    """Ensure the filler thread fills the pool up to its size."""
+    pool = PasswordPool(PasswordGenerator(length=8), size=50)
+    try:
+        for _ in range(100):
+            if pool.ready == 50:
+                break
+            time.sleep(0.01)
+        assert pool.ready == 50
+        assert [len(p) for p in pool.take(5)] == [8] * 5
+    finally:
+        pool.close()
+
+
+def test_pool_serves_more_than_it_holds():
+    """Ensure a request larger than the pool is completed by the fallback."""
+    pool = PasswordPool(PasswordGenerator(length=8), size=1)
+    try:
+        passwords = pool.take(200)
+    finally:
+        pool.close()
+    assert len(passwords) == 200
+    assert len(set(passwords)) == 200
+
+
+def test_pool_generators_share_one_compiled_policy():
+    """Ensure the filler and fallback generators do not compile the policy twice."""
+    generator = PasswordGenerator(length=12, minimums={"digits": 2}, max_repeat=1)
+    policy = generator.policy()
+    copy = generator.copy()
+    assert copy.policy()._runs is policy._runs
+    assert copy.policy()._random is not policy._random
+    password = copy.generate()
+    assert len(password) == 12 and sum(c.isdigit() for c in password) >= 2
+
+
+# ============================================================================
+# Requests
+# ============================================================================
+
+
+def test_get_uses_request_options():
+    """Ensure GET returns one OK line per password with the given policy."""
+    server = make_server(pool_size=10)
+    try:
+        reply = ask(server, "GET count=3 length=6 digits=no specials=no")
+        lines = reply.splitlines()
+        assert len(lines) == 3
+        assert all(line.startswith("OK ") and line[3:].isalpha() for line in lines)
+        assert all(len(line) == 9 for line in lines)
+        assert len(ask(server, "GET").strip()) == len("OK ") + 10
+    finally:
+        server.close()
+
+
+def test_min_options_extend_the_default_minimums():
+    """Ensure min.CLASS is merged with the daemon's own minimums."""
+    factory = partial(PasswordGenerator, length=10, minimums={"upper": 2})
+    server = PasswordServer(factory, pool_size=10)
+    try:
+        count, options = server.parse_options(["min.digits=3", "max-repeat=2"])
+        assert count == 1
+        assert options == {"minimums": {"upper": 2, "digits": 3}, "max_repeat": 2}
+        password = ask(server, "GET min.digits=3")[3:].strip()
+        assert sum(c.isdigit() for c in password) >= 3
+        assert sum(c.isupper() for c in password) >= 2
+    finally:
+        server.close()
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "GET count=0",
+        "GET count=5000",
+        "GET length=x",
+        "GET digits=maybe",
+        "GET colour=red",
+        "GET length",
+        "GET length=4 min.digits=5",
+        "STATS now",
+        "FETCH",
+        "",
+    ],
+)
+def test_invalid_requests_get_one_error_line(line):
+    """Ensure bad requests are answered with a single ERR line."""
+    server = make_server(pool_size=10)
+    try:
+        reply = ask(server, line)
+    finally:
+        server.close()
+    assert reply.startswith("ERR ") and reply.count("\n") == 1
+
+
+def test_stats_and_quit():
+    """Ensure STATS reports pools and served passwords and QUIT closes."""
+    server = make_server(pool_size=10)
+    try:
+        ask(server, "GET count=4")
+        assert ask(server, "stats").startswith("OK pools=1 ready=")
+        assert ask(server, "STATS").strip().endswith("served=4")
+        assert ask(server, "QUIT") is None
+    finally:
+        server.close()
+
+
+def test_least_recently_used_pool_is_stopped():
+    """Ensure at most max_pools policies are kept warm."""
+    server = make_server(pool_size=10, max_pools=2)
+    try:
+        for length in (5, 6, 5, 7):
+            ask(server, f"GET length={length}")
+        assert [dict(key)["length"] for key in server._pools] == [5, 7]
+    finally:
+        server.close()
+
+
+# ============================================================================
+# Socket
+# ============================================================================
+
+
+async def exchange(path, request):
+    reader, writer = await asyncio.open_unix_connection(path)
+    writer.write(request)
+    reply = await reader.read()
+    writer.close()
+    return reply.decode()
+
+
+def test_concurrent_clients_over_the_socket():
+    """Ensure many clients are served at once over a private socket."""
+
+    async def scenario(path):
+        server = make_server(pool_size=100)
+        listener = await server.start(path)
+        try:
+            assert stat.S_IMODE(os.stat(path).st_mode) & 0o077 == 0
+            replies = await asyncio.gather(
+                *(
+                    exchange(path, b"GET count=5\nGET length=4\nQUIT\n")
+                    for _ in range(50)
+                )
+            )
+            fetched = await asyncio.to_thread(
+                fetch, path, 3, {"specials": "no", "min.digits": 4}
+            )
+            long_line = await exchange(path, b"GET " + b"x" * 10000 + b"\n")
+        finally:
+            listener.close()
+            server.close()
+        return replies, fetched, long_line
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        replies, fetched, long_line = asyncio.run(scenario(os.path.join(tmpdir, "s")))
+
+    passwords = [line[3:] for reply in replies for line in reply.splitlines()]
+    assert len(passwords) == 50 * 6
+    assert len(set(passwords)) == len(passwords)
+    assert len(fetched) == 3 and all(len(p) == 10 for p in fetched)
+    assert all(sum(c.isdigit() for c in p) >= 4 for p in fetched)
+    assert all(p.isalnum() for p in fetched)
+    assert long_line.startswith("ERR ")
+
+
+def test_slow_policy_does_not_block_other_clients():
+    """Ensure STATS is answered while a new policy is still being compiled."""
+
+    async def scenario(path):
+        server = PasswordServer(partial(SlowGenerator, length=10), pool_size=10)
+        listener = await server.start(path)
+        finished = []
+
+        async def request(line):
+            reply = await exchange(path, line)
+            finished.append(line.split()[0])
+            return reply
+
+        try:
+            slow = asyncio.create_task(request(b"GET length=8\nQUIT\n"))
+            await asyncio.sleep(0.1)
+            stats = await request(b"STATS\nQUIT\n")
+            await slow
+        finally:
+            listener.close()
+            server.close()
+        return stats, slow.result(), finished
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        stats, slow, finished = asyncio.run(scenario(os.path.join(tmpdir, "s")))
+
+    assert stats.startswith("OK pools=0 ")
+    assert len(slow.strip()) == len("OK ") + 8
+    assert finished == [b"STATS", b"GET"]
+
+
+def test_fetch_raises_on_error_reply():
+    """Ensure fetch() turns an ERR line into ValueError."""
+
+    async def scenario(path):
+        server = make_server(pool_size=10)
+        listener = await server.start(path)
+        try:
+            await asyncio.to_thread(fetch, path, 2, {"length": "long"})
+        finally:
+            listener.close()
+            server.close()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with pytest.raises(ValueError, match="length"):
+            asyncio.run(scenario(os.path.join(tmpdir, "s")))
+
+
+def test_fetch_rejects_whitespace_in_options():
+    """Ensure an option that would split the request line is refused."""
+    with pytest.raises(ValueError, match="whitespace"):
+        fetch("unused.sock", 1, {"exclude": "a b"})
+
+
+def test_remove_stale_socket():
+    """Ensure dead sockets are removed and other files are left alone."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "s")
+        with socket.socket(socket.AF_UNIX) as dead:
+            dead.bind(path)
+        remove_stale_socket(path)
+        assert not os.path.exists(path)
+
+        with open(path, "w") as f:
+            f.write("data")
+        with pytest.raises(ValueError):
+            remove_stale_socket(path)
+        assert os.path.exists(path)
+
+
+@pytest.mark.parametrize(
+    "argv", [["--words", "4", "serve", "s"], ["serve", "s", "--pool-size", "0"]]
+)
+def test_cli_rejects_invalid_serve(argv):
+    """Ensure unsupported serve settings are usage errors."""
+    with pytest.raises(SystemExit):
+        main(argv)
+
+
+def test_cli_serve_help_shows_pool_default(capsys):
+    """Ensure the serve help states the server's default pool size."""
+    with pytest.raises(SystemExit):
+        main(["serve", "--help"])
+    assert f"(default: {POOL_SIZE})" in capsys.readouterr().out
@@ -0,0 +1,92 @@
+"""
+Test suite for unique bulk output.
+
+This module tests:
+- The fixed-width fingerprint table
+- Filtering repeats from a stream
+- Collision estimates
+"""
+
+import math
+from itertools import cycle
+
+import pytest
+
+from password_generator.password_generator import PasswordGenerator
+from password_generator.unique import (
+    UniqueFilter,
+    collision_probability,
+    expected_duplicates,
+    unique,
+)
+
+# ============================================================================
+# Fingerprint table
+# ============================================================================
+
+
+def test_filter_detects_repeats():
+    """Ensure an item is accepted once and rejected afterwards."""
+    seen = UniqueFilter(10)
+    assert seen.add("abc")
+    assert seen.add("abd")
+    assert not seen.add("abc")
+    assert seen.count == 2
+
+
+def test_filter_memory_is_bounded():
+    """Ensure the table stays within a few machine words per item."""
+    seen = UniqueFilter(1_000_000)
+    assert seen.nbytes / 1_000_000 <= 24
+    assert UniqueFilter(0).nbytes > 0
+
+
+def test_filter_refuses_to_overfill():
+    """Ensure the table never exceeds its load limit."""
+    seen = UniqueFilter(6)
+    for i in range(seen.capacity):
+        assert seen.add(str(i))
+    with pytest.raises(ValueError):
+        seen.add("one too many")
+
+
+def test_filter_handles_probe_chains():
+    """Ensure colliding slots are probed until a free one is found."""
+    seen = UniqueFilter(5000)
+    items = [f"item{i}" for i in range(5000)]
+    assert all(seen.add(item) for item in items)
+    assert not any(seen.add(item) for item in items)
+
+
+# ============================================================================
+# Streams and estimates
+# ============================================================================
+
+
+def test_unique_skips_repeats_and_stops_at_count():
+    """Ensure exactly ``count`` distinct items are taken from a stream."""
+    assert list(unique(cycle("abcabd"), 4)) == ["a", "b", "c", "d"]
+    assert list(unique(iter("aaa"), 0)) == []
+
+
+def test_unique_passwords_from_small_space():
+    """Ensure short passwords are unique even when repeats are likely."""
+    gen = PasswordGenerator(length=2, use_digits=False, use_specials=False)
+    passwords = list(unique(gen.generate_many(), 2000))
+    assert len(passwords) == len(set(passwords)) == 2000
+
+
+def test_collision_estimates():
+    """Ensure the birthday estimate matches known values."""
+    assert expected_duplicates(2, 4) == pytest.approx(0.25)
+    assert collision_probability(23, 365) == pytest.approx(0.5, abs=0.02)
+    assert collision_probability(10, 5) == 1.0
+    assert collision_probability(1000, 62**16) < 1e-20
+    assert collision_probability(10**7, 62**8) == pytest.approx(
+        -math.expm1(-(10**7) * (10**7 - 1) / (2 * 62**8))
+    )
+    # A non-uniform source repeats according to its own collision probability.
+    assert expected_duplicates(2, 4, collision=0.5) == pytest.approx(0.5)
+    assert collision_probability(10, 26**8, collision=0.01) == pytest.approx(
+        -math.expm1(-0.45)
+    )
@@ -0,0 +1,143 @@
+"""
+Test suite for memory-mapped wordlists and passphrases.
+
+This module tests:
+- Parsing plain and EFF-style wordlists
+- Building, reusing and rebuilding the offset index
+- Read-only locations, invalid lists and the bundled EFF list
+- Passphrase generation and entropy, with and without --wordlist
+"""
+
+import math
+import os
+import tempfile
+from unittest.mock import patch
+
+import pytest
+
+from password_generator import wordlist
+from password_generator.password_generator import main
+from password_generator.wordlist import PassphraseGenerator, WordList
+
+EFF_STYLE = "# sample\n11111\tabacus\n11112\tabdomen\n\n11113\tabdominal\r\n11114 abide"
+
+
+def write_list(tmpdir, content=EFF_STYLE, name="words.txt"):
+    path = os.path.join(tmpdir, name)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+    return path
+
+
+# ============================================================================
+# Word access and the index
+# ============================================================================
+
+
+def test_reads_words_from_eff_format():
+    """Ensure dice numbers, comments, blank lines and CRLF are handled."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        words = WordList(write_list(tmpdir))
+        assert len(words) == 4
+        assert [words[i] for i in range(4)] == [
+            "abacus",
+            "abdomen",
+            "abdominal",
+            "abide",
+        ]
+        words.close()
+
+
+def test_index_is_written_once_and_reused():
+    """Ensure the index is cached next to the list and mapped on later runs."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = write_list(tmpdir, "\n".join(f"word{i}" for i in range(1000)))
+        WordList(path).close()
+        assert os.path.exists(path + ".idx")
+
+        with patch.object(wordlist, "build_offsets") as build:
+            words = WordList(path)
+            assert words[999] == "word999"
+            words.close()
+        build.assert_not_called()
+
+
+def test_index_is_rebuilt_when_list_changes():
+    """Ensure a stale index is not used after the list is edited."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = write_list(tmpdir, "alpha\nbeta\n")
+        WordList(path).close()
+        write_list(tmpdir, "gamma\ndelta\nepsilon\n")
+        os.utime(path, ns=(1, 1))
+
+        words = WordList(path)
+        assert [words[i] for i in range(len(words))] == ["gamma", "delta", "epsilon"]
+        words.close()
+
+
+def test_read_only_location_keeps_index_in_memory():
+    """Ensure a list in an unwritable directory can still be used."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = write_list(tmpdir)
+        with patch.object(wordlist, "write_index", side_effect=PermissionError):
+            words = WordList(path)
+        assert len(words) == 4
+        assert not os.path.exists(path + ".idx")
+        words.close()
+
+
+def test_invalid_lists():
+    """Ensure empty lists, lists without words and a missing bundle are errors."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with pytest.raises(ValueError):
+            WordList(write_list(tmpdir, ""))
+        with pytest.raises(ValueError):
+            WordList(write_list(tmpdir, "# only a comment\n\n", "comments.txt"))
+        with patch.object(
+            wordlist, "BUNDLED_WORDLIST", os.path.join(tmpdir, "missing.txt")
+        ):
+            with pytest.raises(FileNotFoundError):
+                WordList()
+
+
+def test_bundled_eff_list():
+    """Ensure the EFF large wordlist ships with the package and is the default."""
+    words = WordList()
+    try:
+        assert len(words) == 6**5
+        assert (words[0], words[-1]) == ("abacus", "zoom")
+    finally:
+        words.close()
+
+
+# ============================================================================
+# Passphrases
+# ============================================================================
+
+
+def test_passphrases_use_list_words():
+    """Ensure passphrases have the requested words, separator and case."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        words = WordList(write_list(tmpdir))
+        gen = PassphraseGenerator(words, words=5, separator="-", capitalize=True)
+        phrases = list(gen.generate_many(100))
+        words.close()
+
+    allowed = {"Abacus", "Abdomen", "Abdominal", "Abide"}
+    assert len(phrases) == 100
+    assert all(len(p.split("-")) == 5 for p in phrases)
+    assert set("-".join(phrases).split("-")) == allowed
+    assert gen.entropy_bits == pytest.approx(5 * math.log2(4))
+    with pytest.raises(ValueError):
+        PassphraseGenerator(words, words=0)
+
+
+def test_cli_words_default_to_the_bundled_list(capsys):
+    """Ensure --words works without --wordlist."""
+    main(["--words", "4", "--separator", " ", "-n", "20", "--entropy"])
+    captured = capsys.readouterr()
+
+    phrases = captured.out.splitlines()
+    assert len(phrases) == 20
+    assert all(len(p.split(" ")) == 4 and p.islower() for p in phrases)
+    assert "Entropy: 51.7 bits" in captured.err
@@ -17,7 +17,6 @@ from unittest.mock import patch, MagicMock
 
 import weather_cli.weather_cli as weather_cli
 
-
 # ============================================================
 # Geocoding tests
 # ============================================================
@@ -36,7 +35,7 @@ def test_geocode_city_success():
         ]
     }
 
-    with patch("requests.get") as mock_get:
+    with patch("requests.Session.get") as mock_get:
         mock_get.return_value = MagicMock(
             json=lambda: mock_response, raise_for_status=lambda: None
         )
@@ -53,7 +52,7 @@ def test_geocode_city_not_found():
     """Test geocoding when API returns no results."""
     mock_response = {"results": []}
 
-    with patch("requests.get") as mock_get, pytest.raises(SystemExit):
+    with patch("requests.Session.get") as mock_get, pytest.raises(SystemExit):
         mock_get.return_value = MagicMock(
             json=lambda: mock_response, raise_for_status=lambda: None
         )
@@ -62,7 +61,7 @@ def test_geocode_city_not_found():
 
 def test_geocode_city_api_error():
     """Test geocoding when the API request fails."""
-    with patch("requests.get") as mock_get, pytest.raises(SystemExit):
+    with patch("requests.Session.get") as mock_get, pytest.raises(SystemExit):
         mock_get.side_effect = requests.exceptions.RequestException("API error")
         weather_cli.geocode_city("Berlin")
 
@@ -83,7 +82,7 @@ def test_fetch_weather_success():
         }
     }
 
-    with patch("requests.get") as mock_get:
+    with patch("requests.Session.get") as mock_get:
         mock_get.return_value = MagicMock(
             json=lambda: mock_response, raise_for_status=lambda: None
         )
@@ -96,7 +95,7 @@ def test_fetch_weather_success():
 
 def test_fetch_weather_api_error():
     """Test weather fetch when API request fails."""
-    with patch("requests.get") as mock_get, pytest.raises(SystemExit):
+    with patch("requests.Session.get") as mock_get, pytest.raises(SystemExit):
         mock_get.side_effect = requests.exceptions.RequestException("API error")
         weather_cli.fetch_weather(52.52, 13.41)
 
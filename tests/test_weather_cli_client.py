@@ -0,0 +1,99 @@
+"""
+Test suite for the shared Weather CLI HTTP client.
+
+This module tests:
+- Connection pool size and timeouts on the session
+- Session reuse across geocoding and weather requests
+- Error propagation and argument validation
+
+All HTTP traffic is mocked; no request leaves the process.
+"""
+
+import pytest
+import requests
+from unittest.mock import MagicMock, patch
+
+import weather_cli.client as client_module
+import weather_cli.weather_cli as weather_cli
+from weather_cli.client import WeatherClient, default_client
+
+# ============================================================
+# Client configuration
+# ============================================================
+
+
+def test_client_mounts_pooled_adapter():
+    """Test that the configured pool size is used for HTTP and HTTPS."""
+    with WeatherClient(pool_size=4) as client:
+        for prefix in ("https://", "http://"):
+            adapter = client.session.get_adapter(prefix + "api.open-meteo.com")
+            assert adapter._pool_maxsize == 4
+
+
+def test_get_json_passes_timeouts():
+    """Test that every request carries the connect and read timeouts."""
+    client = WeatherClient(connect_timeout=1.5, read_timeout=4)
+    response = MagicMock(json=lambda: {"ok": True}, raise_for_status=lambda: None)
+    with patch.object(client.session, "get", return_value=response) as get:
+        assert client.get_json("https://example.test", {"a": 1}) == {"ok": True}
+    get.assert_called_once_with(
+        "https://example.test", params={"a": 1}, timeout=(1.5, 4)
+    )
+
+
+def test_get_json_raises_http_errors():
+    """Test that error statuses are raised as requests exceptions."""
+    client = WeatherClient()
+    response = MagicMock()
+    response.raise_for_status.side_effect = requests.exceptions.HTTPError("503")
+    with (
+        patch.object(client.session, "get", return_value=response),
+        pytest.raises(requests.exceptions.HTTPError),
+    ):
+        client.get_json("https://example.test", {})
+
+
+@pytest.mark.parametrize(
+    "options", [{"pool_size": 0}, {"connect_timeout": 0}, {"read_timeout": -1}]
+)
+def test_client_rejects_invalid_settings(options):
+    """Test that invalid pool sizes and timeouts raise ValueError."""
+    with pytest.raises(ValueError):
+        WeatherClient(**options)
+
+
+# ============================================================
+# Session reuse
+# ============================================================
+
+
+def test_default_client_is_shared():
+    """Test that functions without a client share one session."""
+    with patch.object(client_module, "_default_client", None):
+        assert default_client() is default_client()
+
+
+def test_functions_use_the_given_client():
+    """Test that geocoding and weather requests go through one client."""
+    client = MagicMock()
+    client.get_json.side_effect = [
+        {"results": [{"latitude": 1, "longitude": 2, "name": "X", "country": "Y"}]},
+        {"current_weather": {}},
+    ]
+
+    assert weather_cli.geocode_city("X", client=client) == (1, 2, "X", "Y")
+    assert weather_cli.fetch_weather(1, 2, client=client) == {"current_weather": {}}
+    assert client.get_json.call_count == 2
+
+
+def test_timeout_exits_with_error(capsys):
+    """Test that a stalled upstream ends with an error instead of hanging."""
+    client = WeatherClient(read_timeout=0.1)
+    with (
+        patch.object(
+            client.session, "get", side_effect=requests.exceptions.ReadTimeout("slow")
+        ),
+        pytest.raises(SystemExit),
+    ):
+        weather_cli.fetch_weather(1, 2, client=client)
+    assert "Weather API error" in capsys.readouterr().out